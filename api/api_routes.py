@@ -2,15 +2,31 @@
 API routes blueprint - REST API endpoints
 """
 import os
+import time
 import uuid
 import json
-import threading
+import sqlite3
 from pathlib import Path
-from flask import Blueprint, request, jsonify, send_file
+from flask import Blueprint, current_app, request, jsonify, send_file
 from werkzeug.utils import secure_filename
 from io import BytesIO
 
-from video_publisher import upload_video, get_publisher, Platform
+from video_publisher import get_publisher, Platform
+from video_publisher.platforms.plugins import plugins
+from video_publisher.jobs import JobStore, JobStatus, WorkerPool, run_upload_job, extract_run_at, parse_scheduled_time
+from video_publisher.core.ingest import save_upload
+from video_publisher.core.resumable import (
+    GB,
+    CHECKSUM_ALGORITHMS,
+    ResumableUploads,
+    ResumableUploadError,
+    UploadNotFound,
+    OffsetConflict,
+    ChecksumMismatch,
+    UploadTooLarge,
+    parse_metadata,
+    parse_checksum
+)
 from video_publisher.metadata import (
     export_metadata,
     import_metadata,
@@ -20,8 +36,29 @@ from video_publisher.metadata import (
 
 api_bp = Blueprint('api', __name__)
 
-# In-memory storage for upload status (use Redis/DB in production)
-upload_status = {}
+# Persistent job queue shared by every process serving the API and by standalone workers
+job_store = JobStore(os.environ.get('JOBS_DB_PATH', 'data/jobs/jobs.db'))
+
+# In-process workers; UPLOAD_WORKERS=0 leaves all publishing to `python -m video_publisher.worker`.
+# They wake when a job is enqueued here or the next scheduled job is due, and at least every
+# JOB_POLL_SECONDS to pick up jobs enqueued by other processes sharing the queue.
+_upload_workers = int(os.environ.get('UPLOAD_WORKERS', '2'))
+worker_pool = WorkerPool(
+    job_store,
+    run_upload_job,
+    concurrency=_upload_workers,
+    poll_interval=float(os.environ.get('JOB_POLL_SECONDS', '2')),
+    lease_duration=float(os.environ.get('JOB_LEASE_SECONDS', '60'))
+) if _upload_workers > 0 else None
+
+# Resumable (tus) uploads: chunks are written in place, received ranges are shared through SQLite
+resumable_uploads = ResumableUploads(
+    os.environ.get('RESUMABLE_UPLOAD_DIR', 'data/uploads/partial'),
+    max_size=int(float(os.environ.get('RESUMABLE_MAX_SIZE_GB', '64')) * GB),
+    expire_after=float(os.environ.get('RESUMABLE_EXPIRE_HOURS', '24')) * 3600
+)
+
+TUS_VERSION = '1.0.0'
 
 ALLOWED_EXTENSIONS = {'mp4', 'mov', 'avi', 'mkv', 'webm'}
 
@@ -29,30 +66,33 @@ def allowed_file(filename: str) -> bool:
     """Check if file extension is allowed."""
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
-def background_upload(upload_id: str, video_path: str, platforms: list, metadata: dict):
-    """Background task for video upload."""
-    try:
-        upload_status[upload_id]['status'] = 'processing'
-        
-        results = upload_video(video_path, platforms=platforms, metadata=metadata)
-        
-        upload_status[upload_id]['status'] = 'completed'
-        upload_status[upload_id]['results'] = [
-            {
-                'platform': r.platform.value,
-                'success': r.success,
-                'url': r.url,
-                'error': r.error
-            }
-            for r in results
-        ]
-        
-        # Clean up uploaded file
-        os.remove(video_path)
-        
-    except Exception as e:
-        upload_status[upload_id]['status'] = 'failed'
-        upload_status[upload_id]['error'] = str(e)
+def job_to_status(job: dict) -> dict:
+    """Format a stored job as an upload status response."""
+    payload = job['payload']
+    status = {
+        'upload_id': job['id'],
+        'filename': payload.get('filename'),
+        'status': job['status'],
+        'platforms': payload.get('platforms') or 'auto',
+        'metadata': payload.get('metadata', {}),
+        'results': job['results']
+    }
+    if payload.get('scheduled_time'):
+        status['scheduled_time'] = payload['scheduled_time']
+        if job['status'] == JobStatus.QUEUED and job['run_at'] > time.time():
+            status['status'] = 'scheduled'
+    if job['status'] == JobStatus.PROCESSING and job.get('cancel_requested_at'):
+        status['status'] = 'cancelling'
+
+    if job['error']:
+        status['error'] = job['error']
+    return status
+
+@api_bp.record_once
+def start_workers(state):
+    """Start the upload worker pool once the blueprint is registered."""
+    if worker_pool is not None:
+        worker_pool.start()
 
 @api_bp.route('/')
 def index():
@@ -62,7 +102,12 @@ def index():
         'version': '0.1.0',
         'endpoints': {
             'POST /api/upload': 'Upload a video',
+            'POST /api/uploads': 'Create a resumable (tus) upload',
+            'HEAD /api/uploads/<upload_id>': 'Get a resumable upload\'s offset and received ranges',
+            'PATCH /api/uploads/<upload_id>': 'Send a chunk of a resumable upload',
+            'DELETE /api/uploads/<upload_id>': 'Abandon a resumable upload',
             'GET /api/status/<upload_id>': 'Get upload status',
+            'POST /api/cancel/<upload_id>': 'Cancel an upload',
             'GET /api/platforms': 'List available platforms',
             'GET /api/metrics': 'Get system metrics',
             'GET /api/metadata/template': 'Get metadata template',
@@ -82,6 +127,7 @@ def upload():
         - title: Video title (optional)
         - description: Video description (optional)
         - tags: Comma-separated tags (optional)
+        - force: 'true' to upload even if already published with the same metadata (optional)
     
     Returns:
         JSON with upload_id for status checking
@@ -99,32 +145,54 @@ def upload():
         return jsonify({'error': f'Invalid file type. Allowed: {", ".join(ALLOWED_EXTENSIONS)}'}), 400
     
     # Save file
-    from flask import current_app
     filename = secure_filename(file.filename)
     upload_id = str(uuid.uuid4())
     file_path = current_app.config['UPLOAD_FOLDER'] / f"{upload_id}_{filename}"
-    file.save(str(file_path))
-    
-    # Parse parameters
-    platforms_param = request.form.get('platforms')
+    # Hashed and probed while written; the job carries both so the worker never re-reads the file
+    ingested = save_upload(file, str(file_path))
+
+    try:
+        payload, run_at = upload_payload(request.form, file_path, filename, ingested)
+    except ValueError:
+        file_path.unlink(missing_ok=True)
+        return jsonify({'error': f"Invalid scheduled_time (expected ISO 8601): {request.form.get('scheduled_time')}"}), 400
+
+    return enqueue_upload(upload_id, payload, run_at)
+
+def upload_payload(options, file_path: Path, filename: str, ingested=None):
+    """
+    Build the job payload of an uploaded video from its upload options.
+
+    Args:
+        options: Mapping with the optional platforms, title, description, tags,
+            force, publish_now and scheduled_time values of an upload.
+        ingested: IngestResult of the saved file, if it was hashed and probed.
+
+    Returns:
+        Tuple (payload, run_at) as returned by extract_run_at.
+
+    Raises:
+        ValueError: If scheduled_time is not a valid ISO 8601 datetime.
+    """
+    platforms_param = options.get('platforms')
     platforms = None
     if platforms_param:
         if platforms_param.lower() == 'all':
-            platforms = ['youtube', 'tiktok', 'instagram']
+            platforms = [plugin.name for plugin in plugins.primary()]
         else:
             platforms = [p.strip() for p in platforms_param.split(',')]
     
     metadata = {}
-    if request.form.get('title'):
-        metadata['title'] = request.form.get('title')
-    if request.form.get('description'):
-        metadata['description'] = request.form.get('description')
-    if request.form.get('tags'):
-        metadata['tags'] = [tag.strip() for tag in request.form.get('tags').split(',')]
+    if options.get('title'):
+        metadata['title'] = options.get('title')
+    if options.get('description'):
+        metadata['description'] = options.get('description')
+    if options.get('tags'):
+        metadata['tags'] = [tag.strip() for tag in options.get('tags').split(',')]
     
     # Handle scheduling
-    publish_now = request.form.get('publish_now', 'false').lower() == 'true'
-    scheduled_time = request.form.get('scheduled_time')
+    publish_now = options.get('publish_now', 'false').lower() == 'true'
+    scheduled_time = options.get('scheduled_time')
     
     if publish_now or scheduled_time:
         metadata['scheduling'] = {
@@ -132,59 +200,259 @@ def upload():
             'scheduled_time': scheduled_time if scheduled_time else None
         }
     
-    # Initialize upload status
-    upload_status[upload_id] = {
-        'upload_id': upload_id,
+    # Scheduled jobs wait in the queue until their publish time, then publish immediately
+    return extract_run_at({
+        'video_path': str(file_path),
         'filename': filename,
-        'status': 'queued',
-        'platforms': platforms or 'auto',
+        'platforms': platforms,
         'metadata': metadata,
-        'results': []
-    }
-    
-    # Start background upload
-    thread = threading.Thread(
-        target=background_upload,
-        args=(upload_id, str(file_path), platforms, metadata)
-    )
-    thread.start()
+        'force': options.get('force', 'false').lower() == 'true',
+        'content_hash': ingested.content_hash if ingested else None,
+        'video_metadata': ingested.video_metadata.model_dump() if ingested and ingested.video_metadata else None
+    })
+
+def enqueue_upload(upload_id: str, payload: dict, run_at):
+    """Queue an upload job for the worker pool and return the API response."""
+    job_store.enqueue(payload, job_id=upload_id, run_at=run_at)
+    if worker_pool is not None:
+        worker_pool.start()
+        worker_pool.notify()
     
+    if run_at is not None:
+        return jsonify({
+            'upload_id': upload_id,
+            'status': 'scheduled',
+            'scheduled_time': payload['scheduled_time'],
+            'message': 'Upload scheduled. Use /api/status/<upload_id> to check progress.'
+        }), 202
+
     return jsonify({
         'upload_id': upload_id,
         'status': 'queued',
         'message': 'Upload queued for processing. Use /api/status/<upload_id> to check progress.'
     }), 202
 
+# Resumable uploads (tus 1.0.0 core with the creation, checksum and termination extensions)
+#
+# Chunks may also be sent out of order and in parallel: each PATCH carries its own
+# Upload-Offset and HEAD lists the received ranges in Upload-Ranges ("start-end,...").
+# Once the last byte arrives the file is queued like a POST /api/upload, with the
+# upload id as its job id. A complete upload that wasn't queued (the last request
+# failed in between) is queued by the client's next HEAD or PATCH.
+
+def tus_response(status_code: int = 204, headers: dict = None, error: str = None):
+    """Response carrying the Tus-Resumable header."""
+    response = jsonify({'error': error}) if error else current_app.response_class(status=status_code)
+    response.status_code = status_code
+    response.headers['Tus-Resumable'] = TUS_VERSION
+    for name, value in (headers or {}).items():
+        response.headers[name] = str(value)
+    return response
+
+def tus_error(error: Exception):
+    """Map a resumable upload error to its tus status code."""
+    if isinstance(error, UploadNotFound):
+        return tus_response(404, error=str(error))
+    if isinstance(error, OffsetConflict):
+        return tus_response(409, error=str(error))
+    if isinstance(error, ChecksumMismatch):
+        return tus_response(460, error=str(error))  # Checksum Mismatch (tus checksum extension)
+    if isinstance(error, UploadTooLarge):
+        return tus_response(413, error=str(error))
+    return tus_response(400, error=str(error))
+
+def header_int(name: str):
+    """Non-negative integer request header, None if absent."""
+    value = request.headers.get(name)
+    if value is None:
+        return None
+    if not value.isdigit():
+        raise ValueError(f'Invalid {name} header: {value}')
+    return int(value)
+
+@api_bp.route('/uploads', methods=['OPTIONS'])
+def uploads_options():
+    """Advertise the supported tus version, extensions and limits."""
+    return tus_response(204, {
+        'Tus-Version': TUS_VERSION,
+        'Tus-Extension': 'creation,checksum,termination',
+        'Tus-Checksum-Algorithm': ','.join(CHECKSUM_ALGORITHMS),
+        'Tus-Max-Size': resumable_uploads.max_size
+    })
+
+@api_bp.route('/uploads', methods=['POST'])
+def create_upload():
+    """
+    Create a resumable upload.
+
+    Headers:
+        - Upload-Length: Size of the video in bytes (required)
+        - Upload-Metadata: tus metadata; 'filename' is required, plus the optional
+          platforms, title, description, tags, force, publish_now and scheduled_time
+          of POST /api/upload
+
+    Returns:
+        201 with the upload URL in Location
+    """
+    try:
+        length = header_int('Upload-Length')
+        metadata = parse_metadata(request.headers.get('Upload-Metadata'))
+        if not length:
+            raise ValueError('Upload-Length header is required and must be positive')
+        filename = metadata.get('filename', '')
+        if not allowed_file(filename):
+            raise ValueError(f'Invalid file type. Allowed: {", ".join(ALLOWED_EXTENSIONS)}')
+        if metadata.get('scheduled_time'):
+            try:
+                parse_scheduled_time(metadata['scheduled_time'])
+            except ValueError:
+                raise ValueError(f"Invalid scheduled_time (expected ISO 8601): {metadata['scheduled_time']}")
+        upload_id = resumable_uploads.create(length, metadata)
+    except (ValueError, ResumableUploadError) as e:
+        return tus_error(e)
+
+    return tus_response(201, {'Location': f'/api/uploads/{upload_id}', 'Upload-Offset': 0})
+
+def queue_completed_upload(upload_id: str, state: dict):
+    """
+    Move a complete resumable upload into the upload folder and queue it, unless it
+    already is. Called by the request that completed it, and again by later HEAD and
+    PATCH requests in case that request failed or its process died in between.
+
+    Returns:
+        An error response, or None once the upload is queued.
+    """
+    if job_store.get(upload_id) is not None:
+        return None
+    filename = secure_filename(state['metadata']['filename'])
+    file_path = current_app.config['UPLOAD_FOLDER'] / f"{upload_id}_{filename}"
+    try:
+        ingested = resumable_uploads.finish(upload_id, str(file_path))
+    except ResumableUploadError as e:
+        return tus_error(e)
+    try:
+        payload, run_at = upload_payload(state['metadata'], file_path, filename, ingested)
+    except ValueError as e:
+        file_path.unlink(missing_ok=True)
+        return tus_response(400, error=str(e))
+    try:
+        enqueue_upload(upload_id, payload, run_at)
+    except sqlite3.IntegrityError:
+        pass  # Queued by a concurrent request
+    return None
+
+@api_bp.route('/uploads/<upload_id>', methods=['HEAD'])
+def upload_offset(upload_id: str):
+    """Offset (and received ranges) of a resumable upload, to resume it."""
+    try:
+        state = resumable_uploads.get(upload_id)
+    except UploadNotFound as e:
+        return tus_error(e)
+    if state['complete']:
+        error = queue_completed_upload(upload_id, state)
+        if error is not None:
+            return error
+    return tus_response(200, {
+        'Upload-Offset': state['offset'],
+        'Upload-Length': state['length'],
+        'Upload-Ranges': ','.join(f'{start}-{end}' for start, end in state['ranges']),
+        'Cache-Control': 'no-store'
+    })
+
+@api_bp.route('/uploads/<upload_id>', methods=['PATCH'])
+def upload_chunk(upload_id: str):
+    """
+    Send a chunk of a resumable upload.
+
+    Headers:
+        - Content-Type: application/offset+octet-stream
+        - Upload-Offset: Position of the chunk in the video
+        - Content-Length: Size of the chunk
+        - Upload-Checksum: '<algorithm> <base64 digest>' of the chunk (optional)
+
+    Returns:
+        204 with the upload's contiguous Upload-Offset; the video is queued when complete
+    """
+    if request.mimetype != 'application/offset+octet-stream':
+        return tus_response(415, error='Content-Type must be application/offset+octet-stream')
+    try:
+        offset = header_int('Upload-Offset')
+        if offset is None or request.content_length is None:
+            raise ValueError('Upload-Offset and Content-Length headers are required')
+        checksum = parse_checksum(request.headers.get('Upload-Checksum'))
+        state = resumable_uploads.get(upload_id)
+        if state['complete'] and job_store.get(upload_id) is None:
+            # The request that completed it didn't get to queue it
+            error = queue_completed_upload(upload_id, state)
+            return error or tus_response(204, {'Upload-Offset': state['offset']})
+        if request.content_length == 0:
+            return tus_response(204, {'Upload-Offset': state['offset']})
+        completed = resumable_uploads.write(upload_id, offset, request.stream, request.content_length, checksum)
+        state = resumable_uploads.get(upload_id)
+    except (ValueError, ResumableUploadError) as e:
+        return tus_error(e)
+
+    if completed:
+        error = queue_completed_upload(upload_id, state)
+        if error is not None:
+            return error
+    return tus_response(204, {'Upload-Offset': state['offset']})
+
+@api_bp.route('/uploads/<upload_id>', methods=['DELETE'])
+def delete_upload(upload_id: str):
+    """Abandon a resumable upload."""
+    try:
+        resumable_uploads.delete(upload_id)
+    except UploadNotFound as e:
+        return tus_error(e)
+    return tus_response(204)
+
 @api_bp.route('/status/<upload_id>', methods=['GET'])
 def status(upload_id: str):
     """Get the status of an upload."""
-    if upload_id not in upload_status:
+    job = job_store.get(upload_id)
+    if job is None:
         return jsonify({'error': 'Upload ID not found'}), 404
     
-    return jsonify(upload_status[upload_id])
+    return jsonify(job_to_status(job))
+
+@api_bp.route('/cancel/<upload_id>', methods=['POST'])
+def cancel(upload_id: str):
+    """
+    Cancel an upload. Queued and scheduled uploads never start; a running upload
+    stops at its next step and keeps the results of platforms already finished.
+    """
+    job = job_store.get(upload_id)
+    if job is None:
+        return jsonify({'error': 'Upload ID not found'}), 404
+    if job['status'] in (JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED):
+        return jsonify({'error': f"Upload already {job['status']}", **job_to_status(job)}), 409
+
+    job = job_store.cancel(upload_id)
+    if job['status'] == JobStatus.CANCELLED:
+        # Never started: nothing else will clean up the uploaded file
+        video_path = job['payload'].get('video_path')
+        if job['payload'].get('cleanup', True) and video_path and os.path.exists(video_path):
+            os.remove(video_path)
+    elif worker_pool is not None:
+        # Running in this process: stop it now instead of at the worker's next check
+        worker_pool.cancel(upload_id)
+    return jsonify(job_to_status(job)), 202
 
 @api_bp.route('/platforms', methods=['GET'])
 def platforms():
     """List available platforms and their authentication status."""
     platform_list = [
         {
-            'name': 'youtube',
-            'display_name': 'YouTube',
-            'auth_method': 'OAuth2',
-            'supported_formats': ['horizontal', 'vertical (shorts)']
-        },
-        {
-            'name': 'tiktok',
-            'display_name': 'TikTok',
-            'auth_method': 'Browser Session',
-            'supported_formats': ['vertical']
-        },
-        {
-            'name': 'instagram',
-            'display_name': 'Instagram',
-            'auth_method': 'Browser Session',
-            'supported_formats': ['vertical (reels)']
+            'name': plugin.name,
+            'display_name': plugin.display_name or plugin.name,
+            'auth_method': plugin.auth_method,
+            'supported_formats': list(plugin.supported_formats),
+            'capabilities': sorted(plugin.capabilities),
+            'max_concurrency': plugin.max_concurrency,
+            'daily_limit': plugin.daily_limit
         }
+        for plugin in plugins.primary()
     ]
     
     return jsonify({'platforms': platform_list})
@@ -204,24 +472,33 @@ def metrics():
     
     metrics_data = {
         'system_status': 'emergency_stop' if publisher.emergency_stop.is_triggered() else 'operational',
+        'queue': job_store.counts(),
         'platforms': {}
     }
     
-    platforms_map = {
-        "youtube": Platform.YOUTUBE,
-        "tiktok": Platform.TIKTOK,
-        "instagram": Platform.INSTAGRAM
-    }
+    platforms_map = {plugin.name: Platform(plugin.name) for plugin in plugins.primary()}
     
     for name, platform_enum in platforms_map.items():
-        remaining = publisher.rate_limiter.get_remaining(platform_enum)
-        limit = publisher.rate_limiter.limits.get(platform_enum, 5)
+        # Totals are summed over every account configured for the platform
+        accounts = {}
+        for account in publisher.accounts.accounts_for(platform_enum):
+            account_limit = publisher.rate_limiter.get_limit(platform_enum, account.name)
+            account_remaining = publisher.rate_limiter.get_remaining(platform_enum, account.name)
+            accounts[account.name] = {
+                'daily_limit': account_limit,
+                'used': account_limit - account_remaining,
+                'remaining': account_remaining,
+                'circuit': publisher.circuit_breakers.snapshot(platform_enum, account.name)
+            }
+        limit = sum(a['daily_limit'] for a in accounts.values())
+        remaining = sum(a['remaining'] for a in accounts.values())
         used = limit - remaining
         
         metrics_data['platforms'][name] = {
             'daily_limit': limit,
             'used': used,
             'remaining': remaining,
+            'accounts': accounts,
             'authenticated': False
         }
         
@@ -0,0 +1,19 @@
+"""
+Streaming ingest of uploaded videos - request class for the Flask app
+"""
+from flask import Request, current_app
+
+from video_publisher.core.ingest import IngestFile
+from api.api_routes import allowed_file
+
+class IngestRequest(Request):
+    """
+    Streams uploaded videos into IngestFile as the body is parsed: written to the
+    upload folder, hashed and probed in the same pass instead of being spooled
+    to a temporary file and read back by every later stage.
+    """
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        if filename and allowed_file(filename):
+            return IngestFile(str(current_app.config.get('UPLOAD_FOLDER', 'uploads')))
+        return super()._get_file_stream(total_content_length, content_type, filename, content_length)
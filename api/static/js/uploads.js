@@ -161,3 +161,198 @@ document.addEventListener('DOMContentLoaded', function () {
         });
     }
 });
+
+/**
+ * Resumable upload client for /api/uploads (tus 1.0.0).
+ *
+ * The file is sent in chunks, several at a time, each with a SHA-256 checksum.
+ * After a network error the client waits (and for the browser to be back
+ * online), asks the server which ranges it already has and sends the rest.
+ *
+ *     const upload = new ResumableUpload(file, { title: 'My video', platforms: 'youtube' }, {
+ *         onProgress: (sent, total) => ...,
+ *         onComplete: (uploadId) => ...   // poll /api/status/<uploadId>
+ *     });
+ *     upload.start();
+ */
+(function () {
+    class ResumableUpload {
+        constructor(file, metadata = {}, options = {}) {
+            this.file = file;
+            this.metadata = { filename: file.name, ...metadata };
+            this.endpoint = options.endpoint || '/api/uploads';
+            this.chunkSize = options.chunkSize || 8 * 1024 * 1024; // 8MB
+            this.parallel = options.parallel || 3;
+            this.maxRetries = options.maxRetries ?? 8;
+            this.onProgress = options.onProgress || (() => {});
+            this.onComplete = options.onComplete || (() => {});
+            this.onError = options.onError || (() => {});
+            this.url = options.url || null; // Set to resume an upload created earlier
+            this.aborted = false;
+        }
+
+        get uploadId() {
+            return this.url ? this.url.split('/').pop() : null;
+        }
+
+        async start() {
+            try {
+                await this._withRetries(async () => {
+                    if (!this.url) {
+                        await this._create();
+                    }
+                    await this._sendMissing();
+                });
+                if (!this.aborted) {
+                    this.onComplete(this.uploadId);
+                }
+            } catch (error) {
+                if (!this.aborted) {
+                    this.onError(error);
+                }
+            }
+        }
+
+        async abort() {
+            this.aborted = true;
+            if (this.url) {
+                await fetch(this.url, { method: 'DELETE', headers: { 'Tus-Resumable': '1.0.0' } }).catch(() => {});
+            }
+        }
+
+        async _create() {
+            const response = await fetch(this.endpoint, {
+                method: 'POST',
+                headers: {
+                    'Tus-Resumable': '1.0.0',
+                    'Upload-Length': String(this.file.size),
+                    'Upload-Metadata': encodeMetadata(this.metadata)
+                }
+            });
+            if (response.status !== 201) {
+                throw await responseError(response);
+            }
+            this.url = response.headers.get('Location');
+        }
+
+        // What the server already has: its contiguous offset and [start, end) ranges
+        async _serverState() {
+            const response = await fetch(this.url, { method: 'HEAD', headers: { 'Tus-Resumable': '1.0.0' } });
+            if (!response.ok) {
+                throw await responseError(response);
+            }
+            const header = response.headers.get('Upload-Ranges') || '';
+            return {
+                offset: Number(response.headers.get('Upload-Offset')),
+                length: Number(response.headers.get('Upload-Length')),
+                ranges: header.split(',').filter(Boolean).map(range => range.split('-').map(Number))
+            };
+        }
+
+        async _sendMissing() {
+            const { offset, length, ranges } = await this._serverState();
+            // Complete already: only the response to the last chunk was lost
+            if (length === this.file.size && offset === length) {
+                this.onProgress(length, length);
+                return;
+            }
+            const received = ranges.reduce((total, [start, end]) => total + end - start, 0);
+            const pending = [];
+            for (let offset = 0; offset < this.file.size; offset += this.chunkSize) {
+                const end = Math.min(offset + this.chunkSize, this.file.size);
+                // Chunks are aligned, so a chunk is either fully received or not at all
+                if (!ranges.some(([start, stop]) => start <= offset && end <= stop)) {
+                    pending.push([offset, end]);
+                }
+            }
+
+            let sent = received;
+            this.onProgress(sent, this.file.size);
+            const worker = async () => {
+                while (pending.length > 0 && !this.aborted) {
+                    const [start, end] = pending.shift();
+                    await this._sendChunk(start, end);
+                    sent += end - start;
+                    this.onProgress(sent, this.file.size);
+                }
+            };
+            await Promise.all(Array.from({ length: this.parallel }, worker));
+        }
+
+        async _sendChunk(start, end) {
+            const chunk = await this.file.slice(start, end).arrayBuffer();
+            const digest = await crypto.subtle.digest('SHA-256', chunk);
+            const response = await fetch(this.url, {
+                method: 'PATCH',
+                headers: {
+                    'Tus-Resumable': '1.0.0',
+                    'Content-Type': 'application/offset+octet-stream',
+                    'Upload-Offset': String(start),
+                    'Upload-Checksum': 'sha256 ' + base64(new Uint8Array(digest))
+                },
+                body: chunk
+            });
+            // 409: already received (a retry of a chunk whose response was lost)
+            if (response.status !== 204 && response.status !== 409) {
+                throw await responseError(response);
+            }
+        }
+
+        // Run `task`, starting over from the server's ranges after network errors
+        async _withRetries(task) {
+            for (let attempt = 0; ; attempt++) {
+                try {
+                    return await task();
+                } catch (error) {
+                    if (this.aborted || error.permanent || attempt >= this.maxRetries) {
+                        throw error;
+                    }
+                    await waitForNetwork(Math.min(30000, 1000 * 2 ** attempt));
+                }
+            }
+        }
+    }
+
+    function encodeMetadata(metadata) {
+        return Object.entries(metadata)
+            .filter(([, value]) => value !== undefined && value !== null && value !== '')
+            .map(([key, value]) => key + ' ' + base64(new TextEncoder().encode(String(value))))
+            .join(',');
+    }
+
+    function base64(bytes) {
+        let binary = '';
+        for (let i = 0; i < bytes.length; i++) {
+            binary += String.fromCharCode(bytes[i]);
+        }
+        return btoa(binary);
+    }
+
+    async function responseError(response) {
+        let message = `Upload failed (${response.status})`;
+        try {
+            message = (await response.json()).error || message;
+        } catch (e) {
+            // HEAD and some error responses have no JSON body
+        }
+        const error = new Error(message);
+        // Client errors won't succeed on retry; a bad checksum (460) or server errors might
+        error.permanent = response.status >= 400 && response.status < 500 && ![408, 429, 460].includes(response.status);
+        return error;
+    }
+
+    // Wait `delay` ms, and until the browser is back online
+    function waitForNetwork(delay) {
+        return new Promise(resolve => {
+            setTimeout(() => {
+                if (navigator.onLine) {
+                    resolve();
+                } else {
+                    window.addEventListener('online', () => resolve(), { once: true });
+                }
+            }, delay);
+        });
+    }
+
+    window.ResumableUpload = ResumableUpload;
+})();
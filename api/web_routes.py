@@ -10,6 +10,7 @@ from werkzeug.utils import secure_filename
 from upload_manager import UploadManager
 from video_publisher import get_publisher
 from video_publisher.core.models import Platform
+from video_publisher.platforms.plugins import plugins
 
 web_bp = Blueprint('web', __name__)
 upload_mgr = UploadManager()
@@ -35,8 +36,13 @@ def upload():
         
         # Analyze video
         from video_publisher.core.video_analyzer import VideoAnalyzer
-        analyzer = VideoAnalyzer()
-        video_meta = analyzer.analyze(upload_info['path'])
+        from video_publisher.core.analysis_cache import default_cache
+        cache = default_cache()  # The publish step reuses this analysis
+        video_meta = upload_info['video_metadata']
+        if video_meta is None:
+            video_meta = VideoAnalyzer(cache=cache).analyze(upload_info['path'], upload_info['content_hash'])
+        elif cache is not None:
+            cache.put(upload_info['path'], video_meta, upload_info['content_hash'])
         
         # Store video metadata
         upload_info['video_meta'] = {
@@ -66,7 +72,7 @@ def config(file_id):
     
     # Check authentication status for each platform
     auth_status = {}
-    for platform in [Platform.YOUTUBE, Platform.TIKTOK, Platform.INSTAGRAM]:
+    for platform in (Platform(plugin.name) for plugin in plugins.primary()):
         if platform in publisher.uploaders:
             auth_status[platform.value] = publisher.uploaders[platform].is_authenticated()
         else:
@@ -180,7 +186,7 @@ def credentials_status():
     auth_status = {}
     rate_limits = {}
     
-    for platform in [Platform.YOUTUBE, Platform.TIKTOK, Platform.INSTAGRAM]:
+    for platform in (Platform(plugin.name) for plugin in plugins.primary()):
         platform_key = platform.value
         
         # Auth status
@@ -191,7 +197,7 @@ def credentials_status():
         
         # Rate limits
         remaining = publisher.rate_limiter.get_remaining(platform)
-        limit = publisher.rate_limiter.limits.get(platform, 5)
+        limit = publisher.rate_limiter.get_limit(platform)
         rate_limits[platform_key] = {
             'remaining': remaining,
             'limit': limit
@@ -17,6 +17,9 @@ def create_app():
     app = Flask(__name__,
                 template_folder='api/templates',
                 static_folder='api/static')
+    # Uploaded videos are hashed and probed while they are received
+    from api.ingest import IngestRequest
+    app.request_class = IngestRequest
     
     # Configuration
     app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'dev-secret-key-change-in-production')
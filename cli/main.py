@@ -3,7 +3,9 @@ Video Publisher CLI - Command-line interface for video uploads.
 """
 import typer
 import json
-from typing import Optional, List
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Deque, Optional, List
 from pathlib import Path
 from rich.console import Console
 from rich.table import Table
@@ -13,7 +15,9 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
-from video_publisher import upload_video, get_publisher, Platform
+from video_publisher import upload_video, get_publisher
+from video_publisher.platforms.plugins import plugins
+from video_publisher.core.hashing import file_content_hash
 from video_publisher.metadata import (
     export_metadata,
     import_metadata,
@@ -22,6 +26,95 @@ from video_publisher.metadata import (
     merge_metadata
 )
 
+class _PreparedVideo:
+    """A batch video with its metadata, thumbnail and analysis resolved ahead of its upload."""
+
+    def __init__(self, index: int, video_path: Path):
+        self.index = index
+        self.video_path = video_path
+        self.metadata: dict = {}
+        self.video_metadata = None  # VideoMetadata; None lets the publisher analyze the video itself
+        self.notes: List[str] = []  # Console lines, printed when the video's turn comes
+        self.error: Optional[str] = None  # Set when the video must be skipped
+
+def _paired(paths: List[Path], index: int) -> Optional[Path]:
+    """
+    File paired by position with the index-th video (1-based).
+    If only one file was given it is used for every video.
+    """
+    if len(paths) >= index:
+        return paths[index - 1]
+    if len(paths) == 1:
+        return paths[0]
+    return None
+
+def _prepare_video(
+    index: int,
+    video_path: Path,
+    metadata_file: Optional[Path],
+    thumbnail_path: Optional[Path],
+    cli_metadata: dict,
+    publisher
+) -> _PreparedVideo:
+    """
+    Prepare one batch video for upload: load and validate its metadata, find its
+    thumbnail, analyze it and hash it for the publication ledger.
+
+    Runs in the prefetch threads while another video uploads, so nothing is printed
+    here; messages are collected in `notes` to keep the batch output in order.
+    """
+    prepared = _PreparedVideo(index, video_path)
+
+    # 1. Determine Metadata
+    # Priority: CLI > --metadata file > {video}.json > default template
+    # A. Load from --metadata if provided for this video
+    if metadata_file:
+        try:
+            prepared.metadata = import_metadata(str(metadata_file))
+            prepared.notes.append(f"  [dim]• Loaded metadata: {metadata_file.name}[/dim]")
+        except Exception as e:
+            prepared.notes.append(f"  [bold red]❌ Error loading metadata:[/bold red] {e}")
+            prepared.error = str(e)
+            return prepared
+
+    # B. Auto-detect {video}.json if no metadata file provided
+    else:
+        possible_json = video_path.with_suffix('.json')
+        if possible_json.exists():
+            try:
+                prepared.metadata = import_metadata(str(possible_json))
+                prepared.notes.append(f"  [dim]• Found local metadata: {possible_json.name}[/dim]")
+            except Exception as e:
+                prepared.notes.append(f"  [red]⚠ Error loading local metadata: {e}[/red]")
+
+    # C. Use provided thumbnail or auto-detect
+    if thumbnail_path:
+        prepared.metadata['thumbnail_path'] = str(thumbnail_path)
+        prepared.notes.append(f"  [dim]• Using thumbnail: {thumbnail_path.name}[/dim]")
+    else:
+        # Check for same name with typical image extensions
+        for ext in ['.jpg', '.jpeg', '.png']:
+            possible_thumb = video_path.with_suffix(ext)
+            if possible_thumb.exists():
+                prepared.metadata['thumbnail_path'] = str(possible_thumb)
+                prepared.notes.append(f"  [dim]• Found local thumbnail: {possible_thumb.name}[/dim]")
+                break
+
+    # D. Merge CLI overrides (Highest priority)
+    if cli_metadata:
+        prepared.metadata = merge_metadata(prepared.metadata, cli_metadata)
+
+    # E. Hash and analyze now, so the upload doesn't have to. On failure the
+    # publisher analyzes the video again and reports the error with the upload.
+    try:
+        content_hash = None
+        if publisher.ledger is not None:
+            content_hash = file_content_hash(str(video_path))  # Cached for the upload's ledger check
+        prepared.video_metadata = publisher.analyzer.analyze(str(video_path), content_hash=content_hash)
+    except Exception:
+        pass
+    return prepared
+
 app = typer.Typer(
     name="video-publisher",
     help="Multi-platform video upload automation CLI",
@@ -35,7 +128,7 @@ def upload(
     platforms: Optional[str] = typer.Option(
         None,
         "--platforms", "-p",
-        help="Comma-separated list of platforms (youtube,tiktok,instagram) or 'all'"
+        help="Comma-separated list of platforms (youtube,tiktok,instagram,...) or 'all'"
     ),
     metadata: Optional[str] = typer.Option(
         None,
@@ -53,6 +146,12 @@ def upload(
     publish_now: bool = typer.Option(False, "--publish-now", help="Publish immediately"),
     scheduled_time: Optional[str] = typer.Option(None, "--scheduled-time", help="Schedule publication time (ISO 8601)"),
     headless: bool = typer.Option(True, "--headless/--no-headless", help="Whether to run the browser in headless mode"),
+    force: bool = typer.Option(False, "--force", help="Upload again even if already published with the same metadata"),
+    prefetch: int = typer.Option(
+        2,
+        "--prefetch",
+        help="Videos prepared (metadata, thumbnail, analysis) ahead of the current upload. 0 disables pipelining"
+    ),
 ):
     """
     Upload one or more videos to platforms.
@@ -61,7 +160,7 @@ def upload(
     platform_list = None
     if platforms:
         if platforms.lower() == 'all':
-            platform_list = ['youtube', 'tiktok', 'instagram']
+            platform_list = [plugin.name for plugin in plugins.primary()]
         else:
             platform_list = [p.strip() for p in platforms.split(',')]
     
@@ -98,100 +197,73 @@ def upload(
         console.print("[bold]Platforms:[/bold] Auto-detect based on video format")
 
     try:
-        # We reuse the publisher logic implicitly because accessing the singleton 
-        # inside the loop or just calling the sensitive functions usually keeps state if designed so.
-        # However, `upload_video` function in `__init__.py` gets a publisher instance.
-        # To ensure session persistence (reuse of browser), we should rely on the `get_publisher()` singleton behavior 
-        # which is already implemented in `src/video_publisher/__init__.py`.
-        
-        for index, video_path in enumerate(video_paths, 1):
-            console.print(f"\n[bold cyan]Processing [{index}/{total_videos}]:[/bold cyan] {video_path.name}")
-            
-            # Determine which metadata file to use for this video
-            # If multiple metadata files provided, pair by position. If only one, use for all.
-            video_metadata_file = None
-            if metadata_files:
-                if len(metadata_files) >= index:
-                    video_metadata_file = metadata_files[index - 1]
-                elif len(metadata_files) == 1:
-                    video_metadata_file = metadata_files[0]
-            
-            # Determine which thumbnail to use for this video
-            video_thumbnail_path = None
-            if thumbnail_paths:
-                if len(thumbnail_paths) >= index:
-                    video_thumbnail_path = thumbnail_paths[index - 1]
-                elif len(thumbnail_paths) == 1:
-                    video_thumbnail_path = thumbnail_paths[0]
-            
-            # 1. Determine Metadata
-            # Priority: CLI > --metadata file > {video}.json > default template
-            current_metadata = {}
-            
-            # A. Load from --metadata if provided for this video
-            if video_metadata_file:
-                try:
-                    current_metadata = import_metadata(str(video_metadata_file))
-                    console.print(f"  [dim]• Loaded metadata: {video_metadata_file.name}[/dim]")
-                except Exception as e:
-                    console.print(f"  [bold red]❌ Error loading metadata:[/bold red] {e}")
+        # The `get_publisher()` singleton keeps browser sessions alive across the whole batch
+        publisher = get_publisher(headless=headless)
+
+        # Pipeline: while video N uploads, the next `prefetch` videos are prepared
+        # (metadata, thumbnail, analysis, ledger hash) so uploads never wait on them.
+        prefetch = max(0, prefetch)
+        upcoming = iter(enumerate(video_paths, 1))
+        pending: Deque[Future] = deque()
+
+        def prepare_next(executor: ThreadPoolExecutor) -> bool:
+            """Start preparing the next video, if any is left."""
+            next_video = next(upcoming, None)
+            if next_video is None:
+                return False
+            index, video_path = next_video
+            pending.append(executor.submit(
+                _prepare_video, index, video_path, _paired(metadata_files, index),
+                _paired(thumbnail_paths, index), global_cli_metadata, publisher
+            ))
+            return True
+
+        with ThreadPoolExecutor(max_workers=max(1, prefetch), thread_name_prefix="prepare") as executor:
+            while pending or prepare_next(executor):
+                prepared = pending.popleft().result()
+                while len(pending) < prefetch and prepare_next(executor):
+                    pass
+
+                video_path = prepared.video_path
+                console.print(f"\n[bold cyan]Processing [{prepared.index}/{total_videos}]:[/bold cyan] {video_path.name}")
+                for note in prepared.notes:
+                    console.print(note)
+                if prepared.error:
                     continue
 
-            # B. Auto-detect {video}.json if no metadata file provided
-            elif not video_metadata_file:
-                possible_json = video_path.with_suffix('.json')
-                if possible_json.exists():
+                # 2. Upload
+                with Progress(
+                    SpinnerColumn(),
+                    TextColumn("[progress.description]{task.description}"),
+                    console=console
+                ) as progress:
+                    task = progress.add_task(f"Uploading {video_path.name}...", total=None)
+                    
+                    # Call upload - the singleton pattern in `get_publisher` ensures browser reuse
                     try:
-                        current_metadata = import_metadata(str(possible_json))
-                        console.print(f"  [dim]• Found local metadata: {possible_json.name}[/dim]")
+                        results = upload_video(
+                            str(video_path),
+                            platforms=platform_list,
+                            metadata=prepared.metadata,
+                            headless=headless,
+                            force=force,
+                            video_metadata=prepared.video_metadata
+                        )
+                        progress.update(task, completed=True)
                     except Exception as e:
-                        console.print(f"  [red]⚠ Error loading local metadata: {e}[/red]")
+                        # Catch individual upload errors so we don't crash the whole batch
+                        progress.update(task, completed=True) # Stop spinner
+                        console.print(f"  [bold red]❌ Upload Error:[/bold red] {e}")
+                        continue
 
-            # C. Use provided thumbnail or auto-detect
-            if video_thumbnail_path:
-                current_metadata['thumbnail_path'] = str(video_thumbnail_path)
-                console.print(f"  [dim]• Using thumbnail: {video_thumbnail_path.name}[/dim]")
-            else:
-                # Check for same name with typical image extensions
-                for ext in ['.jpg', '.jpeg', '.png']:
-                    possible_thumb = video_path.with_suffix(ext)
-                    if possible_thumb.exists():
-                        current_metadata['thumbnail_path'] = str(possible_thumb)
-                        console.print(f"  [dim]• Found local thumbnail: {possible_thumb.name}[/dim]")
-                        break
-
-            # D. Merge CLI overrides (Highest priority)
-            if global_cli_metadata:
-                current_metadata = merge_metadata(current_metadata, global_cli_metadata)
-
-            # 2. Upload
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[progress.description]{task.description}"),
-                console=console
-            ) as progress:
-                task = progress.add_task(f"Uploading {video_path.name}...", total=None)
-                
-                # Call upload - the singleton pattern in `get_publisher` ensures browser reuse
-                try:
-                    results = upload_video(
-                        str(video_path),
-                        platforms=platform_list,
-                        metadata=current_metadata,
-                        headless=headless
-                    )
-                    progress.update(task, completed=True)
-                except Exception as e:
-                    # Catch individual upload errors so we don't crash the whole batch
-                    progress.update(task, completed=True) # Stop spinner
-                    console.print(f"  [bold red]❌ Upload Error:[/bold red] {e}")
-                    continue
-
-            # 3. Show Result for this video
-            for result in results:
-                status = "[green]Success[/green]" if result.success else "[red]Failed[/red]"
-                url = result.url or (result.error if result.error else "N/A")
-                console.print(f"  • {result.platform.value}: {status} - {url}")
+                # 3. Show Result for this video
+                for result in results:
+                    if result.already_published:
+                        status = "[yellow]Already published[/yellow]"
+                    else:
+                        status = "[green]Success[/green]" if result.success else "[red]Failed[/red]"
+                    url = result.url or (result.error if result.error else "N/A")
+                    console.print(f"  • {result.platform.value}: {status} - {url}")
 
     except Exception as e:
         console.print(f"\n[bold red]❌ Critical Batch Error:[/bold red] {e}")
@@ -199,6 +271,58 @@ def upload(
 
     console.print("\n[bold green]✨ Batch processing complete![/bold green]")
 
+@app.command()
+def analyze(
+    video_paths: List[Path] = typer.Argument(..., help="Video files to analyze"),
+    workers: Optional[int] = typer.Option(None, "--workers", "-w", help="Parallel analysis processes (default: CPU count)"),
+    timeout: float = typer.Option(30.0, "--timeout", help="Seconds allowed per file before it is reported as failed")
+):
+    """
+    Analyze videos in parallel and show where each would be routed.
+    Platforms that would reject a video (too long, unsupported codec...) are marked ✗.
+    """
+    from video_publisher.core.video_analyzer import VideoAnalyzer
+    from video_publisher.core.analysis_cache import default_cache
+    from video_publisher.core.platform_router import PlatformRouter
+    from video_publisher.core.compliance import preflight
+
+    analyzer = VideoAnalyzer(cache=default_cache())
+    router = PlatformRouter()
+
+    table = Table(show_header=True, header_style="bold magenta")
+    table.add_column("Video")
+    table.add_column("Duration", justify="right")
+    table.add_column("Resolution")
+    table.add_column("Codec")
+    table.add_column("FPS", justify="right")
+    table.add_column("Platforms")
+
+    rows = {}
+    failed = 0
+    with Progress(SpinnerColumn(), TextColumn("{task.description}"), console=console, transient=True) as progress:
+        task = progress.add_task(f"Analyzing {len(video_paths)} videos...", total=len(video_paths))
+        for result in analyzer.analyze_many([str(p) for p in video_paths], workers=workers, timeout=timeout):
+            progress.advance(task)
+            name = Path(result.path).name
+            if not result.success:
+                failed += 1
+                rows[result.path] = (name, "", "", "", "", f"[red]❌ {result.error.splitlines()[0]}[/red]")
+                continue
+            meta = result.metadata
+            resolution = f"{meta.width}x{meta.height}" + (f" ⟳{meta.rotation}°" if meta.rotation else "")
+            targets, rejections = preflight(meta, router.route(meta))
+            platforms = ", ".join(f"[red]✗ {p.value}[/red]" if p in rejections else p.value for p in targets)
+            rows[result.path] = (name, f"{meta.duration:.1f}s", resolution, meta.codec or "?",
+                                 f"{meta.fps:g}" if meta.fps else "?", platforms)
+
+    # Results arrive as they complete; list them in the order given
+    for video_path in dict.fromkeys(str(p) for p in video_paths):
+        table.add_row(*rows[video_path])
+    console.print(table)
+    if failed:
+        console.print(f"[red]{failed} of {len(video_paths)} videos could not be analyzed[/red]")
+        raise typer.Exit(code=1)
+
 @app.command()
 def status():
     """
@@ -224,11 +348,8 @@ def status():
     table.add_column("Remaining")
     
     # Map string names to Platform enum
-    platforms_map = {
-        "YouTube": Platform.YOUTUBE,
-        "TikTok": Platform.TIKTOK,
-        "Instagram": Platform.INSTAGRAM
-    }
+    from video_publisher import Platform
+    platforms_map = {plugin.display_name or plugin.name: Platform(plugin.name) for plugin in plugins.primary()}
     
     for name, platform_enum in platforms_map.items():
         # Check Auth
@@ -242,7 +363,7 @@ def status():
         
         # Check Rate Limits
         remaining = publisher.rate_limiter.get_remaining(platform_enum)
-        limit = publisher.rate_limiter.limits.get(platform_enum, 5)
+        limit = publisher.rate_limiter.get_limit(platform_enum)
         used = limit - remaining
         
         usage_str = f"{used}/{limit}"
@@ -255,32 +376,25 @@ def status():
 
 @app.command()
 def auth(
-    platform: str = typer.Argument(..., help="Platform to authenticate (youtube, tiktok, instagram)")
+    platform: str = typer.Argument(..., help="Platform to authenticate (youtube, tiktok, instagram, ...)")
 ):
     """
     Authenticate with a specific platform.
     """
     platform = platform.lower()
     
-    if platform not in ['youtube', 'tiktok', 'instagram']:
+    plugin = plugins.get(platform)
+    if plugin is None or plugin.alias_of:
+        valid = ", ".join(p.name for p in plugins.primary())
         console.print(f"[bold red]❌ Invalid platform:[/bold red] {platform}")
-        console.print("[dim]Valid platforms: youtube, tiktok, instagram[/dim]")
+        console.print(f"[dim]Valid platforms: {valid}[/dim]")
         raise typer.Exit(code=1)
     
     console.print(f"\n[bold blue]🔐 Authenticating with {platform}...[/bold blue]")
     
     try:
-        from video_publisher.platforms.youtube.uploader import YouTubeUploader
-        from video_publisher.platforms.tiktok.uploader import TikTokUploader
-        from video_publisher.platforms.instagram.uploader import InstagramUploader
-        
-        uploader_map = {
-            'youtube': YouTubeUploader,
-            'tiktok': TikTokUploader,
-            'instagram': InstagramUploader
-        }
-        
-        uploader_class = uploader_map[platform]
+        # Only this platform's uploader (and its dependencies) is imported
+        uploader_class = plugin.load()
         uploader = uploader_class()
         
         console.print(f"[yellow]Starting {platform} authentication...[/yellow]")
@@ -2,23 +2,57 @@
 Video Publisher - Multi-platform video upload automation.
 
 Public API for library usage.
+
+Heavy dependencies (selenium, the Google API client, moviepy, pydantic) are
+imported on first use of the names that need them, so `import video_publisher`
+stays cheap for tools that never upload.
 """
-from typing import List, Optional, Dict
-from .core.engine import VideoPublisher
-from .core.models import VideoMetadata, Platform, UploadResult
-from .platforms.youtube.uploader import YouTubeUploader
-from .platforms.tiktok.uploader import TikTokUploader
-from .platforms.instagram.uploader import InstagramUploader
+import importlib
+from typing import TYPE_CHECKING, AsyncIterator, List, Optional, Dict
+
+if TYPE_CHECKING:
+    from .core.engine import VideoPublisher
+    from .core.models import VideoMetadata, Platform, UploadResult
+    from .platforms.youtube.uploader import YouTubeUploader
+    from .platforms.tiktok.uploader import TikTokUploader
+    from .platforms.instagram.uploader import InstagramUploader
+    from .platforms.plugins import PlatformPlugin
+    from .core.cancellation import CancellationToken
 
 __version__ = "0.1.0"
 
+# Public names resolved on first access (PEP 562)
+_LAZY_ATTRIBUTES = {
+    'VideoPublisher': '.core.engine',
+    'VideoMetadata': '.core.models',
+    'Platform': '.core.models',
+    'UploadResult': '.core.models',
+    'YouTubeUploader': '.platforms.youtube.uploader',
+    'TikTokUploader': '.platforms.tiktok.uploader',
+    'InstagramUploader': '.platforms.instagram.uploader',
+    'PlatformPlugin': '.platforms.plugins',
+    'CancellationToken': '.core.cancellation',
+}
+
+def __getattr__(name: str):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
 # Global instance for convenience
-_publisher_instance: Optional[VideoPublisher] = None
+_publisher_instance: Optional['VideoPublisher'] = None
 
-def get_publisher(headless: bool = False) -> VideoPublisher:
+def get_publisher(headless: bool = False) -> 'VideoPublisher':
     """Get or create the global VideoPublisher instance."""
     global _publisher_instance
     if _publisher_instance is None:
+        from .core.engine import VideoPublisher
         _publisher_instance = VideoPublisher(headless=headless)
     return _publisher_instance
 
@@ -26,8 +60,11 @@ def upload_video(
     video_path: str,
     platforms: Optional[List[str]] = None,
     metadata: Optional[Dict] = None,
-    headless: bool = False
-) -> List[UploadResult]:
+    headless: bool = False,
+    force: bool = False,
+    video_metadata: Optional['VideoMetadata'] = None,
+    cancel_token: Optional['CancellationToken'] = None
+) -> List['UploadResult']:
     """
     Upload a video to one or more platforms.
     
@@ -37,6 +74,10 @@ def upload_video(
                   If None, auto-detect based on video format.
         metadata: Optional metadata dict with keys like 'title', 'description', etc.
         headless: Whether to run the browser in headless mode.
+        force: Upload even where this video with this metadata was already published.
+            Otherwise those platforms are skipped and return the earlier result.
+        video_metadata: Result of VideoAnalyzer.analyze() if the video was already analyzed.
+        cancel_token: CancellationToken that stops the upload when cancelled from another thread.
     
     Returns:
         List of UploadResult objects
@@ -48,19 +89,63 @@ def upload_video(
         ...     print(f"{result.platform}: {result.url}")
     """
     publisher = get_publisher(headless=headless)
+    return publisher.upload(video_path, platforms=_to_platforms(platforms), metadata=metadata, force=force,
+                            video_metadata=video_metadata, cancel_token=cancel_token)
+
+async def upload_video_async(
+    video_path: str,
+    platforms: Optional[List[str]] = None,
+    metadata: Optional[Dict] = None,
+    headless: bool = False,
+    force: bool = False,
+    video_metadata: Optional['VideoMetadata'] = None,
+    cancel_token: Optional['CancellationToken'] = None
+) -> List['UploadResult']:
+    """
+    Awaitable version of upload_video(), taking the same arguments.
     
-    # Convert platform strings to Platform enum if provided
-    platform_enums = None
-    if platforms:
-        platform_map = {
-            'youtube': Platform.YOUTUBE,
-            'tiktok': Platform.TIKTOK,
-            'instagram': Platform.INSTAGRAM,
-            'youtube_shorts': Platform.YOUTUBE_SHORTS
-        }
-        platform_enums = [platform_map[p.lower()] for p in platforms if p.lower() in platform_map]
+    Blocking work runs in the publisher's managed executor, so a single event loop
+    can drive many publishes concurrently. Cancelling the awaiting task, or
+    cancel_token, stops every platform upload; running ones stop at their next
+    cancellation check.
     
-    return publisher.upload(video_path, platforms=platform_enums, metadata=metadata)
+    Example:
+        >>> results = await upload_video_async('my_video.mp4', platforms=['youtube'])
+    """
+    publisher = get_publisher(headless=headless)
+    return await publisher.upload_async(video_path, platforms=_to_platforms(platforms), metadata=metadata,
+                                        force=force, video_metadata=video_metadata, cancel_token=cancel_token)
+
+async def iter_upload_video_async(
+    video_path: str,
+    platforms: Optional[List[str]] = None,
+    metadata: Optional[Dict] = None,
+    headless: bool = False,
+    force: bool = False,
+    video_metadata: Optional['VideoMetadata'] = None,
+    cancel_token: Optional['CancellationToken'] = None
+) -> AsyncIterator['UploadResult']:
+    """
+    Upload a video and yield each UploadResult as its platform finishes.
+    Takes the same arguments as upload_video().
+    
+    Example:
+        >>> async for result in iter_upload_video_async('short.mp4'):
+        ...     print(f"{result.platform}: {result.success}")
+    """
+    publisher = get_publisher(headless=headless)
+    async for result in publisher.iter_upload_async(video_path, platforms=_to_platforms(platforms),
+                                                   metadata=metadata, force=force, video_metadata=video_metadata,
+                                                   cancel_token=cancel_token):
+        yield result
+
+def _to_platforms(platforms: Optional[List[str]]) -> Optional[List['Platform']]:
+    """Convert platform strings to Platform enums, ignoring names no plugin provides."""
+    if not platforms:
+        return None
+    from .core.models import Platform
+    from .platforms.plugins import plugins
+    return [Platform(p.lower()) for p in platforms if p.lower() in plugins]
 
 def configure(config: Dict) -> None:
     """
@@ -73,6 +158,7 @@ def configure(config: Dict) -> None:
         >>> configure({'youtube': {'credentials_file': 'my_creds.json'}})
     """
     global _publisher_instance
+    from .core.engine import VideoPublisher
     _publisher_instance = VideoPublisher()
     # TODO: Apply configuration to instance
 
@@ -80,6 +166,8 @@ def configure(config: Dict) -> None:
 __all__ = [
     '__version__',
     'upload_video',
+    'upload_video_async',
+    'iter_upload_video_async',
     'configure',
     'get_publisher',
     'VideoPublisher',
@@ -89,4 +177,6 @@ __all__ = [
     'YouTubeUploader',
     'TikTokUploader',
     'InstagramUploader',
+    'PlatformPlugin',
+    'CancellationToken',
 ]
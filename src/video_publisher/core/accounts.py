@@ -0,0 +1,92 @@
+"""
+Platform account configuration for multi-account publishing.
+"""
+import json
+from pathlib import Path
+from typing import Dict, List, Optional
+from pydantic import BaseModel
+from .models import Platform
+from ..platforms.plugins import get_plugin
+
+DEFAULT_ACCOUNT = "default"
+
+class Account(BaseModel):
+    """
+    One account on one platform, with its own session files and daily budget.
+    """
+    name: str
+    platform: Platform
+    daily_limit: Optional[int] = None  # None uses the platform default
+    config: Dict = {}  # Uploader config (cookies_file, token_file, username, ...)
+
+class AccountRegistry:
+    """
+    Loads accounts from a JSON file shaped like:
+
+        {
+          "tiktok": [
+            {"name": "main", "cookies_file": "data/sessions/tiktok_main.pkl", "daily_limit": 4},
+            {"name": "alt", "cookies_file": "data/sessions/tiktok_alt.pkl"}
+          ],
+          "youtube": [{"name": "brand", "token_file": "data/sessions/youtube_brand.pickle"}]
+        }
+
+    Platforms without an entry get a single default account using the uploader's
+    default session files. Platforms aliasing another one (YouTube Shorts) use its accounts
+    ("youtube") unless they have their own entry.
+    """
+
+    def __init__(self, config_path: str = "accounts.json"):
+        self.config_path = Path(config_path)
+        self._accounts: Dict[Platform, List[Account]] = {}
+        self._load()
+
+    def _load(self):
+        """Load account definitions from disk."""
+        if not self.config_path.exists():
+            return
+        with open(self.config_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        for platform_name, entries in data.items():
+            platform = Platform(platform_name)
+            accounts = []
+            for entry in entries:
+                entry = dict(entry)
+                name = entry.pop('name')
+                daily_limit = entry.pop('daily_limit', None)
+                accounts.append(Account(name=name, platform=platform, daily_limit=daily_limit, config=entry))
+            self._accounts[platform] = accounts
+
+    def add(self, account: Account):
+        """Register an account programmatically."""
+        accounts = self._accounts.setdefault(account.platform, [])
+        accounts[:] = [a for a in accounts if a.name != account.name] + [account]
+
+    def accounts_for(self, platform: Platform) -> List[Account]:
+        """Get all accounts configured for a platform (at least the default one)."""
+        if platform in self._accounts:
+            return list(self._accounts[platform])
+        plugin = get_plugin(platform)
+        if plugin is not None and plugin.alias_of and Platform(plugin.alias_of) in self._accounts:
+            return [a.model_copy(update={'platform': platform}) for a in self._accounts[Platform(plugin.alias_of)]]
+        return [Account(name=DEFAULT_ACCOUNT, platform=platform)]
+
+    def get(self, platform: Platform, name: str) -> Optional[Account]:
+        """Get an account by name, or None if it isn't configured."""
+        for account in self.accounts_for(platform):
+            if account.name == name:
+                return account
+        return None
+
+def pinned_account(metadata: dict, platform: Platform) -> Optional[str]:
+    """
+    Get the account pinned in upload metadata for a platform.
+
+    The 'account' field is either a single account name for every platform,
+    or a mapping of platform name to account name.
+    """
+    pinned = metadata.get('account')
+    if isinstance(pinned, dict):
+        return pinned.get(platform.value)
+    return pinned or None
@@ -0,0 +1,165 @@
+"""
+Persistent cache of video analyses, so a file is probed once across requests and runs.
+"""
+import os
+import time
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Optional, Tuple
+from .models import VideoMetadata
+
+# Bump when VideoAnalyzer starts reporting different values, to ignore older entries
+ANALYSIS_VERSION = 2
+
+# Last-access times are only rewritten when older than this, so hits stay read-only
+_TOUCH_INTERVAL = 60.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS analyses (
+    device INTEGER NOT NULL,
+    inode INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    version INTEGER NOT NULL,
+    path TEXT NOT NULL,
+    content_hash TEXT,
+    metadata TEXT NOT NULL,
+    accessed_at REAL NOT NULL,
+    PRIMARY KEY (device, inode, size, mtime_ns)
+);
+CREATE INDEX IF NOT EXISTS idx_analyses_content_hash ON analyses (content_hash);
+CREATE INDEX IF NOT EXISTS idx_analyses_accessed ON analyses (accessed_at);
+"""
+
+FileKey = Tuple[int, int, int, int]
+
+
+class AnalysisCache:
+    """
+    VideoMetadata keyed by file identity: (device, inode, size, mtime). A file that
+    is modified or replaced gets a new key, so stale entries are never returned.
+
+    When the caller knows the file's content hash, entries are also found by it,
+    which covers copies of an analyzed file (re-uploads, files moved between disks).
+    The least recently used entries are evicted beyond `max_entries`.
+    """
+
+    def __init__(self, db_path: str = "data/cache/analysis.db", max_entries: int = 10000):
+        self.db_path = Path(db_path)
+        if not self.db_path.parent.exists():
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._connect().executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Get the calling thread's connection, opening it if needed."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def file_key(path: str) -> Optional[FileKey]:
+        """Identity of a file, None if it can't be stat'ed."""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+    def get(self, path: str, content_hash: Optional[str] = None) -> Optional[VideoMetadata]:
+        """
+        Cached analysis of a file.
+
+        Args:
+            content_hash: The file's content hash, if known, to also match copies of it.
+
+        Returns:
+            The analysis with `path` set to the requested path, or None on a miss.
+        """
+        key = self.file_key(path)
+        if key is None:
+            return None
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT metadata, accessed_at FROM analyses "
+            "WHERE device = ? AND inode = ? AND size = ? AND mtime_ns = ? AND version = ?",
+            (*key, ANALYSIS_VERSION)
+        ).fetchone()
+        if row is None and content_hash:
+            row = conn.execute(
+                "SELECT metadata, accessed_at FROM analyses WHERE content_hash = ? AND version = ? "
+                "ORDER BY accessed_at DESC LIMIT 1",
+                (content_hash, ANALYSIS_VERSION)
+            ).fetchone()
+            if row is not None:
+                # Same bytes under a new identity: file the analysis under it too
+                metadata = VideoMetadata.model_validate_json(row['metadata'])
+                self._store(key, path, metadata, content_hash)
+                return metadata.model_copy(update={'path': path})
+        if row is None:
+            return None
+
+        now = time.time()
+        if now - row['accessed_at'] > _TOUCH_INTERVAL:
+            conn.execute(
+                "UPDATE analyses SET accessed_at = ? WHERE device = ? AND inode = ? AND size = ? AND mtime_ns = ?",
+                (now, *key)
+            )
+        return VideoMetadata.model_validate_json(row['metadata']).model_copy(update={'path': path})
+
+    def put(self, path: str, metadata: VideoMetadata, content_hash: Optional[str] = None):
+        """Cache the analysis of a file (ignored if the file no longer exists)."""
+        key = self.file_key(path)
+        if key is not None:
+            self._store(key, path, metadata, content_hash)
+
+    def _store(self, key: FileKey, path: str, metadata: VideoMetadata, content_hash: Optional[str]):
+        conn = self._connect()
+        conn.execute(
+            "INSERT INTO analyses (device, inode, size, mtime_ns, version, path, content_hash, metadata, accessed_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (device, inode, size, mtime_ns) DO UPDATE SET version = excluded.version, "
+            "path = excluded.path, content_hash = COALESCE(excluded.content_hash, analyses.content_hash), "
+            "metadata = excluded.metadata, accessed_at = excluded.accessed_at",
+            (*key, ANALYSIS_VERSION, os.path.abspath(path), content_hash, metadata.model_dump_json(), time.time())
+        )
+        # LRU eviction beyond the size cap
+        conn.execute(
+            "DELETE FROM analyses WHERE rowid IN "
+            "(SELECT rowid FROM analyses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)
+        )
+
+    def clear(self):
+        """Drop every cached analysis."""
+        self._connect().execute("DELETE FROM analyses")
+
+    def __len__(self) -> int:
+        return self._connect().execute("SELECT COUNT(*) FROM analyses").fetchone()[0]
+
+
+_default_cache: Optional[AnalysisCache] = None
+_default_lock = threading.Lock()
+
+
+def default_cache() -> Optional[AnalysisCache]:
+    """
+    Process-wide cache configured by ANALYSIS_CACHE_PATH and ANALYSIS_CACHE_SIZE.
+    None when ANALYSIS_CACHE_SIZE is 0.
+    """
+    global _default_cache
+    max_entries = int(os.environ.get('ANALYSIS_CACHE_SIZE', '10000'))
+    if max_entries <= 0:
+        return None
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = AnalysisCache(os.environ.get('ANALYSIS_CACHE_PATH', 'data/cache/analysis.db'),
+                                           max_entries=max_entries)
+        return _default_cache
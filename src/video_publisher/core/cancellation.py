@@ -0,0 +1,108 @@
+"""
+Cooperative cancellation of uploads.
+"""
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator, List, Optional
+
+
+class UploadCancelled(Exception):
+    """Raised inside an upload once its cancellation token has been cancelled."""
+
+
+class CancellationToken:
+    """
+    Signals that an upload should stop.
+
+    Cancellation is cooperative: the engine and the uploaders check the token
+    between steps, and waits made through it (sleep(), wait()) return as soon as
+    it is cancelled. Blocking work that cannot check the token (a Selenium wait,
+    a browser launch) is interrupted by callbacks registered with on_cancel(),
+    e.g. quitting the browser the wait is polling.
+    """
+
+    def __init__(self, parent: Optional['CancellationToken'] = None):
+        """
+        Args:
+            parent: Token whose cancellation also cancels this one.
+        """
+        self.reason: Optional[str] = None
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: List[Callable[[], None]] = []
+        if parent is not None:
+            parent.on_cancel(lambda: self.cancel(parent.reason))
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self, reason: str = "Cancelled"):
+        """Cancel the token and run its callbacks. Cancelling twice has no effect."""
+        with self._lock:
+            if self._event.is_set():
+                return
+            self.reason = reason
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                print(f"⚠️  Cancellation callback failed: {e}")
+
+    def on_cancel(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """
+        Run `callback` when the token is cancelled (right away if it already is).
+
+        Returns:
+            A function unregistering the callback, to call once the work it interrupts is over.
+        """
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return lambda: self._remove(callback)
+        callback()
+        return lambda: None
+
+    def _remove(self, callback: Callable[[], None]):
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    def child(self) -> 'CancellationToken':
+        """Token cancelled with this one, which can also be cancelled on its own."""
+        return CancellationToken(parent=self)
+
+    def raise_if_cancelled(self):
+        """Raise UploadCancelled if the token was cancelled."""
+        if self._event.is_set():
+            raise UploadCancelled(self.reason)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until cancelled or `timeout` seconds passed. Returns True if cancelled."""
+        return self._event.wait(timeout)
+
+    def sleep(self, seconds: float):
+        """time.sleep() that raises UploadCancelled as soon as the token is cancelled."""
+        if self._event.wait(max(0.0, seconds)):
+            raise UploadCancelled(self.reason)
+
+
+_current_token: ContextVar[Optional[CancellationToken]] = ContextVar('cancellation_token', default=None)
+
+
+def current_token() -> Optional[CancellationToken]:
+    """Token of the upload running in the current context, if any."""
+    return _current_token.get()
+
+
+@contextmanager
+def activate(token: CancellationToken) -> Iterator[CancellationToken]:
+    """Make `token` the current token while the block runs (on this thread)."""
+    reset = _current_token.set(token)
+    try:
+        yield token
+    finally:
+        _current_token.reset(reset)
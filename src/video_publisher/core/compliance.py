@@ -0,0 +1,114 @@
+"""
+Pre-flight compliance checks against platform upload specs.
+
+A video the platform will reject is otherwise only found out after minutes of
+browser automation or a full resumable transfer. Each plugin declares a
+PlatformSpec; preflight() compares the analyzed video against it before any
+upload starts, rejecting non-compliant platforms or rerouting them.
+"""
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Dict, FrozenSet, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .models import Platform, VideoMetadata
+
+GB = 1024 ** 3
+
+
+@dataclass(frozen=True)
+class PlatformSpec:
+    """
+    What a platform accepts. None (or an empty codec set) means no limit.
+    Properties the analysis could not determine (codec, fps) are not checked.
+    """
+
+    min_duration: Optional[float] = None       # Seconds
+    max_duration: Optional[float] = None
+    max_size: Optional[int] = None             # File size in bytes
+    min_resolution: Optional[int] = None       # Pixels on the shorter side
+    max_resolution: Optional[int] = None       # Pixels on the longer side
+    min_aspect_ratio: Optional[float] = None   # Display width / height
+    max_aspect_ratio: Optional[float] = None
+    codecs: FrozenSet[str] = frozenset()       # Video codecs, as reported by the analyzer
+    max_fps: Optional[float] = None
+    max_bitrate: Optional[int] = None          # Bits per second
+
+    def violations(self, video: 'VideoMetadata') -> List[str]:
+        """Human readable reasons the video does not meet this spec (empty if it does)."""
+        problems = []
+        if self.min_duration is not None and video.duration < self.min_duration:
+            problems.append(f"duration {video.duration:.1f}s is under the {self.min_duration:g}s minimum")
+        if self.max_duration is not None and video.duration > self.max_duration:
+            problems.append(f"duration {video.duration:.1f}s exceeds the {self.max_duration:g}s maximum")
+        if self.max_size is not None and video.size is not None and video.size > self.max_size:
+            problems.append(f"file size {_format_size(video.size)} exceeds the {_format_size(self.max_size)} maximum")
+        short_side, long_side = sorted((video.width, video.height))
+        if self.min_resolution is not None and short_side < self.min_resolution:
+            problems.append(f"resolution {video.width}x{video.height} is under the {self.min_resolution}p minimum")
+        if self.max_resolution is not None and long_side > self.max_resolution:
+            problems.append(f"resolution {video.width}x{video.height} exceeds {self.max_resolution} pixels")
+        if self.min_aspect_ratio is not None and video.aspect_ratio < self.min_aspect_ratio - 0.01:
+            problems.append(f"aspect ratio {video.aspect_ratio:.2f} is narrower than {self.min_aspect_ratio:.2f}")
+        if self.max_aspect_ratio is not None and video.aspect_ratio > self.max_aspect_ratio + 0.01:
+            problems.append(f"aspect ratio {video.aspect_ratio:.2f} is wider than {self.max_aspect_ratio:.2f}")
+        if self.codecs and video.codec and video.codec not in self.codecs:
+            problems.append(f"codec {video.codec} is not supported ({', '.join(sorted(self.codecs))})")
+        if self.max_fps is not None and video.fps and video.fps > self.max_fps + 0.5:
+            problems.append(f"frame rate {video.fps:g} fps exceeds {self.max_fps:g} fps")
+        if self.max_bitrate is not None and video.bitrate and video.bitrate > self.max_bitrate:
+            problems.append(f"bitrate {video.bitrate // 1000} kbps exceeds {self.max_bitrate // 1000} kbps")
+        return problems
+
+
+def _format_size(size: int) -> str:
+    return f"{size / GB:.1f} GB" if size >= GB else f"{size / 1024 ** 2:.0f} MB"
+
+
+def check(video: 'VideoMetadata', platform: 'Platform') -> List[str]:
+    """Reasons `platform` would reject the video, empty if it complies or declares no spec."""
+    from ..platforms.plugins import get_plugin
+    plugin = get_plugin(platform)
+    if plugin is None or plugin.spec is None:
+        return []
+    return plugin.spec.violations(video)
+
+
+def preflight(video: 'VideoMetadata', platforms: List['Platform'],
+              prepare: Optional[Callable[['Platform', 'VideoMetadata'], 'VideoMetadata']] = None
+              ) -> Tuple[List['Platform'], Dict['Platform', str]]:
+    """
+    Check a video against the spec of every target platform.
+
+    A non-compliant alias is rerouted to the platform it aliases when the video
+    complies there (a vertical video too long for YouTube Shorts goes to YouTube).
+
+    Args:
+        prepare: Returns what a platform will actually receive, when it differs from
+                 `video` (e.g. a transcoded rendition).
+
+    Returns:
+        Tuple (targets, rejections). targets is `platforms` plus any reroute targets;
+        rejections maps each non-compliant platform to the reason, to report instead of uploading.
+    """
+    from .models import Platform
+    from ..platforms.plugins import get_plugin
+
+    def problems_on(platform: Platform) -> List[str]:
+        return check(prepare(platform, video) if prepare else video, platform)
+
+    targets = list(platforms)
+    rejections: Dict[Platform, str] = {}
+    for platform in platforms:
+        problems = problems_on(platform)
+        if not problems:
+            continue
+        reason = f"Not accepted by {platform.value}: {'; '.join(problems)}"
+        plugin = get_plugin(platform)
+        if plugin is not None and plugin.alias_of:
+            fallback = Platform(plugin.alias_of)
+            if not problems_on(fallback):
+                if fallback not in targets:
+                    targets.append(fallback)
+                reason += f" (uploading to {fallback.value} instead)"
+        rejections[platform] = reason
+    return targets, rejections
@@ -1,57 +1,374 @@
-from typing import List, Optional
+from typing import TYPE_CHECKING, AsyncIterator, Dict, List, Optional, Tuple, Union
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from .models import VideoMetadata, Platform, UploadResult
 from .video_analyzer import VideoAnalyzer
+from .analysis_cache import default_cache
+from .compliance import preflight
 from .platform_router import PlatformRouter
-from ..platforms.youtube.uploader import YouTubeUploader
-from ..platforms.tiktok.uploader import TikTokUploader
-from ..platforms.instagram.uploader import InstagramUploader
-from ..safety import RateLimiter, RiskDetector, EmergencyStop
+from ..platforms.base import BasePlatform
+from ..platforms.registry import UploaderRegistry
+from ..platforms.plugins import PlatformPlugin, plugins
+from ..safety import RateLimiter, RiskDetector, EmergencyStop, CircuitBreakerRegistry
+from .accounts import AccountRegistry, DEFAULT_ACCOUNT, pinned_account
+from .retry import (API_RETRY_POLICY, BROWSER_RETRY_POLICY, DEFAULT_RETRY_POLICIES, NO_RETRY,
+                    ErrorClass, RetryPolicy)
+from .hashing import file_content_hash, metadata_hash
+from .ledger import PublicationLedger
+from .cancellation import CancellationToken, UploadCancelled, activate
+from ..media.transcode import TranscodeError
 import os
 import time
+import heapq
+import contextlib
+import asyncio
+import threading
+
+if TYPE_CHECKING:
+    from ..media.fingerprint import FingerprintIndex
+    from ..media.transcode import RenditionCache, TranscodeProfile
+
+def _is_dry_run() -> bool:
+    """Check whether DRY_RUN or TEST_MODE is enabled."""
+    return (os.environ.get('DRY_RUN', 'false').lower() == 'true'
+            or os.environ.get('TEST_MODE', 'false').lower() == 'true')
+
+def _uploader_class(platform: Platform) -> type:
+    """
+    Import and return the uploader class for a platform.
+    Imported on first use: selenium and the Google API client are slow to import.
+    """
+    return plugins.get(platform).load()
+
+# Seconds between checks for cancellation while blocked on something else
+_WATCH_INTERVAL = 0.5
+
+class _Publish:
+    """State shared by the platform uploads of one publish call."""
+
+    def __init__(self, video_path: str, metadata: dict, force: bool = False,
+                 cancel_token: Optional[CancellationToken] = None):
+        self.video_path = video_path
+        self.metadata = metadata
+        self.force = force  # Upload even if the ledger says it was already published
+        self.cancel_token = cancel_token or CancellationToken()
+        self.content_hash: Optional[str] = None
+        self.metadata_hash: Optional[str] = None
+        self.rejections: Dict[Platform, str] = {}  # Platforms the video does not comply with, and why
+        self.video_metadata: Optional[VideoMetadata] = None
+        self.fingerprint = None  # Perceptual frame hashes, indexed once the video is published
+
+class _PlatformUpload:
+    """State of one platform's upload across its retry attempts."""
+
+    def __init__(self, publish: _Publish, platform: Platform, account: str, reserved_day: Optional[str],
+                 cancel_token: Optional[CancellationToken] = None):
+        self.publish = publish
+        self.platform = platform
+        self.account = account
+        self.reserved_day = reserved_day  # Day of the rate limit slot held, released on failure
+        self.cancel_token = cancel_token or publish.cancel_token
+        self.uploader: Optional[BasePlatform] = None
+        self.video_path: Optional[str] = None  # File uploaded: the source or its rendition for the platform
+        self.attempt = 0
+        self.failure: Union[str, BaseException, None] = None  # Last error, for classification
 
 class VideoPublisher:
-    def __init__(self, headless: bool = False):
-        self.analyzer = VideoAnalyzer()
+    def __init__(self, headless: bool = False, max_workers: Optional[int] = None, executor_workers: int = 16,
+                 retry_policies: Optional[Dict[Platform, RetryPolicy]] = None):
+        """
+        Args:
+            headless: Whether to run browser-based uploaders in headless mode.
+            max_workers: Maximum number of platform uploads running at the same time.
+                         None runs every target platform in its own worker, 1 uploads sequentially.
+            executor_workers: Size of the thread pool backing the async API, shared by all publishes.
+            retry_policies: Per-platform retry policies overriding DEFAULT_RETRY_POLICIES.
+        """
+        self.analyzer = VideoAnalyzer(cache=default_cache())
         self.router = PlatformRouter()
-        
+        # Covers picked from the video when the metadata has no thumbnail (opt-in: samples frames)
+        self.auto_cover = os.environ.get('AUTO_COVER', 'false').lower() == 'true'
+        # Per-platform renditions: "off", "auto" (sources heavier than the profile) or "always"
+        self.transcode = os.environ.get('TRANSCODE', 'off').lower()
+        self._renditions: Optional['RenditionCache'] = None
+        # Multi-aspect derivatives: platforms taking the other orientation get a cropped rendition
+        self.reframe = os.environ.get('REFRAME', 'false').lower() == 'true'
+        # Near-duplicates of published videos: "off", "warn" or "block"
+        self.duplicate_check = os.environ.get('DUPLICATE_CHECK', 'off').lower()
+        self._fingerprints: Optional['FingerprintIndex'] = None
+        self.max_workers = max_workers
+        self.executor_workers = executor_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        # Plugins without a tuned policy get the generic one for their kind of backend
+        plugin_policies = {
+            Platform(plugin.name): BROWSER_RETRY_POLICY if plugin.uses_browser else API_RETRY_POLICY
+            for plugin in plugins.plugins()
+        }
+        self.retry_policies = {**plugin_policies, **DEFAULT_RETRY_POLICIES, **(retry_policies or {})}
+
         # Safety Systems
         self.rate_limiter = RateLimiter()
         self.risk_detector = RiskDetector()
         self.emergency_stop = EmergencyStop()
-        
-        # Initialize platform uploaders
-        self.uploaders = {
-            Platform.YOUTUBE: YouTubeUploader({'headless': headless}),
-            Platform.YOUTUBE_SHORTS: YouTubeUploader({'headless': headless}),
-            Platform.TIKTOK: TikTokUploader({'headless': headless}),
-            Platform.INSTAGRAM: InstagramUploader({'headless': headless})
+        self.circuit_breakers = CircuitBreakerRegistry(
+            failure_threshold=float(os.environ.get('CIRCUIT_BREAKER_THRESHOLD', '0.5')),
+            min_calls=int(os.environ.get('CIRCUIT_BREAKER_MIN_CALLS', '3')),
+            cooldown=float(os.environ.get('CIRCUIT_BREAKER_COOLDOWN', '300'))
+        )
+
+        # Publication Ledger - what was already published where, to skip duplicate uploads
+        self.ledger: Optional[PublicationLedger] = PublicationLedger(
+            os.environ.get('LEDGER_DB_PATH', 'data/ledger/publications.db'))
+
+        # Accounts - each with its own session files and daily budget
+        self.accounts = AccountRegistry(os.environ.get('ACCOUNTS_FILE', 'accounts.json'))
+        for platform in map(Platform, plugins.names()):
+            for account in self.accounts.accounts_for(platform):
+                if account.daily_limit is not None:
+                    self.rate_limiter.set_limit(platform, account.daily_limit, account.name)
+
+        # Platform uploaders (default account), one per installed plugin, built on first use.
+        # Aliases (YouTube Shorts) share the uploader of their platform.
+        self.headless = headless
+        self._browser_config = {
+            'headless': headless,
+            'pool_size': int(os.environ.get('BROWSER_POOL_SIZE', '2')),
+            'pool_idle_timeout': float(os.environ.get('BROWSER_POOL_IDLE_TIMEOUT', '600'))
         }
+        self.uploaders = UploaderRegistry()
+        for plugin in plugins.plugins():
+            platform = Platform(plugin.name)
+            if plugin.alias_of:
+                self.uploaders.alias(platform, Platform(plugin.alias_of))
+            else:
+                self.uploaders.register(platform, self._uploader_factory(plugin))
+        # Uploaders for additional accounts, created on first use
+        self._account_uploaders = {}
+        self._uploaders_lock = threading.Lock()
+        # Per-account upload slots for plugins declaring max_concurrency
+        self._upload_slots: Dict[Tuple[Platform, str], threading.BoundedSemaphore] = {}
 
-    def upload(self, video_path: str, platforms: Optional[List[Platform]] = None, metadata: Optional[dict] = None) -> List[UploadResult]:
+    def _uploader_config(self, plugin: PlatformPlugin) -> dict:
+        """Base configuration passed to a plugin's uploader."""
+        base_config = self._browser_config if plugin.uses_browser else {'headless': self.headless}
+        return {**base_config, **plugin.config}
+
+    def _uploader_factory(self, plugin: PlatformPlugin):
+        platform = Platform(plugin.name)
+        return lambda: _uploader_class(platform)(self._uploader_config(plugin))
+
+    def upload(self, video_path: str, platforms: Optional[List[Platform]] = None, metadata: Optional[dict] = None,
+               max_workers: Optional[int] = None, force: bool = False,
+               video_metadata: Optional[VideoMetadata] = None,
+               cancel_token: Optional[CancellationToken] = None) -> List[UploadResult]:
         """
         Orchestrates the video upload process.
-        
+
         Args:
             video_path: Path to the video file.
             platforms: Optional list of platforms to upload to. If None, platforms are determined automatically.
             metadata: Optional metadata dict for the upload (title, description, etc.)
-            
+            max_workers: Overrides the publisher's max parallelism for this call.
+            force: Upload even to platforms where the ledger shows this video and metadata already published.
+            video_metadata: Analysis of the video done beforehand (e.g. while a previous upload ran).
+                            The video is analyzed here if None.
+            cancel_token: Cancelling it stops the publish: platforms not started yet are skipped,
+                          running uploads abort at their next step and nothing is retried.
+
         Returns:
-            List of UploadResult objects.
+            List of UploadResult objects, in the same order as the target platforms.
+        """
+        target_platforms, publish, early_results = self._prepare(video_path, platforms, metadata, force,
+                                                                 video_metadata, cancel_token)
+        if early_results is not None:
+            return early_results
+
+        # 4. Upload to each platform
+        workers = self._resolve_workers(max_workers, len(target_platforms))
+
+        if workers > 1:
+            print(f"Uploading to {len(target_platforms)} platforms with {workers} parallel workers...")
+        # Results are returned in target order regardless of completion order
+        return self._run_platforms(target_platforms, publish, workers)
+
+    async def upload_async(self, video_path: str, platforms: Optional[List[Platform]] = None,
+                           metadata: Optional[dict] = None, max_workers: Optional[int] = None,
+                           force: bool = False, video_metadata: Optional[VideoMetadata] = None,
+                           cancel_token: Optional[CancellationToken] = None) -> List[UploadResult]:
+        """
+        Awaitable version of upload().
+
+        Blocking analysis and platform uploads run in the publisher's managed executor.
+        Cancelling the awaiting task cancels every platform upload, including running ones
+        (which stop at their next cancellation check).
+
+        Returns:
+            List of UploadResult objects, in the same order as the target platforms.
+        """
+        early_results, tasks = await self._start_async(video_path, platforms, metadata, max_workers, force,
+                                                       video_metadata, cancel_token)
+        if early_results is not None:
+            return early_results
+        try:
+            return list(await asyncio.gather(*tasks))
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def iter_upload_async(self, video_path: str, platforms: Optional[List[Platform]] = None,
+                                metadata: Optional[dict] = None, max_workers: Optional[int] = None,
+                                force: bool = False, video_metadata: Optional[VideoMetadata] = None,
+                                cancel_token: Optional[CancellationToken] = None
+                                ) -> AsyncIterator[UploadResult]:
+        """
+        Upload a video and yield each platform's UploadResult as soon as it finishes.
+
+        Example:
+            >>> async for result in publisher.iter_upload_async('clip.mp4'):
+            ...     print(result.platform, result.success)
         """
+        early_results, tasks = await self._start_async(video_path, platforms, metadata, max_workers, force,
+                                                       video_metadata, cancel_token)
+        if early_results is not None:
+            for result in early_results:
+                yield result
+            return
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Stop pending platforms if the consumer stops iterating or is cancelled
+            for task in tasks:
+                task.cancel()
+
+    async def _start_async(self, video_path: str, platforms: Optional[List[Platform]], metadata: Optional[dict],
+                           max_workers: Optional[int], force: bool = False,
+                           video_metadata: Optional[VideoMetadata] = None,
+                           cancel_token: Optional[CancellationToken] = None
+                           ) -> Tuple[Optional[List[UploadResult]], List[asyncio.Task]]:
+        """Run the blocking preparation off-loop, then schedule one task per target platform."""
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+
+        target_platforms, publish, early_results = await loop.run_in_executor(
+            executor, self._prepare, video_path, platforms, metadata, force, video_metadata, cancel_token
+        )
+        if early_results is not None:
+            return early_results, []
+
+        limit = asyncio.Semaphore(self._resolve_workers(max_workers, len(target_platforms)))
+
+        async def run(platform: Platform) -> UploadResult:
+            # Cancelling this task cancels only this platform's upload
+            token = publish.cancel_token.child()
+            upload = None
+            while True:
+                async with limit:
+                    attempt = executor.submit(self._attempt_platform, platform, upload, publish, token)
+                    try:
+                        upload, result = await asyncio.wrap_future(attempt)
+                    except asyncio.CancelledError:
+                        # Interrupt the running attempt and settle it when it returns
+                        token.cancel()
+                        attempt.add_done_callback(self._settle_abandoned)
+                        raise
+                if upload is None:
+                    return result
+                delay = self._retry_delay(upload, result)
+                if delay is None:
+                    return self._finish_platform(upload, result)
+                # Back off without holding a worker slot, waking up early if cancelled
+                try:
+                    await self._backoff_async(token, delay)
+                except asyncio.CancelledError:
+                    token.cancel()
+                    self._finish_platform(upload, self._cancelled_result(platform, token))
+                    raise
+
+        return None, [asyncio.ensure_future(run(platform)) for platform in target_platforms]
+
+    @staticmethod
+    async def _backoff_async(token: CancellationToken, delay: float):
+        """asyncio.sleep() that returns as soon as `token` is cancelled."""
+        loop = asyncio.get_running_loop()
+        woken = asyncio.Event()
+        unregister = token.on_cancel(lambda: loop.call_soon_threadsafe(woken.set))
+        try:
+            await asyncio.wait_for(woken.wait(), delay)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            unregister()
+
+    def _settle_abandoned(self, attempt: Future):
+        """Finish an attempt whose caller was cancelled, releasing its rate limit slot if it failed."""
+        if attempt.cancelled() or attempt.exception() is not None:
+            return
+        upload, result = attempt.result()
+        if upload is not None:
+            self._finish_platform(upload, result)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Get the executor shared by all async publishes, creating it on first use."""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.executor_workers,
+                                                    thread_name_prefix="publisher")
+            return self._executor
+
+    def close(self):
+        """Shut down the managed executor. Running uploads are allowed to finish."""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def _resolve_workers(self, max_workers: Optional[int], platform_count: int) -> int:
+        """Number of platform uploads allowed to run at once for a call."""
+        workers = max_workers if max_workers is not None else self.max_workers
+        if workers is None:
+            workers = platform_count
+        return max(1, min(workers, platform_count or 1))
+
+    def _prepare(self, video_path: str, platforms: Optional[List[Platform]], metadata: Optional[dict],
+                 force: bool = False, video_metadata: Optional[VideoMetadata] = None,
+                 cancel_token: Optional[CancellationToken] = None
+                 ) -> Tuple[List[Platform], _Publish, Optional[List[UploadResult]]]:
+        """
+        Run the pre-upload stages: emergency stop, analysis, risk detection and routing.
+
+        Returns:
+            Tuple (target_platforms, publish, early_results).
+            early_results is set when the upload must be aborted before reaching any platform.
+        """
+        upload_metadata = metadata or {}
+        publish = _Publish(video_path, upload_metadata, force, cancel_token)
+
         # 0. Emergency Stop Check
         if self.emergency_stop.is_triggered():
             print("🚨 EMERGENCY STOP TRIGGERED! Aborting uploads.")
-            return [UploadResult(platform=p, success=False, error="Emergency Stop Triggered") 
-                   for p in (platforms or [])]
+            return [], publish, [UploadResult(platform=p, success=False, error="Emergency Stop Triggered")
+                                         for p in (platforms or [])]
+        if publish.cancel_token.cancelled:
+            return [], publish, [self._cancelled_result(p, publish.cancel_token) for p in (platforms or [])]
 
-        # 1. Analyze
-        print(f"Analyzing video: {video_path}")
-        video_metadata = self.analyzer.analyze(video_path)
+        # 1. Ledger key - identifies this exact video and metadata across runs
+        if self.ledger is not None:
+            try:
+                publish.content_hash = file_content_hash(video_path)
+                publish.metadata_hash = metadata_hash(upload_metadata)
+            except OSError as e:
+                print(f"⚠️  Could not hash {video_path} for the publication ledger: {e}")
+
+        # 2. Analyze (unless done ahead of time)
+        if video_metadata is None:
+            print(f"Analyzing video: {video_path}")
+            video_metadata = self.analyzer.analyze(video_path, content_hash=publish.content_hash)
         print(f"Metadata: {video_metadata}")
-        
-        # 2. Risk Detection
-        upload_metadata = metadata or {}
+        publish.video_metadata = video_metadata
+
+        # 3. Risk Detection
         is_safe, warnings = self.risk_detector.check(upload_metadata)
         if warnings:
             print("⚠️  Risk Warnings:")
@@ -59,77 +376,480 @@ class VideoPublisher:
                 print(f"  - {w}")
             if not is_safe:
                 print("❌ Risk check failed. Aborting upload.")
-                return [UploadResult(platform=p, success=False, error=f"Risk check failed: {warnings[0]}") 
-                       for p in (platforms or [])]
-        
-        # 3. Route
+                return [], publish, [UploadResult(platform=p, success=False, error=f"Risk check failed: {warnings[0]}")
+                                             for p in (platforms or [])]
+
+        # 4. Route
         if platforms:
             target_platforms = platforms
         else:
-            target_platforms = self.router.route(video_metadata)
-        
+            target_platforms = self.router.route(video_metadata, reframe=self.reframe)
+
+        # 5. Near-duplicates - reposting a clip, even re-encoded or trimmed, gets accounts flagged
+        duplicate = self._check_duplicate(publish)
+        if duplicate and self.duplicate_check == 'block' and not force:
+            print(f"❌ {duplicate}. Aborting upload (use force to publish anyway).")
+            return [], publish, [UploadResult(platform=p, success=False, error=duplicate) for p in target_platforms]
+        if duplicate:
+            print(f"⚠️  {duplicate}")
+
+        # 6. Pre-flight - don't spend an upload on what the platform will reject
+        target_platforms, publish.rejections = preflight(video_metadata, target_platforms,
+                                                         prepare=self._uploaded_video)
+        for reason in publish.rejections.values():
+            print(f"🚫 {reason}")
+
+        # 7. Cover - picked from the video for platforms taking a thumbnail, unless one was given
+        if self.auto_cover and not upload_metadata.get('thumbnail_path') and any(
+                'thumbnail' in plugins.get(p).capabilities for p in target_platforms
+                if p not in publish.rejections and plugins.get(p) is not None):
+            cover = self.cover_for(video_path, publish.content_hash)
+            if cover:
+                # After the ledger key: a generated cover doesn't make the upload a different one
+                publish.metadata = {**upload_metadata, 'thumbnail_path': cover}
+
         print(f"Target platforms: {[p.value for p in target_platforms]}")
-        
-        # 4. Upload to each platform
-        results = []
-        
-        for platform in target_platforms:
-            print(f"Processing {platform.value}...")
+        return target_platforms, publish, None
 
+    def _transcode_profile(self, platform: Platform, video_metadata: Optional[VideoMetadata]
+                           ) -> Optional['TranscodeProfile']:
+        """Profile of the rendition to upload to a platform, None to upload the source file."""
+        plugin = plugins.get(platform)
+        if plugin is None:
+            return None
+        aspect_ratio = self._reframe_aspect_ratio(plugin, video_metadata)
+        if aspect_ratio is not None:
+            from ..media.transcode import TranscodeProfile
+            return (plugin.transcode or TranscodeProfile(plugin.name)).reframed(aspect_ratio)
+        if self.transcode not in ('auto', 'always') or plugin.transcode is None:
+            return None
+        if self.transcode == 'auto' and (video_metadata is None
+                                         or not plugin.transcode.needs_transcode(video_metadata)):
+            return None
+        return plugin.transcode
 
-            
-            # Rate Limit Check
-            if not self.rate_limiter.can_upload(platform) and not (os.environ.get('DRY_RUN', 'false').lower() == 'true' or os.environ.get('TEST_MODE', 'false').lower() == 'true'):
-                print(f"❌ Rate limit exceeded for {platform.value}. Skipping.")
-                results.append(UploadResult(
-                    platform=platform,
-                    success=False,
-                    error="Daily rate limit exceeded"
-                ))
-                continue
-            
-            print(f"Uploading to {platform.value}...")
-            
-            if platform in self.uploaders:
-                uploader = self.uploaders[platform]
-                
-                # Retry logic: Try up to 3 times for Instagram and TikTok
-                max_attempts = 3 if platform in [Platform.INSTAGRAM, Platform.TIKTOK] else 1
-                last_result = None
-                
-                for attempt in range(1, max_attempts + 1):
-                    if attempt > 1:
-                        print(f"\n🔄 Retrying {platform.value} upload (Attempt {attempt}/{max_attempts})...")
-                        # Reset state: navigate back to home before retrying
-                        try:
-                            if hasattr(uploader, 'driver') and uploader.driver:
-                                home_url = 'https://www.instagram.com' if platform == Platform.INSTAGRAM else 'https://www.tiktok.com'
-                                uploader.driver.get(home_url)
-                                time.sleep(3)
-                        except:
-                            pass
-                    
-                    result = uploader.upload(video_path, upload_metadata)
-                    last_result = result
-                    
-                    if result.success:
-                        if not (os.environ.get('DRY_RUN', 'false').lower() == 'true' or os.environ.get('TEST_MODE', 'false').lower() == 'true'):
-                            self.rate_limiter.record_upload(platform)
-                        remaining = self.rate_limiter.get_remaining(platform)
-                        print(f"✅ Upload successful! ({remaining} uploads remaining today)")
+    def _reframe_aspect_ratio(self, plugin: PlatformPlugin,
+                              video_metadata: Optional[VideoMetadata]) -> Optional[float]:
+        """Aspect ratio of the derivative a platform needs, None if it takes the video's orientation."""
+        if not self.reframe or video_metadata is None or not plugin.orientations:
+            return None
+        orientation = 'vertical' if video_metadata.is_vertical else 'horizontal'
+        if orientation in plugin.orientations:
+            return None
+        from ..media.transcode import ORIENTATION_ASPECT_RATIOS
+        return ORIENTATION_ASPECT_RATIOS[plugin.orientations[0]]
+
+    def _uploaded_video(self, platform: Platform, video_metadata: VideoMetadata) -> VideoMetadata:
+        """Properties of the file a platform will receive, for pre-flight checks."""
+        profile = self._transcode_profile(platform, video_metadata)
+        return profile.project(video_metadata) if profile else video_metadata
+
+    @property
+    def renditions(self) -> 'RenditionCache':
+        """Rendition cache shared by every publish, created on first use."""
+        with self._executor_lock:
+            if self._renditions is None:
+                from ..media.transcode import GB, RenditionCache
+                self._renditions = RenditionCache(
+                    os.environ.get('TRANSCODE_CACHE_DIR', 'data/cache/renditions'),
+                    quota=int(float(os.environ.get('TRANSCODE_CACHE_QUOTA_GB', '20')) * GB),
+                    workers=int(os.environ.get('TRANSCODE_WORKERS', '2'))
+                )
+            return self._renditions
+
+    def _rendition_path(self, platform: Platform, publish: _Publish, token: CancellationToken) -> str:
+        """File to upload to a platform: its rendition if transcoding applies, else the source."""
+        profile = self._transcode_profile(platform, publish.video_metadata)
+        if profile is None:
+            return publish.video_path
+        try:
+            return self.renditions.get(publish.video_path, profile, publish.content_hash, token)
+        except UploadCancelled:
+            raise
+        except Exception as e:
+            if profile.aspect_ratio:
+                # The original has the wrong shape for this platform
+                raise TranscodeError(f"Could not reframe the video for {platform.value}: {e}") from e
+            print(f"⚠️  Could not transcode for {platform.value}, uploading the original: {e}")
+            return publish.video_path
+
+    @property
+    def fingerprints(self) -> 'FingerprintIndex':
+        """Fingerprints of published videos, opened on first use."""
+        with self._executor_lock:
+            if self._fingerprints is None:
+                from ..media.fingerprint import FingerprintIndex
+                self._fingerprints = FingerprintIndex(
+                    os.environ.get('FINGERPRINT_DB_PATH', 'data/fingerprints/index.db'),
+                    threshold=float(os.environ.get('DUPLICATE_THRESHOLD', '0.5'))
+                )
+            return self._fingerprints
+
+    def _check_duplicate(self, publish: _Publish) -> Optional[str]:
+        """Fingerprint the video and describe the published video it nearly duplicates, if any."""
+        if self.duplicate_check not in ('warn', 'block') or not publish.content_hash:
+            return None
+        try:
+            publish.fingerprint = self.fingerprint_for(publish.video_path)
+            matches = self.fingerprints.query(publish.fingerprint, exclude=publish.content_hash)
+        except Exception as e:
+            print(f"⚠️  Could not check {publish.video_path} for near-duplicates: {e}")
+            return None
+        if not matches:
+            return None
+        match = matches[0]
+        published = time.strftime('%Y-%m-%d', time.localtime(match.published_at))
+        return (f"Near-duplicate of {match.label or match.content_hash[:12]}, published {published} "
+                f"({match.similarity:.0%} of frames match)")
+
+    @staticmethod
+    def fingerprint_for(video_path: str):
+        """Perceptual fingerprint of a video (see media.fingerprint)."""
+        from ..media.fingerprint import fingerprint
+        return fingerprint(video_path)
+
+    @staticmethod
+    def cover_for(video_path: str, content_hash: Optional[str] = None) -> Optional[str]:
+        """
+        Cover picked from the video's frames (cached by content hash).
+        None, to upload without one, if it can't be made.
+        """
+        try:
+            from ..media.covers import select_cover
+            cover = select_cover(video_path, content_hash=content_hash)
+            if cover:
+                print(f"🖼️  Cover picked from the video: {cover}")
+            return cover
+        except Exception as e:
+            print(f"⚠️  Could not pick a cover for {video_path}: {e}")
+            return None
+
+    def _run_platforms(self, target_platforms: List[Platform], publish: _Publish, workers: int) -> List[UploadResult]:
+        """
+        Upload to every target platform with at most `workers` attempts running at once.
+
+        A failed attempt does not hold its worker while backing off: the retry is
+        scheduled for later and the worker moves on to other platforms meanwhile.
+
+        Once the publish is cancelled (or the emergency stop is triggered while it runs),
+        platforms not started yet and pending retries are settled right away and running
+        attempts are interrupted.
+        """
+        results: List[Optional[UploadResult]] = [None] * len(target_platforms)
+        not_started = deque(enumerate(target_platforms))
+        retries: List[Tuple[float, int, int, _PlatformUpload]] = []  # heap of (due, seq, index, upload)
+        running = {}  # future -> index
+        seq = 0
+        token = publish.cancel_token
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="upload") as executor:
+            while not_started or retries or running:
+                if not token.cancelled and self.emergency_stop.is_triggered():
+                    print("🚨 EMERGENCY STOP TRIGGERED! Cancelling running uploads.")
+                    token.cancel("Emergency Stop Triggered")
+                if token.cancelled:
+                    while not_started:
+                        index, platform = not_started.popleft()
+                        results[index] = self._cancelled_result(platform, token)
+                    while retries:
+                        _, _, index, upload = heapq.heappop(retries)
+                        results[index] = self._finish_platform(upload, self._cancelled_result(upload.platform, token))
+
+                now = time.monotonic()
+                while len(running) < workers:
+                    if retries and retries[0][0] <= now:
+                        _, _, index, upload = heapq.heappop(retries)
+                        future = executor.submit(self._attempt_platform, upload.platform, upload, publish)
+                    elif not_started:
+                        index, platform = not_started.popleft()
+                        future = executor.submit(self._attempt_platform, platform, None, publish)
+                    else:
                         break
+                    running[future] = index
+
+                timeout = max(0.0, retries[0][0] - now) if retries else None
+                if not running:
+                    token.wait(timeout)
+                    continue
+
+                # Wake up regularly to notice the emergency stop while uploads run
+                timeout = _WATCH_INTERVAL if timeout is None else min(timeout, _WATCH_INTERVAL)
+                done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = running.pop(future)
+                    upload, result = future.result()
+                    if upload is None:
+                        results[index] = result
+                        continue
+                    delay = self._retry_delay(upload, result)
+                    if delay is None:
+                        results[index] = self._finish_platform(upload, result)
                     else:
-                        if attempt < max_attempts:
-                            print(f"⚠️  {platform.value} attempt {attempt} failed: {result.error}. Waiting 10s before retry...")
-                            time.sleep(10)
-                
-                results.append(last_result)
-            else:
-                # Platform not yet implemented
-                results.append(UploadResult(
+                        heapq.heappush(retries, (time.monotonic() + delay, seq, index, upload))
+                        seq += 1
+
+        return results
+
+    def _upload_to_platform(self, platform: Platform, video_path: str, upload_metadata: dict) -> UploadResult:
+        """
+        Upload to a single platform, including rate limiting and retries.
+        Blocks the calling thread during backoff; use _run_platforms for several platforms.
+        """
+        publish = _Publish(video_path, upload_metadata)
+        upload = None
+        while True:
+            upload, result = self._attempt_platform(platform, upload, publish)
+            if upload is None:
+                return result
+            delay = self._retry_delay(upload, result)
+            if delay is None:
+                return self._finish_platform(upload, result)
+            publish.cancel_token.wait(delay)
+
+    def _start_platform(self, platform: Platform, publish: _Publish,
+                        token: CancellationToken) -> Union[UploadResult, _PlatformUpload]:
+        """
+        Pick the account and reserve its rate limit slot.
+
+        Returns:
+            A _PlatformUpload ready for its first attempt, or the UploadResult if the
+            platform cannot be uploaded to at all.
+        """
+        print(f"Processing {platform.value}...")
+
+        if self.emergency_stop.is_triggered():
+            print(f"🚨 EMERGENCY STOP TRIGGERED! Skipping {platform.value}.")
+            return UploadResult(platform=platform, success=False, error="Emergency Stop Triggered")
+
+        if platform not in self.uploaders:
+            # Platform not yet implemented
+            return UploadResult(
+                platform=platform,
+                success=False,
+                error=f"Platform {platform.value} not yet implemented"
+            )
+
+        # Account Selection - pinned in metadata, or the one with the most budget left
+        pinned = pinned_account(publish.metadata, platform)
+        if pinned and self.accounts.get(platform, pinned) is None:
+            return UploadResult(
+                platform=platform,
+                success=False,
+                error=f"Unknown {platform.value} account: {pinned}",
+                account=pinned
+            )
+
+        if platform in publish.rejections:
+            return UploadResult(platform=platform, success=False, error=publish.rejections[platform])
+
+        # Ledger Check - the same video and metadata was already published here
+        if publish.content_hash and not publish.force:
+            entry = self.ledger.find(publish.content_hash, publish.metadata_hash, platform, pinned)
+            if entry:
+                print(f"⏭️  Already published to {platform.value} (account: {entry['account']}). Skipping.")
+                return UploadResult(
+                    platform=platform,
+                    success=True,
+                    url=entry['url'],
+                    account=entry['account'],
+                    already_published=True
+                )
+
+        candidates = [pinned] if pinned else [a.name for a in self.accounts.accounts_for(platform)]
+
+        # Circuit Breaker - skip accounts whose platform is currently failing
+        available = [name for name in candidates if self.circuit_breakers.get(platform, name).available()]
+        if not available:
+            return self._circuit_open_result(platform, candidates[0] if pinned else None, candidates)
+        candidates = available
+
+        # Rate Limit Check - reserve a slot atomically so parallel workers cannot overshoot
+        dry_run = _is_dry_run()
+        reserved_day = None
+        if dry_run:
+            account = self.rate_limiter.best_account(platform, candidates) or candidates[0]
+        else:
+            reserved_day = self.rate_limiter.today()
+            account = self.rate_limiter.reserve_best(platform, candidates, day=reserved_day)
+            if account is None:
+                print(f"❌ Rate limit exceeded for {platform.value}. Skipping.")
+                return UploadResult(
                     platform=platform,
                     success=False,
-                    error=f"Platform {platform.value} not yet implemented"
-                ))
-            
-        return results
+                    error="Daily rate limit exceeded",
+                    account=pinned
+                )
+
+        upload = _PlatformUpload(publish, platform, account, reserved_day, cancel_token=token)
+        try:
+            upload.uploader = self.get_uploader(platform, account)
+        except Exception as e:
+            return self._finish_platform(upload, UploadResult(
+                platform=platform, success=False, error=f"{type(e).__name__}: {e}"))
+        return upload
+
+    def _attempt_platform(self, platform: Platform, upload: Optional[_PlatformUpload], publish: _Publish,
+                          token: Optional[CancellationToken] = None
+                          ) -> Tuple[Optional[_PlatformUpload], UploadResult]:
+        """
+        Run one upload attempt, starting the platform upload first if `upload` is None.
+
+        Args:
+            token: Cancellation token of this platform's upload (the publish's token by default).
+
+        Returns:
+            Tuple (upload, result). upload is None when the platform was rejected before any attempt,
+            in which case result is final.
+        """
+        token = upload.cancel_token if upload is not None else (token or publish.cancel_token)
+        if token.cancelled:
+            result = self._cancelled_result(platform, token)
+            if upload is not None:
+                upload.failure = result.error
+            return upload, result
+
+        if upload is None:
+            started = self._start_platform(platform, publish, token)
+            if isinstance(started, UploadResult):
+                return None, started
+            upload = started
+            print(f"Uploading to {platform.value} (account: {upload.account})...")
+        else:
+            if self.emergency_stop.is_triggered():
+                print(f"🚨 EMERGENCY STOP TRIGGERED! Abandoning {platform.value} retries.")
+                upload.failure = "Emergency Stop Triggered"
+                return upload, UploadResult(platform=platform, success=False, error="Emergency Stop Triggered")
+            print(f"\n🔄 Retrying {platform.value} upload (Attempt {upload.attempt + 1})...")
+
+        breaker = self.circuit_breakers.get(platform, upload.account)
+        if not breaker.allow():
+            result = self._circuit_open_result(platform, upload.account, [upload.account])
+            upload.failure = result.error
+            return upload, result
+
+        upload.attempt += 1
+        try:
+            if upload.video_path is None:
+                upload.video_path = self._rendition_path(platform, publish, token)
+            # The uploader finds the token through the context (BasePlatform.cancel_token)
+            with self._upload_slot(platform, upload.account, token), activate(token):
+                result = upload.uploader.upload(upload.video_path, publish.metadata)
+            upload.failure = result.error
+        except UploadCancelled:
+            result = self._cancelled_result(platform, token)
+        except Exception as e:
+            upload.failure = e
+            result = UploadResult(platform=platform, success=False, error=f"{type(e).__name__}: {e}")
+
+        if not result.success and token.cancelled:
+            # Whatever the aborted flow returned, the upload was cancelled
+            result = self._cancelled_result(platform, token)
+            upload.failure = result.error
+            breaker.record_ignored()
+        elif result.success:
+            breaker.record_success()
+        elif self.retry_policies.get(platform, NO_RETRY).classifier(upload.failure) == ErrorClass.PERMANENT:
+            # Bad input or our own limits say nothing about the platform's health
+            breaker.record_ignored()
+        else:
+            breaker.record_failure(result.error)
+        return upload, result
+
+    @contextlib.contextmanager
+    def _upload_slot(self, platform: Platform, account: str, token: CancellationToken):
+        """
+        Hold one of the plugin's max_concurrency upload slots for an account,
+        shared by every publish running in this process.
+        Waiting for a slot ends with UploadCancelled if the upload is cancelled.
+        """
+        plugin = plugins.get(platform)
+        if plugin is None or plugin.max_concurrency is None:
+            yield
+            return
+        # Aliases count against the platform whose uploader they share
+        key = (Platform(plugin.alias_of or plugin.name), account)
+        with self._uploaders_lock:
+            if key not in self._upload_slots:
+                self._upload_slots[key] = threading.BoundedSemaphore(plugin.max_concurrency)
+            slot = self._upload_slots[key]
+        while not slot.acquire(timeout=_WATCH_INTERVAL):
+            token.raise_if_cancelled()
+        try:
+            yield
+        finally:
+            slot.release()
+
+    @staticmethod
+    def _cancelled_result(platform: Platform, token: CancellationToken) -> UploadResult:
+        """Result of a platform upload stopped by its cancellation token."""
+        print(f"⏹️  {platform.value} upload cancelled ({token.reason})")
+        return UploadResult(platform=platform, success=False, error=token.reason or "Cancelled")
+
+    def _circuit_open_result(self, platform: Platform, account: Optional[str], accounts: List[str]) -> UploadResult:
+        """Fail fast while the circuit of every candidate account is open."""
+        retry_in = min(self.circuit_breakers.get(platform, name).retry_in() for name in accounts)
+        print(f"⛔ Circuit open for {platform.value}. Skipping (next probe in {retry_in:.0f}s).")
+        return UploadResult(
+            platform=platform,
+            success=False,
+            error=f"Circuit open for {platform.value}: too many recent failures, next attempt in {retry_in:.0f}s",
+            account=account
+        )
+
+    def _retry_delay(self, upload: _PlatformUpload, result: UploadResult) -> Optional[float]:
+        """Seconds to wait before retrying a failed attempt, or None if the result is final."""
+        if result.success or upload.cancel_token.cancelled:
+            return None
+        policy = self.retry_policies.get(upload.platform, NO_RETRY)
+        delay = policy.next_delay(upload.failure, upload.attempt)
+        error_class = policy.classifier(upload.failure).value
+        if delay is None:
+            print(f"❌ {upload.platform.value} attempt {upload.attempt} failed ({error_class}): {result.error}")
+        else:
+            print(f"⚠️  {upload.platform.value} attempt {upload.attempt} failed ({error_class}): {result.error}. "
+                  f"Retrying in {delay:.0f}s...")
+        return delay
+
+    def _finish_platform(self, upload: _PlatformUpload, result: UploadResult) -> UploadResult:
+        """Settle the rate limit reservation, record the publication and tag the final result with its account."""
+        if result.success:
+            remaining = self.rate_limiter.get_remaining(upload.platform, upload.account)
+            print(f"✅ Upload successful! ({remaining} uploads remaining today)")
+            publish = upload.publish
+            if publish.content_hash and not _is_dry_run():
+                self.ledger.record(publish.content_hash, publish.metadata_hash, upload.platform,
+                                   upload.account, url=result.url, video_path=publish.video_path)
+                if publish.fingerprint is not None:
+                    self.fingerprints.add(publish.content_hash, publish.fingerprint,
+                                          label=os.path.basename(publish.video_path))
+        elif upload.reserved_day is not None:
+            # Give back the reserved slot if nothing was published, on the day it was taken
+            self.rate_limiter.release(upload.platform, upload.account, day=upload.reserved_day)
+        result.account = upload.account
+        return result
+
+    def get_uploader(self, platform: Platform, account: str = DEFAULT_ACCOUNT) -> Optional[BasePlatform]:
+        """
+        Get the uploader for a platform account.
+        Uploaders for non-default accounts are created on first use with the account's session files.
+        """
+        if account == DEFAULT_ACCOUNT:
+            return self.uploaders.get(platform)
+
+        account_config = self.accounts.get(platform, account)
+        plugin = plugins.get(platform)
+        if account_config is None or plugin is None:
+            return None
+        if plugin.alias_of:
+            # Accounts borrowed from the aliased platform (Shorts from YouTube) share its client
+            target_account = self.accounts.get(Platform(plugin.alias_of), account)
+            if target_account is not None and target_account.config == account_config.config:
+                platform = Platform(plugin.alias_of)
+                plugin = plugins.get(platform)
+
+        key = (platform, account)
+        with self._uploaders_lock:
+            if key not in self._account_uploaders:
+                config = {**self._uploader_config(plugin), **account_config.config}
+                self._account_uploaders[key] = _uploader_class(platform)(config)
+            return self._account_uploaders[key]
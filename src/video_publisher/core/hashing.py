@@ -0,0 +1,74 @@
+"""
+Content hashes identifying what has been published.
+"""
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+# Metadata keys that don't change what ends up published
+_IGNORED_METADATA_KEYS = {'account', 'scheduling'}
+
+_CHUNK_SIZE = 1024 * 1024
+_CACHE_SIZE = 256
+
+# (path, size, mtime_ns) -> digest, so batches and retries don't re-read large files
+_content_hash_cache: "OrderedDict[Tuple[str, int, int], str]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+def file_content_hash(path: str) -> str:
+    """
+    SHA-256 of a file's bytes, read in chunks.
+    Results are cached per (path, size, mtime) until the file changes.
+    """
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    with _cache_lock:
+        if key in _content_hash_cache:
+            _content_hash_cache.move_to_end(key)
+            return _content_hash_cache[key]
+
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    content_hash = digest.hexdigest()
+    _remember(key, content_hash)
+    return content_hash
+
+def remember_content_hash(path: str, content_hash: str):
+    """
+    Record the hash of a file computed elsewhere (e.g. while it was being written),
+    so file_content_hash() doesn't read it again until the file changes.
+    """
+    stat = os.stat(path)
+    _remember((os.path.abspath(path), stat.st_size, stat.st_mtime_ns), content_hash)
+
+def _remember(key: Tuple[str, int, int], content_hash: str):
+    with _cache_lock:
+        _content_hash_cache[key] = content_hash
+        _content_hash_cache.move_to_end(key)
+        while len(_content_hash_cache) > _CACHE_SIZE:
+            _content_hash_cache.popitem(last=False)
+
+def _normalize(value: Any, key: Optional[str] = None) -> Any:
+    """Normalize metadata so cosmetic differences hash the same."""
+    if isinstance(value, str):
+        return " ".join(value.split())
+    if isinstance(value, dict):
+        return {k: _normalize(v, k) for k, v in sorted(value.items()) if v not in (None, "", [], {})}
+    if isinstance(value, (list, tuple)):
+        items = [_normalize(v) for v in value]
+        if key == 'tags':
+            # Tag order, case and leading '#' don't matter
+            return sorted({str(t).lstrip('#').lower() for t in items if t})
+        return items
+    return value
+
+def metadata_hash(metadata: Optional[Dict[str, Any]]) -> str:
+    """SHA-256 of upload metadata, normalized and without keys that don't affect the published post."""
+    relevant = {k: v for k, v in (metadata or {}).items() if k not in _IGNORED_METADATA_KEYS}
+    canonical = json.dumps(_normalize(relevant), sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
@@ -0,0 +1,200 @@
+"""
+Single-pass ingest of uploaded videos.
+
+Saving an upload and then hashing and analyzing it reads a multi-GB file two
+or three more times. IngestFile is written to as the request body arrives:
+bytes go to disk, into a SHA-256 and, for the first and last MB, into memory
+for the container probe. Once written, the file is moved into place with its
+hash and analysis ready, and nothing reads it back.
+"""
+import os
+import hashlib
+import tempfile
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+from .hashing import remember_content_hash
+from .models import VideoMetadata
+from .probe import ProbeError, probe, probe_file
+
+# Bytes kept from each end of the file: MP4 headers come first (fast start) or
+# last (camera recordings), Matroska headers first
+_END_SIZE = 1024 * 1024
+
+
+@dataclass
+class IngestResult:
+    """A file ingested by IngestFile."""
+
+    path: str
+    size: int
+    content_hash: str
+    video_metadata: Optional[VideoMetadata] = None  # None if the container couldn't be probed
+
+
+class IngestFile:
+    """
+    Writable (and readable) file for an incoming upload, hashing and buffering
+    the ends of what is written. Meant as a Werkzeug stream factory result, so
+    multipart file parts are written straight here.
+
+    The data lands in a temporary file in `directory`; finish() moves it to its
+    final name, close() without finish() deletes it.
+    """
+
+    def __init__(self, directory: str = "uploads"):
+        Path(directory).mkdir(parents=True, exist_ok=True)
+        self._file = tempfile.NamedTemporaryFile(dir=directory, prefix=".ingest-", suffix=".part", delete=False)
+        self.name = self._file.name
+        self._digest = hashlib.sha256()
+        self._head = bytearray()
+        self._tail = deque()
+        self._tail_size = 0
+        self._size = 0
+        self._finished = False
+
+    # --- file interface ---
+
+    def write(self, data: bytes) -> int:
+        self._file.write(data)
+        self._digest.update(data)
+        self._size += len(data)
+        if len(self._head) < _END_SIZE:
+            self._head += data[:_END_SIZE - len(self._head)]
+        self._tail.append(bytes(data))
+        self._tail_size += len(data)
+        while self._tail_size - len(self._tail[0]) >= _END_SIZE:
+            self._tail_size -= len(self._tail.popleft())
+        return len(data)
+
+    def read(self, size: int = -1) -> bytes:
+        return self._file.read(size)
+
+    def readline(self, size: int = -1) -> bytes:
+        return self._file.readline(size)
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        return self._file.seek(offset, whence)
+
+    def tell(self) -> int:
+        return self._file.tell()
+
+    def flush(self):
+        self._file.flush()
+
+    def readable(self) -> bool:
+        return True
+
+    def writable(self) -> bool:
+        return not self._finished
+
+    def seekable(self) -> bool:
+        return True
+
+    @property
+    def closed(self) -> bool:
+        return self._file.closed
+
+    def close(self):
+        self._file.close()
+        if not self._finished and os.path.exists(self.name):
+            os.unlink(self.name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # --- ingest ---
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def finish(self, destination: str) -> IngestResult:
+        """
+        Move the written file to `destination` and return its hash and analysis.
+        The container is probed from the buffered ends, or from its headers on disk
+        if they are elsewhere (a large moov box, or media data after the end MB).
+        """
+        self._file.close()
+        os.replace(self.name, destination)
+        self._finished = True
+        content_hash = self._digest.hexdigest()
+        # The engine's ledger step hashes the file again otherwise
+        remember_content_hash(destination, content_hash)
+
+        tail = b''.join(self._tail)
+        try:
+            info = probe_file(_BufferedEnds(bytes(self._head), tail[-_END_SIZE:], self._size), self._size)
+        except ProbeError:
+            try:
+                info = probe(destination)
+            except ProbeError:
+                info = None
+        video_metadata = None
+        if info is not None:
+            from .video_analyzer import VideoAnalyzer
+            video_metadata = VideoAnalyzer._from_probe(destination, info)
+        return IngestResult(path=destination, size=self._size, content_hash=content_hash,
+                            video_metadata=video_metadata)
+
+
+def ingest(stream: BinaryIO, destination: str, chunk_size: int = 1024 * 1024) -> IngestResult:
+    """Copy a stream to `destination` through an IngestFile."""
+    with IngestFile(os.path.dirname(destination) or ".") as target:
+        for chunk in iter(lambda: stream.read(chunk_size), b''):
+            target.write(chunk)
+        return target.finish(destination)
+
+
+def save_upload(upload, destination: str) -> IngestResult:
+    """
+    Save an uploaded file (a Werkzeug FileStorage) to `destination`.
+
+    A file already streamed into an IngestFile (see IngestRequest in app.py) is
+    only moved; any other upload is copied in one pass, hashed and probed on the way.
+    """
+    stream = getattr(upload, 'stream', upload)
+    if isinstance(stream, IngestFile):
+        return stream.finish(destination)
+    return ingest(stream, destination)
+
+
+class _BufferedEnds:
+    """Read-only view of a file of which only the first and last bytes are in memory."""
+
+    def __init__(self, head: bytes, tail: bytes, size: int):
+        self._head = head
+        self._tail = tail
+        self._tail_start = size - len(tail)
+        self._size = size
+        self._position = 0
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        if whence == os.SEEK_CUR:
+            offset += self._position
+        elif whence == os.SEEK_END:
+            offset += self._size
+        self._position = max(0, offset)
+        return self._position
+
+    def tell(self) -> int:
+        return self._position
+
+    def read(self, size: int = -1) -> bytes:
+        start = self._position
+        end = self._size if size < 0 else min(self._size, start + size)
+        if end <= len(self._head):
+            data = self._head[start:end]
+        elif start >= self._tail_start:
+            data = self._tail[start - self._tail_start:end - self._tail_start]
+        elif start >= self._size:
+            data = b''
+        else:
+            raise ProbeError(f"Bytes {start}-{end} of the upload are not buffered")
+        self._position += len(data)
+        return data
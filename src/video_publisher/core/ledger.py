@@ -0,0 +1,94 @@
+"""
+Ledger of completed publications, used to make re-uploads idempotent.
+"""
+import time
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+from .models import Platform
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS publications (
+    id INTEGER PRIMARY KEY,
+    content_hash TEXT NOT NULL,
+    metadata_hash TEXT NOT NULL,
+    platform TEXT NOT NULL,
+    account TEXT NOT NULL,
+    url TEXT,
+    video_path TEXT,
+    published_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_publications_key
+    ON publications (content_hash, metadata_hash, platform, account);
+"""
+
+
+class PublicationLedger:
+    """
+    Records every successful upload keyed by (video content hash, metadata hash,
+    platform, account), so the same video with the same metadata is not published twice.
+    """
+
+    def __init__(self, db_path: str = "data/ledger/publications.db"):
+        self.db_path = Path(db_path)
+        if not self.db_path.parent.exists():
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._connect().executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Get the calling thread's connection, opening it if needed."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def find(self, content_hash: str, metadata_hash: str, platform: Platform,
+             account: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Look up an earlier publication.
+
+        Args:
+            account: Restrict to one account. None matches any account of the platform.
+
+        Returns:
+            The ledger entry, or None if this content was never published there.
+        """
+        query = "SELECT * FROM publications WHERE content_hash = ? AND metadata_hash = ? AND platform = ?"
+        params = [content_hash, metadata_hash, platform.value]
+        if account is not None:
+            query += " AND account = ?"
+            params.append(account)
+        row = self._connect().execute(query + " ORDER BY published_at LIMIT 1", params).fetchone()
+        return dict(row) if row else None
+
+    def record(self, content_hash: str, metadata_hash: str, platform: Platform, account: str,
+               url: Optional[str] = None, video_path: Optional[str] = None):
+        """Record a successful publication (a forced re-upload updates the existing entry)."""
+        now = time.time()
+        self._connect().execute(
+            "INSERT INTO publications (content_hash, metadata_hash, platform, account, url, video_path, "
+            "published_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (content_hash, metadata_hash, platform, account) "
+            "DO UPDATE SET url = excluded.url, video_path = excluded.video_path, updated_at = excluded.updated_at",
+            (content_hash, metadata_hash, platform.value, account, url, video_path, now, now)
+        )
+
+    def forget(self, content_hash: str, platform: Optional[Platform] = None) -> int:
+        """Remove entries for a video (e.g. after deleting the post), allowing it to be published again."""
+        query = "DELETE FROM publications WHERE content_hash = ?"
+        params = [content_hash]
+        if platform is not None:
+            query += " AND platform = ?"
+            params.append(platform.value)
+        return self._connect().execute(query, params).rowcount
+
+    def count(self) -> int:
+        """Number of recorded publications."""
+        return self._connect().execute("SELECT COUNT(*) FROM publications").fetchone()[0]
@@ -3,17 +3,39 @@ from typing import Optional
 from pydantic import BaseModel
 
 class Platform(str, Enum):
+    """
+    Upload targets. Besides the built-in members, the name of any platform
+    registered as a plugin is a valid value: Platform("vimeo") returns a member
+    for it once a plugin named "vimeo" is installed.
+    """
     YOUTUBE = "youtube"
     YOUTUBE_SHORTS = "youtube_shorts"
     TIKTOK = "tiktok"
     INSTAGRAM = "instagram"
 
+    @classmethod
+    def _missing_(cls, value):
+        from ..platforms.plugins import get_plugin
+        if not isinstance(value, str) or get_plugin(value) is None:
+            return None
+        member = str.__new__(cls, value)
+        member._name_ = value.upper()
+        member._value_ = value
+        # Registered like a regular member so later lookups return the same object
+        return cls._value2member_map_.setdefault(value, member)
+
 class VideoMetadata(BaseModel):
     path: str
     duration: float
-    width: int
+    width: int                      # Display size, i.e. with rotation applied
     height: int
     aspect_ratio: float
+    rotation: int = 0               # Clockwise rotation stored in the container
+    codec: Optional[str] = None     # "h264", "hevc", "vp9", ...
+    fps: Optional[float] = None
+    bitrate: Optional[int] = None   # Bits per second
+    size: Optional[int] = None      # File size in bytes
+    container: Optional[str] = None
     
     @property
     def is_vertical(self) -> bool:
@@ -24,3 +46,5 @@ class UploadResult(BaseModel):
     success: bool
     url: Optional[str] = None
     error: Optional[str] = None
+    account: Optional[str] = None
+    already_published: bool = False  # Skipped because the ledger has this exact upload
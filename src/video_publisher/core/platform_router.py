@@ -1,14 +1,19 @@
 from typing import List
 from .models import Platform, VideoMetadata
+from ..platforms.plugins import plugins
 
 class PlatformRouter:
-    def route(self, metadata: VideoMetadata) -> List[Platform]:
+    def route(self, metadata: VideoMetadata, reframe: bool = False) -> List[Platform]:
         """
         Determines the target platforms based on video metadata.
+
+        Vertical videos go to every auto-routed platform accepting vertical videos
+        (TikTok, Instagram and YouTube Shorts by default); horizontal ones to YouTube.
+        With `reframe`, every auto-routed platform is targeted: those taking the other
+        orientation get a cropped derivative of the video.
         """
-        if metadata.is_vertical:
-            # Vertical videos go to TikTok, Instagram, and YouTube Shorts
-            return [Platform.TIKTOK, Platform.INSTAGRAM, Platform.YOUTUBE_SHORTS]
-        else:
-            # Horizontal videos go to YouTube
-            return [Platform.YOUTUBE]
+        orientation = 'vertical' if metadata.is_vertical else 'horizontal'
+        return [
+            Platform(plugin.name) for plugin in plugins.plugins()
+            if plugin.auto_route and (orientation in plugin.orientations or (reframe and plugin.orientations))
+        ]
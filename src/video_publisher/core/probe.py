@@ -0,0 +1,509 @@
+"""
+Header-only video probing.
+
+Reads duration, dimensions, rotation, codec and frame rate straight from the
+container headers: the `moov` box of MP4/MOV files and the Info/Tracks elements
+of Matroska/WebM files. Only a few KB are read; large boxes (`mdat`, clusters)
+are skipped with seeks, so probing a multi-GB file costs the same as a small one.
+
+Containers the parsers don't understand raise ProbeError; callers then fall back
+to ffprobe() or a full decoder.
+"""
+import io
+import json
+import math
+import os
+import shutil
+import struct
+import subprocess
+from dataclasses import dataclass
+from typing import BinaryIO, Dict, Iterator, Optional, Tuple
+
+
+class ProbeError(Exception):
+    """The file could not be probed from its headers."""
+
+
+@dataclass
+class ProbeResult:
+    """Stream properties of the first video track."""
+
+    duration: float                  # Seconds
+    width: int                       # Coded size, before rotation
+    height: int
+    rotation: int = 0                # Clockwise degrees to apply for display: 0, 90, 180 or 270
+    codec: Optional[str] = None      # ffprobe-style codec name ("h264", "hevc", "vp9", ...)
+    fps: Optional[float] = None
+    bitrate: Optional[int] = None    # Overall bits per second
+    size: Optional[int] = None       # File size in bytes
+    container: Optional[str] = None  # "mp4", "mov", "matroska", "webm" or the ffprobe format name
+
+    @property
+    def display_size(self) -> Tuple[int, int]:
+        """(width, height) as the video is shown, i.e. after rotation."""
+        if self.rotation in (90, 270):
+            return self.height, self.width
+        return self.width, self.height
+
+
+def probe(path: str) -> ProbeResult:
+    """
+    Probe a video file from its container headers.
+
+    Raises:
+        ProbeError: Unknown container or missing/invalid headers.
+    """
+    try:
+        size = os.path.getsize(path)
+        with open(path, 'rb') as f:
+            return probe_file(f, size)
+    except OSError as e:
+        raise ProbeError(str(e)) from e
+
+
+def probe_file(f: BinaryIO, size: int) -> ProbeResult:
+    """Probe a seekable binary file of `size` bytes."""
+    head = f.read(12)
+    f.seek(0)
+    if len(head) >= 4 and head[:4] == b'\x1a\x45\xdf\xa3':
+        result = _probe_matroska(f, size)
+    elif len(head) >= 8 and head[4:8] in _MP4_TOP_LEVEL:
+        result = _probe_mp4(f, size)
+    else:
+        raise ProbeError("Unknown container")
+
+    if result.duration <= 0 or result.width <= 0 or result.height <= 0:
+        raise ProbeError("Container headers have no duration or video size")
+    result.size = size
+    result.bitrate = int(size * 8 / result.duration)
+    return result
+
+
+# --- MP4 / MOV (ISO base media file format) ---
+
+_MP4_TOP_LEVEL = {b'ftyp', b'moov', b'mdat', b'free', b'skip', b'wide', b'pnot', b'uuid'}
+
+# Boxes on the path to the ones we read; every other box is skipped
+_MP4_CONTAINERS = {b'moov', b'trak', b'mdia', b'minf', b'stbl'}
+
+_MP4_CODECS = {
+    'avc1': 'h264', 'avc3': 'h264',
+    'hvc1': 'hevc', 'hev1': 'hevc',
+    'vp08': 'vp8', 'vp09': 'vp9',
+    'av01': 'av1',
+    'mp4v': 'mpeg4',
+    'apch': 'prores', 'apcn': 'prores', 'apcs': 'prores', 'apco': 'prores', 'ap4h': 'prores',
+}
+
+# Largest box read into memory; the ones we parse are a few hundred bytes at most
+_MP4_MAX_BOX = 64 * 1024
+
+
+def _mp4_boxes(f: BinaryIO, start: int, end: int) -> Iterator[Tuple[bytes, int, int]]:
+    """Yield (type, payload start, payload end) of the boxes between two offsets."""
+    offset = start
+    while offset + 8 <= end:
+        f.seek(offset)
+        header = f.read(8)
+        if len(header) < 8:
+            return
+        box_size, box_type = struct.unpack('>I4s', header)
+        header_size = 8
+        if box_size == 1:
+            large = f.read(8)
+            if len(large) < 8:
+                return
+            box_size = struct.unpack('>Q', large)[0]
+            header_size = 16
+        elif box_size == 0:
+            box_size = end - offset
+        if box_size < header_size:
+            raise ProbeError(f"Invalid MP4 box size at offset {offset}")
+        yield box_type, offset + header_size, min(offset + box_size, end)
+        offset += box_size
+
+
+def _read_box(f: BinaryIO, start: int, end: int) -> bytes:
+    f.seek(start)
+    return f.read(min(end - start, _MP4_MAX_BOX))
+
+
+def _probe_mp4(f: BinaryIO, size: int) -> ProbeResult:
+    f.seek(4)
+    container = 'mov' if f.read(4) != b'ftyp' else 'mp4'
+    for box_type, start, end in _mp4_boxes(f, 0, size):
+        if box_type == b'ftyp' and _read_box(f, start, start + 4) == b'qt  ':
+            container = 'mov'
+        elif box_type == b'moov':
+            result = _parse_moov(f, start, end)
+            result.container = container
+            return result
+    raise ProbeError("No moov box found")
+
+
+def _parse_moov(f: BinaryIO, start: int, end: int) -> ProbeResult:
+    timescale, duration = 0, 0
+    fragment_duration = 0
+    video = None
+    for box_type, box_start, box_end in _mp4_boxes(f, start, end):
+        if box_type == b'mvhd':
+            timescale, duration = _parse_mvhd(_read_box(f, box_start, box_end))
+        elif box_type == b'mvex':
+            # Fragmented file: mvhd has no duration, mehd (if present) has the total
+            for child, child_start, child_end in _mp4_boxes(f, box_start, box_end):
+                if child == b'mehd':
+                    data = _read_box(f, child_start, child_end)
+                    fragment_duration = struct.unpack_from('>Q' if data[0] == 1 else '>I', data, 4)[0]
+        elif box_type == b'trak' and video is None:
+            video = _parse_trak(f, box_start, box_end)
+
+    if video is None:
+        raise ProbeError("No video track found")
+    if timescale and not video.duration:
+        video.duration = (duration or fragment_duration) / timescale
+    return video
+
+
+def _parse_mvhd(data: bytes) -> Tuple[int, int]:
+    """(timescale, duration) of the movie header."""
+    if data[0] == 1:
+        return struct.unpack_from('>IQ', data, 20)
+    return struct.unpack_from('>II', data, 12)
+
+
+def _parse_trak(f: BinaryIO, start: int, end: int) -> Optional[ProbeResult]:
+    """Video properties of a track, None for audio and other tracks."""
+    found: Dict[bytes, bytes] = {}
+    _collect_mp4_boxes(f, start, end, found)
+    handler = found.get(b'hdlr')
+    if handler is None or handler[8:12] != b'vide' or b'tkhd' not in found:
+        return None
+
+    width, height, rotation = _parse_tkhd(found[b'tkhd'])
+    result = ProbeResult(duration=0.0, width=width, height=height, rotation=rotation)
+
+    mdhd = found.get(b'mdhd')
+    if mdhd:
+        if mdhd[0] == 1:
+            timescale, duration = struct.unpack_from('>IQ', mdhd, 20)
+        else:
+            timescale, duration = struct.unpack_from('>II', mdhd, 12)
+        if timescale and duration:
+            result.duration = duration / timescale
+            stsz = found.get(b'stsz')
+            if stsz:
+                # Sample count of a video track is its frame count
+                frames = struct.unpack_from('>I', stsz, 8)[0]
+                if frames:
+                    result.fps = round(frames / result.duration, 3)
+
+    stsd = found.get(b'stsd')
+    if stsd and len(stsd) >= 16:
+        fourcc = stsd[12:16].decode('latin-1')
+        result.codec = _MP4_CODECS.get(fourcc, fourcc.strip().lower())
+        if not width or not height:
+            # Some muxers leave tkhd empty; the sample entry has the coded size
+            result.width, result.height = struct.unpack_from('>HH', stsd, 8 + 8 + 24)
+    return result
+
+
+def _collect_mp4_boxes(f: BinaryIO, start: int, end: int, found: Dict[bytes, bytes]):
+    """Read the track boxes we parse, descending into the containers that hold them."""
+    for box_type, box_start, box_end in _mp4_boxes(f, start, end):
+        if box_type in _MP4_CONTAINERS:
+            _collect_mp4_boxes(f, box_start, box_end, found)
+        elif box_type in (b'tkhd', b'hdlr', b'mdhd', b'stsd', b'stsz') and box_type not in found:
+            # stsz is only read up to its sample count, never its (huge) size table
+            found[box_type] = _read_box(f, box_start, min(box_end, box_start + 256))
+
+
+def _parse_tkhd(data: bytes) -> Tuple[int, int, int]:
+    """(width, height, rotation) of a track header."""
+    offset = 4 + (32 if data[0] == 1 else 20) + 16
+    a, b, _, c, d = struct.unpack_from('>iiiii', data, offset)
+    width, height = struct.unpack_from('>II', data, offset + 36)
+    return width >> 16, height >> 16, _rotation(math.degrees(math.atan2(b, a)))
+
+
+def _rotation(degrees: float) -> int:
+    """Snap an angle to 0, 90, 180 or 270 clockwise degrees."""
+    return int(round(degrees / 90.0)) % 4 * 90
+
+
+# --- Matroska / WebM (EBML) ---
+
+_EBML_DOC_TYPE = 0x4282
+_MKV_SEGMENT = 0x18538067
+_MKV_SEEK_HEAD = 0x114D9B74
+_MKV_SEEK = 0x4DBB
+_MKV_SEEK_ID = 0x53AB
+_MKV_SEEK_POSITION = 0x53AC
+_MKV_INFO = 0x1549A966
+_MKV_TIMECODE_SCALE = 0x2AD7B1
+_MKV_DURATION = 0x4489
+_MKV_TRACKS = 0x1654AE6B
+_MKV_TRACK_ENTRY = 0xAE
+_MKV_TRACK_TYPE = 0x83
+_MKV_CODEC_ID = 0x86
+_MKV_DEFAULT_DURATION = 0x23E383
+_MKV_VIDEO = 0xE0
+_MKV_PIXEL_WIDTH = 0xB0
+_MKV_PIXEL_HEIGHT = 0xBA
+_MKV_PROJECTION = 0x7670
+_MKV_PROJECTION_ROLL = 0x7675
+_MKV_CLUSTER = 0x1F43B675
+
+_MKV_CODECS = {
+    'V_MPEG4/ISO/AVC': 'h264',
+    'V_MPEGH/ISO/HEVC': 'hevc',
+    'V_VP8': 'vp8',
+    'V_VP9': 'vp9',
+    'V_AV1': 'av1',
+    'V_MPEG4/ISO/SP': 'mpeg4',
+    'V_MPEG4/ISO/ASP': 'mpeg4',
+    'V_PRORES': 'prores',
+}
+
+_UNKNOWN_SIZE = -1
+_MKV_MAX_ELEMENT = 1024 * 1024  # Info and Tracks are a few hundred bytes
+
+
+def _read_vint(f: BinaryIO, keep_marker: bool) -> Tuple[int, int]:
+    """Read an EBML variable-length integer. Returns (value, length); an all-ones size is _UNKNOWN_SIZE."""
+    first = f.read(1)
+    if not first:
+        raise EOFError
+    byte = first[0]
+    length = 1
+    mask = 0x80
+    while length <= 8 and not byte & mask:
+        mask >>= 1
+        length += 1
+    if length > 8:
+        raise ProbeError("Invalid EBML variable-length integer")
+    value = byte if keep_marker else byte & (mask - 1)
+    rest = f.read(length - 1)
+    if len(rest) < length - 1:
+        raise EOFError
+    for b in rest:
+        value = (value << 8) | b
+    if not keep_marker and value == (1 << (7 * length)) - 1:
+        return _UNKNOWN_SIZE, length
+    return value, length
+
+
+def _ebml_elements(f: BinaryIO, start: int, end: int) -> Iterator[Tuple[int, int, int]]:
+    """Yield (id, data start, data size) of the elements between two offsets; size may be _UNKNOWN_SIZE."""
+    offset = start
+    while offset < end:
+        f.seek(offset)
+        try:
+            element_id, id_length = _read_vint(f, keep_marker=True)
+            size, size_length = _read_vint(f, keep_marker=False)
+        except EOFError:
+            return
+        data_start = offset + id_length + size_length
+        yield element_id, data_start, size
+        if size == _UNKNOWN_SIZE:
+            return
+        offset = data_start + size
+
+
+def _read_element(f: BinaryIO, start: int, size: int) -> bytes:
+    if size == _UNKNOWN_SIZE or size > _MKV_MAX_ELEMENT:
+        raise ProbeError("Matroska header element too large")
+    f.seek(start)
+    return f.read(size)
+
+
+def _ebml_children(data: bytes) -> Iterator[Tuple[int, bytes]]:
+    """Yield (id, data) of the elements of an in-memory master element."""
+    f = io.BytesIO(data)
+    for element_id, start, size in _ebml_elements(f, 0, len(data)):
+        if size == _UNKNOWN_SIZE:
+            return
+        yield element_id, data[start:start + size]
+
+
+def _uint(data: bytes) -> int:
+    return int.from_bytes(data, 'big') if data else 0
+
+
+def _float(data: bytes) -> float:
+    if len(data) == 4:
+        return struct.unpack('>f', data)[0]
+    if len(data) == 8:
+        return struct.unpack('>d', data)[0]
+    return 0.0
+
+
+def _probe_matroska(f: BinaryIO, size: int) -> ProbeResult:
+    elements = _ebml_elements(f, 0, size)
+    element_id, start, header_size = next(elements, (None, 0, 0))
+    if element_id != 0x1A45DFA3:
+        raise ProbeError("Missing EBML header")
+    doc_type = 'matroska'
+    for child_id, data in _ebml_children(_read_element(f, start, header_size)):
+        if child_id == _EBML_DOC_TYPE:
+            doc_type = data.rstrip(b'\x00').decode('ascii', 'replace')
+
+    for element_id, start, segment_size in elements:
+        if element_id == _MKV_SEGMENT:
+            end = size if segment_size == _UNKNOWN_SIZE else min(size, start + segment_size)
+            result = _parse_segment(f, start, end)
+            result.container = doc_type
+            return result
+    raise ProbeError("No Matroska segment found")
+
+
+def _parse_segment(f: BinaryIO, start: int, end: int) -> ProbeResult:
+    info: Optional[bytes] = None
+    tracks: Optional[bytes] = None
+    seek_positions: Dict[int, int] = {}
+
+    for element_id, data_start, data_size in _ebml_elements(f, start, end):
+        if element_id == _MKV_SEEK_HEAD:
+            seek_positions.update(_parse_seek_head(_read_element(f, data_start, data_size)))
+        elif element_id == _MKV_INFO:
+            info = _read_element(f, data_start, data_size)
+        elif element_id == _MKV_TRACKS:
+            tracks = _read_element(f, data_start, data_size)
+        elif element_id == _MKV_CLUSTER:
+            break  # Media data; headers we still miss can only be reached through the SeekHead
+        if info is not None and tracks is not None:
+            break
+
+    # Info or Tracks written after the media data (some muxers), located through the SeekHead
+    for element_id in (_MKV_INFO, _MKV_TRACKS):
+        if (info if element_id == _MKV_INFO else tracks) is None and element_id in seek_positions:
+            for found_id, data_start, data_size in _ebml_elements(f, start + seek_positions[element_id], end):
+                if found_id == element_id:
+                    data = _read_element(f, data_start, data_size)
+                    if element_id == _MKV_INFO:
+                        info = data
+                    else:
+                        tracks = data
+                break
+
+    if info is None or tracks is None:
+        raise ProbeError("Matroska Info or Tracks element not found")
+
+    timecode_scale = 1_000_000
+    duration = 0.0
+    for element_id, data in _ebml_children(info):
+        if element_id == _MKV_TIMECODE_SCALE:
+            timecode_scale = _uint(data) or timecode_scale
+        elif element_id == _MKV_DURATION:
+            duration = _float(data)
+
+    for element_id, data in _ebml_children(tracks):
+        if element_id == _MKV_TRACK_ENTRY:
+            result = _parse_track_entry(data)
+            if result is not None:
+                result.duration = duration * timecode_scale / 1e9
+                return result
+    raise ProbeError("No video track found")
+
+
+def _parse_seek_head(data: bytes) -> Dict[int, int]:
+    """Segment-relative positions of the elements listed in a SeekHead."""
+    positions = {}
+    for element_id, seek in _ebml_children(data):
+        if element_id != _MKV_SEEK:
+            continue
+        target, position = None, None
+        for child_id, value in _ebml_children(seek):
+            if child_id == _MKV_SEEK_ID:
+                target = _uint(value)
+            elif child_id == _MKV_SEEK_POSITION:
+                position = _uint(value)
+        if target is not None and position is not None:
+            positions.setdefault(target, position)
+    return positions
+
+
+def _parse_track_entry(data: bytes) -> Optional[ProbeResult]:
+    """Video properties of a TrackEntry, None for other track types."""
+    track_type, codec_id, frame_duration, video = None, None, None, None
+    for element_id, value in _ebml_children(data):
+        if element_id == _MKV_TRACK_TYPE:
+            track_type = _uint(value)
+        elif element_id == _MKV_CODEC_ID:
+            codec_id = value.rstrip(b'\x00').decode('ascii', 'replace')
+        elif element_id == _MKV_DEFAULT_DURATION:
+            frame_duration = _uint(value)
+        elif element_id == _MKV_VIDEO:
+            video = value
+    if track_type != 1 or video is None:
+        return None
+
+    result = ProbeResult(duration=0.0, width=0, height=0)
+    for element_id, value in _ebml_children(video):
+        if element_id == _MKV_PIXEL_WIDTH:
+            result.width = _uint(value)
+        elif element_id == _MKV_PIXEL_HEIGHT:
+            result.height = _uint(value)
+        elif element_id == _MKV_PROJECTION:
+            for child_id, child in _ebml_children(value):
+                if child_id == _MKV_PROJECTION_ROLL:
+                    # Roll is counter-clockwise
+                    result.rotation = _rotation(-_float(child))
+    if codec_id:
+        result.codec = _MKV_CODECS.get(codec_id, codec_id.lower())
+    if frame_duration:
+        result.fps = round(1e9 / frame_duration, 3)
+    return result
+
+
+# --- ffprobe fallback ---
+
+def ffprobe(path: str, timeout: float = 30.0) -> ProbeResult:
+    """
+    Probe any container ffmpeg understands with the ffprobe binary.
+
+    Raises:
+        ProbeError: ffprobe is not installed or could not read the file.
+    """
+    binary = shutil.which('ffprobe')
+    if binary is None:
+        raise ProbeError("ffprobe not found")
+    command = [
+        binary, '-v', 'error', '-select_streams', 'v:0',
+        '-show_entries', 'stream=codec_name,width,height,avg_frame_rate:stream_tags=rotate:'
+                         'stream_side_data=rotation:format=duration,format_name',
+        '-of', 'json', path
+    ]
+    try:
+        output = subprocess.run(command, capture_output=True, text=True, timeout=timeout, check=True).stdout
+        info = json.loads(output)
+        stream = info['streams'][0]
+        video_format = info.get('format', {})
+        duration = float(video_format['duration'])
+    except (OSError, subprocess.SubprocessError, ValueError, KeyError, IndexError) as e:
+        raise ProbeError(f"ffprobe failed: {e}") from e
+
+    rotation = 0
+    for side_data in stream.get('side_data_list', []):
+        if 'rotation' in side_data:
+            # Display matrix rotation is counter-clockwise
+            rotation = _rotation(-float(side_data['rotation']))
+    if 'rotate' in stream.get('tags', {}):
+        rotation = _rotation(float(stream['tags']['rotate']))
+
+    fps = None
+    numerator, _, denominator = stream.get('avg_frame_rate', '0/0').partition('/')
+    if denominator and float(denominator):
+        fps = round(float(numerator) / float(denominator), 3)
+
+    size = os.path.getsize(path)
+    return ProbeResult(
+        duration=duration,
+        width=int(stream['width']),
+        height=int(stream['height']),
+        rotation=rotation,
+        codec=stream.get('codec_name'),
+        fps=fps,
+        bitrate=int(size * 8 / duration) if duration else None,
+        size=size,
+        container=video_format.get('format_name', '').split(',')[0] or None
+    )
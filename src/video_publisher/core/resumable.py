@@ -0,0 +1,483 @@
+"""
+Resumable uploads (tus-style) for multi-GB ingests.
+
+A single multipart POST of a 4 GB video starts over from zero when the
+connection drops. Here the client creates an upload of a known length, then
+sends chunks at explicit offsets, in any order and several at a time. A chunk
+first claims its byte range, so no other request writes there meanwhile, is
+written in place in a preallocated file and may carry a checksum verified
+before it counts as received. Received ranges and claims live in SQLite, so
+any process serving the API can take the next chunk and a client can ask what
+is still missing after losing its connection.
+
+The SHA-256 of the whole file is advanced from the verified chunk bytes as the
+contiguous prefix grows: chunks that arrive ahead of it are kept in memory
+(within a budget) until it reaches them. Only chunks received by another
+process, or over the budget, are read back from disk when the upload finishes.
+"""
+import os
+import json
+import time
+import uuid
+import base64
+import shutil
+import sqlite3
+import hashlib
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
+
+from .hashing import file_content_hash, remember_content_hash
+from .ingest import IngestResult
+from .probe import ProbeError, probe
+
+GB = 1024 ** 3
+
+_READ_SIZE = 1024 * 1024
+
+# A claim not refreshed for this long belongs to a request that died
+CLAIM_TIMEOUT = 600.0
+# A request writing a chunk refreshes its claim before writing when older than this
+_CLAIM_REFRESH = 30.0
+
+# Algorithms accepted in Upload-Checksum headers
+CHECKSUM_ALGORITHMS = ('sha256', 'sha1', 'md5')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS uploads (
+    id TEXT PRIMARY KEY,
+    length INTEGER NOT NULL,
+    metadata TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    completed_at REAL
+);
+CREATE TABLE IF NOT EXISTS chunks (
+    upload_id TEXT NOT NULL,
+    start_offset INTEGER NOT NULL,
+    end_offset INTEGER NOT NULL,
+    PRIMARY KEY (upload_id, start_offset)
+);
+CREATE TABLE IF NOT EXISTS claims (
+    token TEXT PRIMARY KEY,
+    upload_id TEXT NOT NULL,
+    start_offset INTEGER NOT NULL,
+    end_offset INTEGER NOT NULL,
+    claimed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_claims_upload ON claims (upload_id, start_offset);
+"""
+
+
+class ResumableUploadError(Exception):
+    """A request the upload cannot accept."""
+
+
+class UploadNotFound(ResumableUploadError):
+    """No such upload, or it expired."""
+
+
+class OffsetConflict(ResumableUploadError):
+    """The chunk overlaps data already received, or the upload is complete."""
+
+
+class ChecksumMismatch(ResumableUploadError):
+    """The chunk's bytes don't match the checksum sent with it."""
+
+
+class UploadTooLarge(ResumableUploadError):
+    """The upload or chunk goes past the allowed or declared length."""
+
+
+@dataclass
+class _HashState:
+    """Running SHA-256 of an upload's contiguous prefix, as seen by this process."""
+    position: int = 0
+    digest: Any = field(default_factory=hashlib.sha256)
+    # Verified chunks past the prefix: start offset -> bytes
+    pending: Dict[int, bytes] = field(default_factory=dict)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+class ResumableUploads:
+    """
+    Partial uploads: data files in `directory`, received ranges in SQLite.
+
+    Uploads not touched for `expire_after` seconds are deleted the next time one is created.
+    Completed uploads are kept until then, so a client that lost the response to its last
+    chunk still finds the upload complete instead of gone.
+    """
+
+    def __init__(self, directory: str = "data/uploads/partial", max_size: int = 64 * GB,
+                 expire_after: float = 24 * 3600, hash_buffer: int = 256 * 1024 * 1024):
+        """
+        Args:
+            hash_buffer: Bytes of out-of-order chunks kept in memory, across uploads, for
+                         hashing once the prefix reaches them; the rest is read back on finish.
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.directory / "uploads.db"
+        self.max_size = max_size
+        self.expire_after = expire_after
+        self.hash_buffer = hash_buffer
+        self._local = threading.local()
+        self._connect().executescript(_SCHEMA)
+        # Hash state per upload, each with its own lock; this lock only guards the dict and budget
+        self._hashes: Dict[str, _HashState] = {}
+        self._buffered = 0
+        self._hashes_lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Get the calling thread's connection, opening it if needed."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _data_path(self, upload_id: str) -> Path:
+        return self.directory / f"{upload_id}.part"
+
+    def create(self, length: int, metadata: Optional[Dict[str, str]] = None) -> str:
+        """
+        Start an upload of `length` bytes.
+
+        Returns:
+            The upload id.
+
+        Raises:
+            UploadTooLarge: length is over max_size.
+        """
+        if length < 0 or length > self.max_size:
+            raise UploadTooLarge(f"Upload length must be between 0 and {self.max_size} bytes")
+        self.expire()
+        upload_id = str(uuid.uuid4())
+        with open(self._data_path(upload_id), 'wb') as f:
+            f.truncate(length)  # Sparse: chunks are written in place as they arrive
+        now = time.time()
+        self._connect().execute(
+            "INSERT INTO uploads (id, length, metadata, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+            (upload_id, length, json.dumps(metadata or {}), now, now)
+        )
+        return upload_id
+
+    def get(self, upload_id: str) -> Dict[str, Any]:
+        """
+        State of an upload.
+
+        Returns:
+            Dict with 'id', 'length', 'metadata', 'ranges' (received [start, end) pairs, merged),
+            'offset' (bytes received from the start without a gap) and 'complete'.
+
+        Raises:
+            UploadNotFound
+        """
+        conn = self._connect()
+        row = conn.execute("SELECT * FROM uploads WHERE id = ?", (upload_id,)).fetchone()
+        if row is None:
+            raise UploadNotFound(f"Upload {upload_id} not found")
+        ranges: List[List[int]] = []
+        for start, end in conn.execute("SELECT start_offset, end_offset FROM chunks WHERE upload_id = ? "
+                                       "ORDER BY start_offset", (upload_id,)):
+            if ranges and ranges[-1][1] == start:
+                ranges[-1][1] = end
+            else:
+                ranges.append([start, end])
+        return {
+            'id': upload_id,
+            'length': row['length'],
+            'metadata': json.loads(row['metadata']),
+            'ranges': [tuple(r) for r in ranges],
+            'offset': ranges[0][1] if ranges and ranges[0][0] == 0 else 0,
+            'complete': row['completed_at'] is not None or (row['length'] == 0),
+        }
+
+    def write(self, upload_id: str, offset: int, stream: BinaryIO, length: int,
+              checksum: Optional[Tuple[str, bytes]] = None) -> bool:
+        """
+        Write a chunk of `length` bytes read from `stream` at `offset`.
+
+        Args:
+            checksum: (algorithm, digest) the chunk must match, algorithm in CHECKSUM_ALGORITHMS.
+
+        Returns:
+            True if this chunk completed the upload (for exactly one caller per upload).
+
+        Raises:
+            UploadNotFound, OffsetConflict, UploadTooLarge, ChecksumMismatch, ValueError (unknown algorithm)
+        """
+        state = self.get(upload_id)
+        end = offset + length
+        if offset < 0 or length <= 0 or end > state['length']:
+            raise UploadTooLarge(f"Chunk {offset}-{end} is outside the upload's {state['length']} bytes")
+        if checksum is not None and checksum[0] not in CHECKSUM_ALGORITHMS:
+            raise ValueError(f"Unsupported checksum algorithm: {checksum[0]}")
+        if state['complete']:
+            raise OffsetConflict(f"Bytes {offset}-{end} were already received")
+
+        # Nothing is written outside a range claimed by this request, so a corrupt or
+        # overlapping chunk never touches bytes that were accepted
+        token = self._claim(upload_id, offset, end)
+        hash_state = self._hash_state(upload_id)
+        with hash_state.lock:
+            # In order: hash as we read, adopted if the chunk is accepted
+            prefix = hash_state.digest.copy() if hash_state.position == offset else None
+        buffer = bytearray() if prefix is None and self._reserve_buffer(length) else None
+        try:
+            verifier = hashlib.new(checksum[0]) if checksum else None
+            refreshed_at = time.time()
+            fd = os.open(self._data_path(upload_id), os.O_WRONLY)
+            try:
+                position_in_file = offset
+                while position_in_file < end:
+                    data = stream.read(min(_READ_SIZE, end - position_in_file))
+                    if not data:
+                        raise ResumableUploadError(f"Chunk ended after {position_in_file - offset} of {length} bytes")
+                    if time.time() - refreshed_at > _CLAIM_REFRESH:
+                        self._refresh_claim(token, offset, end)
+                        refreshed_at = time.time()
+                    os.pwrite(fd, data, position_in_file)
+                    position_in_file += len(data)
+                    if verifier is not None:
+                        verifier.update(data)
+                    if prefix is not None:
+                        prefix.update(data)
+                    if buffer is not None:
+                        buffer += data
+            finally:
+                os.close(fd)
+            if verifier is not None and verifier.digest() != checksum[1]:
+                raise ChecksumMismatch(f"{checksum[0]} of bytes {offset}-{end} does not match")
+            completed = self._commit(upload_id, token, offset, end, state['length'])
+        except BaseException:
+            self._release_claim(token)
+            if buffer is not None:
+                self._release_buffer(length)
+            raise
+
+        with hash_state.lock:
+            if prefix is not None and hash_state.position == offset:
+                hash_state.position, hash_state.digest = end, prefix
+            elif buffer is not None:
+                hash_state.pending[offset] = bytes(buffer)
+            self._drain(hash_state)
+        return completed
+
+    def _overlaps(self, upload_id: str, start: int, end: int, conn: Optional[sqlite3.Connection] = None) -> bool:
+        return (conn or self._connect()).execute(
+            "SELECT 1 FROM chunks WHERE upload_id = ? AND start_offset < ? AND end_offset > ? LIMIT 1",
+            (upload_id, end, start)
+        ).fetchone() is not None
+
+    def _claim(self, upload_id: str, start: int, end: int) -> str:
+        """Reserve bytes start-end for one request to write; returns the claim's token."""
+        conn = self._connect()
+        token = uuid.uuid4().hex
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM claims WHERE upload_id = ? AND claimed_at < ?",
+                         (upload_id, now - CLAIM_TIMEOUT))
+            if self._overlaps(upload_id, start, end, conn):
+                raise OffsetConflict(f"Bytes {start}-{end} were already received")
+            if conn.execute("SELECT 1 FROM claims WHERE upload_id = ? AND start_offset < ? AND end_offset > ? LIMIT 1",
+                            (upload_id, end, start)).fetchone() is not None:
+                raise OffsetConflict(f"Bytes {start}-{end} are being received by another request")
+            conn.execute("INSERT INTO claims (token, upload_id, start_offset, end_offset, claimed_at) "
+                         "VALUES (?, ?, ?, ?, ?)", (token, upload_id, start, end, now))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return token
+
+    def _refresh_claim(self, token: str, start: int, end: int):
+        """Keep a claim alive while its chunk is slow to arrive; fails if it already expired."""
+        if self._connect().execute("UPDATE claims SET claimed_at = ? WHERE token = ?",
+                                   (time.time(), token)).rowcount != 1:
+            raise OffsetConflict(f"Claim on bytes {start}-{end} expired")
+
+    def _release_claim(self, token: str):
+        self._connect().execute("DELETE FROM claims WHERE token = ?", (token,))
+
+    def _commit(self, upload_id: str, token: str, start: int, end: int, length: int) -> bool:
+        """Turn a claim into a received chunk; True if it was the last one."""
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if conn.execute("DELETE FROM claims WHERE token = ?", (token,)).rowcount != 1:
+                raise OffsetConflict(f"Claim on bytes {start}-{end} expired")
+            now = time.time()
+            conn.execute("INSERT INTO chunks (upload_id, start_offset, end_offset) VALUES (?, ?, ?)",
+                         (upload_id, start, end))
+            conn.execute("UPDATE uploads SET updated_at = ? WHERE id = ?", (now, upload_id))
+            received = conn.execute("SELECT SUM(end_offset - start_offset) FROM chunks WHERE upload_id = ?",
+                                    (upload_id,)).fetchone()[0]
+            completed = received == length and conn.execute(
+                "UPDATE uploads SET completed_at = ? WHERE id = ? AND completed_at IS NULL", (now, upload_id)
+            ).rowcount == 1
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return completed
+
+    def _hash_state(self, upload_id: str) -> _HashState:
+        with self._hashes_lock:
+            return self._hashes.setdefault(upload_id, _HashState())
+
+    def _reserve_buffer(self, size: int) -> bool:
+        """Take `size` bytes of the in-memory budget for an out-of-order chunk, if left."""
+        with self._hashes_lock:
+            if self._buffered + size > self.hash_buffer:
+                return False
+            self._buffered += size
+            return True
+
+    def _release_buffer(self, size: int):
+        with self._hashes_lock:
+            self._buffered -= size
+
+    def _drain(self, hash_state: _HashState):
+        """Hash the buffered chunks the prefix has reached. Call with the state's lock held."""
+        while hash_state.position in hash_state.pending:
+            data = hash_state.pending.pop(hash_state.position)
+            hash_state.digest.update(data)
+            hash_state.position += len(data)
+            self._release_buffer(len(data))
+
+    def _drop_hash_state(self, upload_id: str):
+        with self._hashes_lock:
+            hash_state = self._hashes.pop(upload_id, None)
+        if hash_state is not None:
+            with hash_state.lock:
+                self._release_buffer(sum(len(data) for data in hash_state.pending.values()))
+                hash_state.pending.clear()
+
+    def _catch_up(self, upload_id: str, hash_state: _HashState):
+        """
+        Advance the hash over every received chunk, reading from disk the ones this
+        process didn't buffer. Call with the state's lock held.
+        """
+        conn = self._connect()
+        with open(self._data_path(upload_id), 'rb') as f:
+            while True:
+                self._drain(hash_state)
+                row = conn.execute("SELECT end_offset FROM chunks WHERE upload_id = ? AND start_offset = ?",
+                                   (upload_id, hash_state.position)).fetchone()
+                if row is None:
+                    break
+                f.seek(hash_state.position)
+                remaining = row[0] - hash_state.position
+                while remaining > 0:
+                    data = f.read(min(_READ_SIZE, remaining))
+                    if not data:
+                        return
+                    hash_state.digest.update(data)
+                    hash_state.position += len(data)
+                    remaining -= len(data)
+
+    def finish(self, upload_id: str, destination: str) -> IngestResult:
+        """
+        Move a complete upload to `destination` with its content hash and analysis.
+
+        `destination` may be on another filesystem. Finishing again (e.g. after a crash
+        before the video was queued) returns the same result from the moved file.
+        The upload's record stays (complete) until it expires.
+
+        Raises:
+            UploadNotFound: No such upload, or its data is gone.
+            OffsetConflict: Data is still missing, or another request is moving it.
+        """
+        state = self.get(upload_id)
+        if not state['complete']:
+            raise OffsetConflict(f"Upload {upload_id} is missing data")
+        data_path = self._data_path(upload_id)
+        position, digest = 0, None
+        hash_state = self._hash_state(upload_id)
+        with hash_state.lock:
+            if data_path.exists():
+                self._catch_up(upload_id, hash_state)
+                position, digest = hash_state.position, hash_state.digest
+        self._drop_hash_state(upload_id)
+        if data_path.exists():
+            # Copied next to the destination first when it is on another filesystem
+            staging = f"{destination}.{uuid.uuid4().hex[:8]}.tmp"
+            try:
+                shutil.move(str(data_path), staging)
+                os.replace(staging, destination)
+            except FileNotFoundError:
+                # Moved by a concurrent request meanwhile
+                Path(staging).unlink(missing_ok=True)
+        if not os.path.exists(destination):
+            if data_path.exists():
+                raise OffsetConflict(f"Upload {upload_id} is being finished")
+            raise UploadNotFound(f"Upload {upload_id} has no data")
+        if position == state['length'] and digest is not None:
+            content_hash = digest.hexdigest()
+            remember_content_hash(destination, content_hash)
+        else:
+            content_hash = file_content_hash(destination)
+
+        video_metadata = None
+        try:
+            from .video_analyzer import VideoAnalyzer
+            video_metadata = VideoAnalyzer._from_probe(destination, probe(destination))
+        except ProbeError:
+            pass
+        return IngestResult(path=destination, size=state['length'], content_hash=content_hash,
+                            video_metadata=video_metadata)
+
+    def delete(self, upload_id: str):
+        """Abandon an upload and delete what was received."""
+        self.get(upload_id)
+        self._data_path(upload_id).unlink(missing_ok=True)
+        self._forget(upload_id)
+
+    def _forget(self, upload_id: str):
+        conn = self._connect()
+        conn.execute("DELETE FROM chunks WHERE upload_id = ?", (upload_id,))
+        conn.execute("DELETE FROM claims WHERE upload_id = ?", (upload_id,))
+        conn.execute("DELETE FROM uploads WHERE id = ?", (upload_id,))
+        self._drop_hash_state(upload_id)
+
+    def expire(self) -> int:
+        """Delete uploads, complete or not, not touched for expire_after seconds; returns how many."""
+        cutoff = time.time() - self.expire_after
+        stale = [row[0] for row in self._connect().execute(
+            "SELECT id FROM uploads WHERE updated_at < ?", (cutoff,))]
+        for upload_id in stale:
+            self._data_path(upload_id).unlink(missing_ok=True)
+            self._forget(upload_id)
+        return len(stale)
+
+
+def parse_metadata(header: Optional[str]) -> Dict[str, str]:
+    """Decode a tus Upload-Metadata header: comma-separated `key base64(value)` pairs."""
+    metadata = {}
+    for pair in (header or "").split(','):
+        pair = pair.strip()
+        if not pair:
+            continue
+        key, _, value = pair.partition(' ')
+        try:
+            metadata[key] = base64.b64decode(value.strip(), validate=True).decode('utf-8') if value else ""
+        except (ValueError, UnicodeDecodeError) as e:
+            raise ValueError(f"Invalid Upload-Metadata value for {key!r}") from e
+    return metadata
+
+
+def parse_checksum(header: Optional[str]) -> Optional[Tuple[str, bytes]]:
+    """Decode a tus Upload-Checksum header: `algorithm base64(digest)`."""
+    if not header:
+        return None
+    algorithm, _, value = header.strip().partition(' ')
+    try:
+        return algorithm.lower(), base64.b64decode(value.strip(), validate=True)
+    except ValueError as e:
+        raise ValueError("Invalid Upload-Checksum header") from e
@@ -0,0 +1,124 @@
+"""
+Retry policies: failure classification and per-class backoff.
+"""
+import re
+import random
+from enum import Enum
+from typing import Callable, Dict, Optional, Union
+from .models import Platform
+
+class ErrorClass(str, Enum):
+    TRANSIENT = "transient"    # Flaky UI, timeouts, network, 5xx - retry soon
+    THROTTLED = "throttled"    # The platform is rate limiting us - back off hard
+    AUTH = "auth"              # Session expired or login failed - retry after re-login
+    PERMANENT = "permanent"    # Retrying cannot help (bad input, our own limits, emergency stop)
+
+# Checked in order; the first matching class wins
+_ERROR_PATTERNS = [
+    (ErrorClass.PERMANENT, re.compile(
+        r"emergency stop|circuit open|risk check failed|not yet implemented|daily rate limit exceeded|unknown \w+ account"
+        r"|file ?not ?found|no such file|unsupported|invalid (metadata|json|file|video|format|mp4|ebml)|not compliant|could not reframe|already published|duplicate"
+        r"|http error (400|404|413|415)\b", re.IGNORECASE)),
+    (ErrorClass.THROTTLED, re.compile(
+        r"rate ?limit|quota|too many|\b429\b|try again later|action blocked|temporarily blocked"
+        r"|slow down|limit how often", re.IGNORECASE)),
+    (ErrorClass.AUTH, re.compile(
+        r"login|log in|not authenticated|unauthori[sz]ed|invalid_grant|credentials|token has been expired"
+        r"|http error (401|403)\b", re.IGNORECASE)),
+]
+
+def classify_error(error: Union[str, BaseException, None]) -> ErrorClass:
+    """
+    Classify a failure from an UploadResult.error string or a raised exception.
+    Unrecognised failures are treated as transient.
+    """
+    if isinstance(error, BaseException):
+        if isinstance(error, (FileNotFoundError, PermissionError, IsADirectoryError)):
+            return ErrorClass.PERMANENT
+        text = f"{type(error).__name__}: {error}"
+    else:
+        text = error or ""
+
+    for error_class, pattern in _ERROR_PATTERNS:
+        if pattern.search(text):
+            return error_class
+    return ErrorClass.TRANSIENT
+
+class Backoff:
+    """
+    Exponential backoff with jitter for one error class.
+    """
+
+    def __init__(self, max_attempts: int, base_delay: float = 10.0, max_delay: float = 300.0,
+                 multiplier: float = 2.0, jitter: float = 0.25):
+        """
+        Args:
+            max_attempts: Total attempts allowed (1 means never retry).
+            base_delay: Delay in seconds before the first retry.
+            max_delay: Cap on any single delay.
+            multiplier: Growth factor between consecutive retries.
+            jitter: Fraction of the delay randomised (+/-) to avoid synchronized retries.
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.jitter = jitter
+
+    def delay(self, attempt: int) -> float:
+        """Delay before the retry that follows failed attempt number `attempt` (1-based)."""
+        raw = min(self.max_delay, self.base_delay * self.multiplier ** (attempt - 1))
+        spread = raw * self.jitter
+        return max(0.0, min(self.max_delay, raw + random.uniform(-spread, spread)))
+
+class RetryPolicy:
+    """
+    Decides whether and when a failed upload attempt is retried.
+    """
+
+    def __init__(self, backoffs: Dict[ErrorClass, Backoff],
+                 classifier: Callable[[Union[str, BaseException, None]], ErrorClass] = classify_error):
+        """
+        Args:
+            backoffs: Backoff per error class. Missing classes are never retried.
+            classifier: Maps an error string or exception to an ErrorClass.
+        """
+        self.backoffs = backoffs
+        self.classifier = classifier
+
+    def next_delay(self, error: Union[str, BaseException, None], attempt: int) -> Optional[float]:
+        """
+        Get the delay before retrying after failed attempt number `attempt`.
+
+        Returns:
+            Seconds to wait, or None if the failure must not be retried.
+        """
+        error_class = self.classifier(error)
+        if error_class == ErrorClass.PERMANENT:
+            return None
+        backoff = self.backoffs.get(error_class)
+        if backoff is None or attempt >= backoff.max_attempts:
+            return None
+        return backoff.delay(attempt)
+
+# Browser automation fails on flaky UI often; throttling needs long pauses
+BROWSER_RETRY_POLICY = RetryPolicy({
+    ErrorClass.TRANSIENT: Backoff(max_attempts=3, base_delay=10, max_delay=120),
+    ErrorClass.THROTTLED: Backoff(max_attempts=2, base_delay=300, max_delay=1800),
+    ErrorClass.AUTH: Backoff(max_attempts=2, base_delay=5, max_delay=30),
+})
+
+# The YouTube API resumes uploads itself; only retry server errors and short-lived rate limits
+API_RETRY_POLICY = RetryPolicy({
+    ErrorClass.TRANSIENT: Backoff(max_attempts=3, base_delay=5, max_delay=60),
+    ErrorClass.THROTTLED: Backoff(max_attempts=2, base_delay=60, max_delay=600),
+})
+
+DEFAULT_RETRY_POLICIES = {
+    Platform.YOUTUBE: API_RETRY_POLICY,
+    Platform.YOUTUBE_SHORTS: API_RETRY_POLICY,
+    Platform.TIKTOK: BROWSER_RETRY_POLICY,
+    Platform.INSTAGRAM: BROWSER_RETRY_POLICY,
+}
+
+NO_RETRY = RetryPolicy({})
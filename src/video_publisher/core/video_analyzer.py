@@ -1,13 +1,164 @@
-from moviepy import VideoFileClip
+import os
+import time
+import multiprocessing
+from collections import deque
+from dataclasses import dataclass
+from multiprocessing.connection import wait
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional
 from .models import VideoMetadata
+from .probe import ProbeError, ProbeResult, ffprobe, probe
+
+def __getattr__(name):
+    # moviepy pulls in numpy and imageio; import it only if a container can't be probed otherwise
+    if name == 'VideoFileClip':
+        from moviepy import VideoFileClip
+        globals()['VideoFileClip'] = VideoFileClip
+        return VideoFileClip
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+if TYPE_CHECKING:
+    from .analysis_cache import AnalysisCache
+
+@dataclass
+class AnalysisResult:
+    """Outcome of analyzing one file of a batch."""
+
+    path: str
+    metadata: Optional[VideoMetadata] = None
+    error: Optional[str] = None
+
+    @property
+    def success(self) -> bool:
+        return self.metadata is not None
 
 class VideoAnalyzer:
-    def analyze(self, video_path: str) -> VideoMetadata:
+    def __init__(self, cache: Optional['AnalysisCache'] = None):
+        """
+        Args:
+            cache: Cache consulted before analyzing and updated after. None analyzes every time.
+        """
+        self.cache = cache
+
+    def analyze(self, video_path: str, content_hash: Optional[str] = None) -> VideoMetadata:
         """
         Analyzes the video file to extract metadata.
+
+        MP4/MOV and Matroska/WebM files are read from their headers only. Other
+        containers go through ffprobe, or moviepy if ffprobe isn't installed.
+
+        Args:
+            content_hash: The file's content hash if already computed, to reuse the analysis of a copy.
+        """
+        if self.cache is not None:
+            cached = self.cache.get(video_path, content_hash)
+            if cached is not None:
+                return cached
+        video_metadata = self._analyze(video_path)
+        if self.cache is not None:
+            self.cache.put(video_path, video_metadata, content_hash)
+        return video_metadata
+
+    def analyze_many(self, video_paths: Iterable[str], workers: Optional[int] = None,
+                     timeout: float = 30.0) -> Iterator[AnalysisResult]:
         """
+        Analyze many files in parallel worker processes, yielding each result as it completes.
+
+        Cached files are yielded first without starting a worker. A file that fails,
+        or is still being analyzed after `timeout` seconds (e.g. a corrupt file hanging
+        the decoder), yields an error result: its worker is killed and replaced, and
+        the rest of the batch carries on.
+
+        Workers are spawned, so scripts calling this must guard their entry point
+        with `if __name__ == "__main__":`.
+
+        Args:
+            video_paths: Files to analyze.
+            workers: Number of worker processes. Defaults to the CPU count.
+            timeout: Seconds allowed per file.
+        """
+        pending = deque()
+        for video_path in video_paths:
+            cached = self.cache.get(video_path) if self.cache is not None else None
+            if cached is not None:
+                yield AnalysisResult(path=video_path, metadata=cached)
+            else:
+                pending.append(video_path)
+        if not pending:
+            return
+
+        context = multiprocessing.get_context('spawn')  # Forking a threaded process is unsafe
+        size = max(1, min(workers or os.cpu_count() or 1, len(pending)))
+        pool = [_AnalysisWorker(context) for _ in range(size)]
         try:
-            with VideoFileClip(video_path) as clip:
+            while pending or any(worker.path for worker in pool):
+                for worker in pool:
+                    if worker.path is None and pending:
+                        worker.submit(pending.popleft(), timeout)
+
+                busy = [worker for worker in pool if worker.path]
+                wait_for = max(0.0, min(worker.deadline for worker in busy) - time.monotonic())
+                ready = wait([worker.conn for worker in busy], timeout=wait_for)
+
+                for index, worker in enumerate(pool):
+                    if worker.path is None:
+                        continue
+                    replace = False
+                    if worker.conn in ready:
+                        try:
+                            result = worker.conn.recv()
+                        except (EOFError, OSError):
+                            result = AnalysisResult(path=worker.path, error="Analysis worker crashed")
+                            replace = True
+                    elif time.monotonic() >= worker.deadline:
+                        result = AnalysisResult(path=worker.path, error=f"Analysis timed out after {timeout:.0f}s")
+                        replace = True
+                    else:
+                        continue
+                    if replace:
+                        # The process is dead or stuck in the file: start a fresh one
+                        worker.close()
+                        pool[index] = _AnalysisWorker(context)
+                    else:
+                        worker.path = None
+                    if result.success and self.cache is not None:
+                        self.cache.put(result.path, result.metadata)
+                    yield result
+        finally:
+            for worker in pool:
+                worker.close()
+
+    def _analyze(self, video_path: str) -> VideoMetadata:
+        try:
+            return self._from_probe(video_path, probe(video_path))
+        except ProbeError:
+            pass
+        try:
+            return self._from_probe(video_path, ffprobe(video_path))
+        except ProbeError:
+            return self._analyze_with_moviepy(video_path)
+
+    @staticmethod
+    def _from_probe(video_path: str, info: ProbeResult) -> VideoMetadata:
+        width, height = info.display_size
+        return VideoMetadata(
+            path=video_path,
+            duration=info.duration,
+            width=width,
+            height=height,
+            aspect_ratio=width / height,
+            rotation=info.rotation,
+            codec=info.codec,
+            fps=info.fps,
+            bitrate=info.bitrate,
+            size=info.size,
+            container=info.container
+        )
+
+    def _analyze_with_moviepy(self, video_path: str) -> VideoMetadata:
+        video_file_clip = globals().get('VideoFileClip') or __getattr__('VideoFileClip')
+        try:
+            with video_file_clip(video_path) as clip:
+                # moviepy reports the size with rotation already applied
                 return VideoMetadata(
                     path=video_path,
                     duration=clip.duration,
@@ -17,3 +168,50 @@ class VideoAnalyzer:
                 )
         except Exception as e:
             raise ValueError(f"Failed to analyze video at {video_path}: {str(e)}")
+
+
+class _AnalysisWorker:
+    """A worker process of analyze_many() and the file it is analyzing."""
+
+    def __init__(self, context):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_analysis_worker_main, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.path: Optional[str] = None
+        self.deadline = 0.0
+
+    def submit(self, video_path: str, timeout: float):
+        self.path = video_path
+        self.deadline = time.monotonic() + timeout
+        self.conn.send(video_path)
+
+    def close(self):
+        if self.process.is_alive():
+            if self.path is None:
+                try:
+                    self.conn.send(None)
+                    self.process.join(1)
+                except OSError:
+                    pass
+            if self.process.is_alive():
+                self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+def _analysis_worker_main(conn):
+    """Worker process loop: analyze the paths received until told to stop (None)."""
+    analyzer = VideoAnalyzer()
+    while True:
+        try:
+            video_path = conn.recv()
+        except EOFError:
+            return
+        if video_path is None:
+            return
+        try:
+            result = AnalysisResult(path=video_path, metadata=analyzer._analyze(video_path))
+        except Exception as e:
+            result = AnalysisResult(path=video_path, error=str(e))
+        conn.send(result)
@@ -0,0 +1,9 @@
+"""
+Persistent job queue and worker pool for background uploads.
+"""
+from .store import JobStore, JobStatus
+from .pool import WorkerPool
+from .handlers import run_upload_job
+from .scheduling import extract_run_at, parse_scheduled_time
+
+__all__ = ['JobStore', 'JobStatus', 'WorkerPool', 'run_upload_job', 'extract_run_at', 'parse_scheduled_time']
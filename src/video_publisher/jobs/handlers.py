@@ -0,0 +1,54 @@
+"""
+Job handlers executed by worker pools.
+"""
+import os
+from typing import Any, Dict, List
+
+from ..core.cancellation import current_token
+
+
+def run_upload_job(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Publish the video described by an upload job payload.
+    The upload stops early if the job's cancellation token (made current by the worker pool) is cancelled.
+
+    Args:
+        payload: Dict with 'video_path', 'platforms', 'metadata' and optionally 'force',
+                 'content_hash' and 'video_metadata' (serialized VideoMetadata).
+
+    Returns:
+        List of serialized UploadResult dicts.
+    """
+    from .. import upload_video
+    from ..core.hashing import remember_content_hash
+    from ..core.models import VideoMetadata
+
+    video_path = payload['video_path']
+    # Hash and analysis computed while the file was received (see core.ingest)
+    if payload.get('content_hash') and os.path.exists(video_path):
+        remember_content_hash(video_path, payload['content_hash'])
+    video_metadata = payload.get('video_metadata')
+    results = upload_video(
+        video_path,
+        platforms=payload.get('platforms'),
+        metadata=payload.get('metadata') or {},
+        force=payload.get('force', False),
+        video_metadata=VideoMetadata.model_validate(video_metadata) if video_metadata else None,
+        cancel_token=current_token()
+    )
+
+    # Clean up uploaded file
+    if payload.get('cleanup', True) and os.path.exists(video_path):
+        os.remove(video_path)
+
+    return [
+        {
+            'platform': r.platform.value,
+            'success': r.success,
+            'url': r.url,
+            'error': r.error,
+            'account': r.account,
+            'already_published': r.already_published
+        }
+        for r in results
+    ]
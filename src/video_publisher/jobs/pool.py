@@ -0,0 +1,215 @@
+"""
+Fixed-size worker pool that executes jobs from a JobStore.
+"""
+import os
+import time
+import uuid
+import socket
+import threading
+import traceback
+from typing import Any, Callable, Dict, List, Optional
+
+from .store import JobStore
+from ..core.cancellation import CancellationToken, activate
+
+
+class WorkerPool:
+    """
+    Runs queued jobs with bounded concurrency.
+    Several pools (threads of the API, standalone worker processes, other hosts)
+    can share the same store; leases make sure each job runs on one of them at a time.
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        handler: Callable[[Dict[str, Any]], List[Dict[str, Any]]],
+        concurrency: int = 2,
+        poll_interval: Optional[float] = 2.0,
+        lease_duration: float = 60.0,
+        renew_interval: float = 15.0,
+        cancel_check_interval: float = 1.0
+    ):
+        """
+        Args:
+            store: Job store to consume from.
+            handler: Called with a job's payload; returns the job results.
+            concurrency: Number of worker threads.
+            poll_interval: Maximum seconds an idle worker sleeps before checking the queue again,
+                           to see jobs enqueued by other processes. Idle workers otherwise sleep
+                           until the next scheduled job is due or notify() is called;
+                           None relies on that alone.
+            lease_duration: Seconds a claimed job stays reserved without renewal.
+                            Another worker takes it over once the lease expires.
+            renew_interval: Seconds between lease renewals for running jobs.
+            cancel_check_interval: Seconds between checks for cancellations requested through
+                                   the store (e.g. by another process) for running jobs.
+        """
+        self.store = store
+        self.handler = handler
+        self.concurrency = max(1, concurrency)
+        self.poll_interval = poll_interval
+        self.lease_duration = lease_duration
+        self.renew_interval = min(renew_interval, lease_duration / 2)
+        self.cancel_check_interval = min(cancel_check_interval, self.renew_interval)
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+        self._threads: List[threading.Thread] = []
+        self._active: Dict[str, str] = {}  # job_id -> thread name
+        self._tokens: Dict[str, CancellationToken] = {}  # job_id -> token of the running job
+        self._active_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._start_lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return bool(self._threads) and not self._stopping.is_set()
+
+    @property
+    def active_jobs(self) -> List[str]:
+        """IDs of the jobs this pool is running."""
+        with self._active_lock:
+            return list(self._active)
+
+    def start(self):
+        """Recover abandoned jobs and start the worker threads. Idempotent."""
+        with self._start_lock:
+            if self._threads:
+                return
+            recovered = self.store.recover_expired()
+            if recovered:
+                print(f"♻️  Recovered {recovered} interrupted job(s)")
+
+            self._stopping.clear()
+            for i in range(self.concurrency):
+                thread = threading.Thread(target=self._work, name=f"job-worker-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+            renewer = threading.Thread(target=self._watch_jobs, name="job-lease-renewer", daemon=True)
+            renewer.start()
+            self._threads.append(renewer)
+
+    def stop(self, timeout: Optional[float] = None):
+        """
+        Stop claiming jobs and wait for running ones to finish.
+
+        Jobs still running after `timeout` have their lease released so another
+        worker can pick them up right away instead of waiting for it to expire.
+        """
+        self._stopping.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+        for job_id in self.active_jobs:
+            if self.store.release(job_id, self.worker_id):
+                print(f"↩️  Released unfinished job {job_id}")
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Stop a job running in this pool. The handler sees its cancellation token
+        cancelled and the job is recorded as cancelled.
+
+        Returns:
+            True if the job was running here.
+        """
+        with self._active_lock:
+            token = self._tokens.get(job_id)
+        if token is None:
+            return False
+        token.cancel("Cancelled by request")
+        return True
+
+    def notify(self):
+        """Wake idle workers, e.g. right after a job was enqueued."""
+        self._wakeup.set()
+
+    def _work(self):
+        """Worker loop: claim, run, record outcome."""
+        while not self._stopping.is_set():
+            job = self.store.claim(self.worker_id, lease=self.lease_duration)
+            if job is None:
+                self._wakeup.wait(self._idle_timeout())
+                self._wakeup.clear()
+                continue
+
+            token = CancellationToken()
+            with self._active_lock:
+                self._active[job['id']] = threading.current_thread().name
+                self._tokens[job['id']] = token
+            results, error = None, None
+            try:
+                try:
+                    # The handler finds the token through cancellation.current_token()
+                    with activate(token):
+                        results = self.handler(job['payload'])
+                except Exception as e:
+                    error = e
+                    if not token.cancelled:
+                        traceback.print_exc()
+                recorded = self._record(job['id'], token, results, error)
+            finally:
+                with self._active_lock:
+                    self._active.pop(job['id'], None)
+                    self._tokens.pop(job['id'], None)
+            if recorded is False:
+                print(f"⚠️  Lease on job {job['id']} was lost before it finished; outcome not recorded")
+
+    def _record(self, job_id: str, token: CancellationToken, results: Optional[List[Dict[str, Any]]],
+                error: Optional[Exception]) -> Optional[bool]:
+        """
+        Store a job's outcome.
+
+        Returns:
+            Whether this worker still held the job's lease, or None if the store failed;
+            the job is then retried once its lease expires.
+        """
+        try:
+            if token.cancelled:
+                return self.store.mark_cancelled(job_id, results, worker_id=self.worker_id)
+            if error is not None:
+                return self.store.fail(job_id, str(error), worker_id=self.worker_id)
+            return self.store.complete(job_id, results, worker_id=self.worker_id)
+        except Exception as e:
+            print(f"⚠️  Could not record the outcome of job {job_id}: {e}")
+            return None
+
+    def _idle_timeout(self) -> Optional[float]:
+        """Seconds to sleep when no job is due: until the next scheduled job, capped by poll_interval."""
+        next_run_at = self.store.next_run_at()
+        timeout = None if next_run_at is None else max(0.0, next_run_at - time.time())
+        if self.poll_interval is not None:
+            timeout = self.poll_interval if timeout is None else min(timeout, self.poll_interval)
+        return timeout
+
+    def _watch_jobs(self):
+        """
+        Periodically stop running jobs whose cancellation was requested, extend the
+        leases of the others and requeue abandoned ones.
+        """
+        last_renewal = time.monotonic()
+        while not self._stopping.wait(self.cancel_check_interval):
+            job_ids = self.active_jobs
+            try:
+                for job_id in self.store.cancel_requested(job_ids):
+                    with self._active_lock:
+                        token = self._tokens.get(job_id)
+                    if token is not None and not token.cancelled:
+                        print(f"⏹️  Cancelling job {job_id}")
+                        token.cancel("Cancelled by request")
+            except Exception as e:
+                print(f"⚠️  Job cancellation check failed: {e}")
+
+            if time.monotonic() - last_renewal < self.renew_interval:
+                continue
+            last_renewal = time.monotonic()
+            try:
+                renewed = self.store.extend_leases(job_ids, self.worker_id, lease=self.lease_duration)
+                for job_id in set(job_ids) - set(renewed):
+                    print(f"⚠️  Lost lease on job {job_id}")
+                if self.store.recover_expired():
+                    self.notify()
+            except Exception as e:
+                print(f"⚠️  Job lease renewal failed: {e}")
@@ -0,0 +1,51 @@
+"""
+Scheduled publishing through the job queue.
+"""
+import copy
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple
+
+
+def parse_scheduled_time(value: str) -> float:
+    """
+    Parse an ISO 8601 publish time into a Unix timestamp.
+    Times without a UTC offset are taken as UTC.
+
+    Raises:
+        ValueError: If the value is not a valid ISO 8601 datetime.
+    """
+    dt = datetime.fromisoformat(value.strip().replace('Z', '+00:00'))
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+def extract_run_at(payload: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[float]]:
+    """
+    Move an upload job's publish time from its metadata to the queue.
+
+    The job is held in the queue until the scheduled time and then published
+    immediately, instead of relying on each platform's own scheduling UI.
+
+    Args:
+        payload: Upload job payload with optional metadata['scheduling'].
+
+    Returns:
+        Tuple (payload, run_at). run_at is None when the job should run now;
+        otherwise the returned payload publishes immediately and keeps the
+        requested time in 'scheduled_time'.
+
+    Raises:
+        ValueError: If scheduled_time is not a valid ISO 8601 datetime.
+    """
+    scheduling = (payload.get('metadata') or {}).get('scheduling') or {}
+    scheduled_time = scheduling.get('scheduled_time')
+    if not scheduled_time or scheduling.get('publish_now'):
+        return payload, None
+
+    run_at = parse_scheduled_time(scheduled_time)
+    payload = copy.deepcopy(payload)
+    payload['metadata']['scheduling'] = {'publish_now': True, 'scheduled_time': None}
+    payload['scheduled_time'] = scheduled_time
+    return payload, max(run_at, time.time())
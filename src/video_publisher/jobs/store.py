@@ -0,0 +1,365 @@
+"""
+Durable job store backed by SQLite in WAL mode.
+Safe to share between threads and between processes on the same host.
+
+Jobs become claimable at their run_at time (immediately unless scheduled), served
+from a (status, run_at) index so thousands of future jobs cost nothing until due.
+
+Running jobs are held under time-bounded leases: a worker must keep extending
+the lease while it works, and a job whose lease ran out (worker crashed, host
+lost power) is claimed again by the next worker that polls.
+
+Cancelling a queued job takes effect immediately. A running job is flagged with
+cancel_requested_at; the worker holding it notices, stops the upload and records
+the job as cancelled.
+"""
+import json
+import time
+import uuid
+import sqlite3
+import threading
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    PROCESSING = "processing"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    results TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker_id TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    heartbeat_at REAL,
+    lease_expires_at REAL,
+    run_at REAL,
+    cancel_requested_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status_created ON jobs (status, created_at);
+"""
+
+# Created after migrations, since older databases lack run_at until then
+_INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_jobs_status_run_at ON jobs (status, run_at);
+"""
+
+# Columns added after the first release, created on existing databases
+_MIGRATIONS = {
+    'lease_expires_at': "ALTER TABLE jobs ADD COLUMN lease_expires_at REAL",
+    'run_at': "ALTER TABLE jobs ADD COLUMN run_at REAL; UPDATE jobs SET run_at = created_at",
+    'cancel_requested_at': "ALTER TABLE jobs ADD COLUMN cancel_requested_at REAL",
+}
+
+
+class JobStore:
+    """
+    Persistent queue of upload jobs.
+    Jobs move queued -> processing -> completed/failed/cancelled and survive restarts.
+    """
+
+    def __init__(self, db_path: str = "data/jobs/jobs.db", max_attempts: int = 3):
+        """
+        Args:
+            db_path: SQLite database file, shared by every worker using the queue.
+            max_attempts: Claims allowed per job. A job whose lease expires on its last
+                          attempt (e.g. it keeps crashing its worker) is failed instead of requeued.
+        """
+        self.db_path = Path(db_path)
+        self.max_attempts = max(1, max_attempts)
+        if not self.db_path.parent.exists():
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # One connection per thread; sqlite3 connections must not be shared across threads
+        self._local = threading.local()
+        self._init_schema()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Get the calling thread's connection, opening it if needed."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
+        return conn
+
+    def _init_schema(self):
+        """Create tables and indexes if they don't exist."""
+        conn = self._connect()
+        conn.executescript(_SCHEMA)
+        columns = {row['name'] for row in conn.execute("PRAGMA table_info(jobs)")}
+        for column, statement in _MIGRATIONS.items():
+            if column not in columns:
+                conn.executescript(statement)
+        conn.executescript(_INDEXES)
+
+    def _row_to_job(self, row: sqlite3.Row) -> Dict[str, Any]:
+        """Convert a database row to a job dictionary."""
+        job = dict(row)
+        job['payload'] = json.loads(job['payload'])
+        job['results'] = json.loads(job['results']) if job['results'] else []
+        return job
+
+    def enqueue(self, payload: Dict[str, Any], job_id: Optional[str] = None,
+                run_at: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Add a job to the queue.
+
+        Args:
+            payload: JSON-serializable job description.
+            job_id: Optional explicit ID (a UUID is generated otherwise).
+            run_at: Unix time before which the job must not run (None runs it as soon as possible).
+
+        Returns:
+            The stored job.
+        """
+        job_id = job_id or str(uuid.uuid4())
+        now = time.time()
+        self._connect().execute(
+            "INSERT INTO jobs (id, status, payload, created_at, updated_at, run_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (job_id, JobStatus.QUEUED.value, json.dumps(payload), now, now, run_at if run_at is not None else now)
+        )
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get a job by ID, or None if it doesn't exist."""
+        row = self._connect().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._row_to_job(row) if row else None
+
+    def claim(self, worker_id: str, lease: float = 60.0) -> Optional[Dict[str, Any]]:
+        """
+        Atomically take the most overdue job and lease it to a worker.
+
+        Available jobs are queued ones whose run_at has passed and processing ones
+        whose lease has expired.
+
+        Args:
+            worker_id: Identifier of the claiming worker.
+            lease: Seconds the job is reserved for this worker unless the lease is extended.
+
+        Returns:
+            The claimed job, or None if the queue is empty.
+        """
+        conn = self._connect()
+        now = time.time()
+        # BEGIN IMMEDIATE takes the write lock up front so two processes can't claim the same job
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._expire_leases(conn, now)
+            row = conn.execute(
+                "SELECT id FROM jobs WHERE status = ? AND run_at <= ? ORDER BY run_at LIMIT 1",
+                (JobStatus.QUEUED.value, now)
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = ?, worker_id = ?, attempts = attempts + 1, "
+                "started_at = ?, heartbeat_at = ?, lease_expires_at = ?, updated_at = ? WHERE id = ?",
+                (JobStatus.PROCESSING.value, worker_id, now, now, now + lease, now, row['id'])
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return self.get(row['id'])
+
+    def extend_leases(self, job_ids: List[str], worker_id: str, lease: float = 60.0) -> List[str]:
+        """
+        Extend the leases of jobs a worker is still running.
+
+        Returns:
+            IDs of the jobs whose lease was extended. Jobs missing from the result
+            were lost (lease expired and taken over, or released).
+        """
+        if not job_ids:
+            return []
+        now = time.time()
+        placeholders = ",".join("?" for _ in job_ids)
+        rows = self._connect().execute(
+            f"UPDATE jobs SET heartbeat_at = ?, lease_expires_at = ? "
+            f"WHERE worker_id = ? AND status = ? AND id IN ({placeholders}) RETURNING id",
+            (now, now + lease, worker_id, JobStatus.PROCESSING.value, *job_ids)
+        ).fetchall()
+        return [row['id'] for row in rows]
+
+    def release(self, job_id: str, worker_id: str) -> bool:
+        """
+        Give a leased job back to the queue without counting the attempt,
+        e.g. when a worker shuts down before finishing it. A job whose
+        cancellation was requested is cancelled instead.
+        """
+        now = time.time()
+        cursor = self._connect().execute(
+            "UPDATE jobs SET status = CASE WHEN cancel_requested_at IS NULL THEN ? ELSE ? END, "
+            "finished_at = CASE WHEN cancel_requested_at IS NULL THEN NULL ELSE ? END, "
+            "worker_id = NULL, lease_expires_at = NULL, attempts = MAX(attempts - 1, 0), updated_at = ? "
+            "WHERE id = ? AND worker_id = ? AND status = ?",
+            (JobStatus.QUEUED.value, JobStatus.CANCELLED.value, now, now, job_id, worker_id,
+             JobStatus.PROCESSING.value)
+        )
+        return cursor.rowcount > 0
+
+    def complete(self, job_id: str, results: List[Dict[str, Any]], worker_id: Optional[str] = None) -> bool:
+        """
+        Mark a job as completed with its results.
+
+        Args:
+            worker_id: If given, only complete the job while this worker still holds its lease.
+
+        Returns:
+            True if the job was updated.
+        """
+        return self._finish(job_id, worker_id, JobStatus.COMPLETED, json.dumps(results), None)
+
+    def fail(self, job_id: str, error: str, worker_id: Optional[str] = None) -> bool:
+        """
+        Mark a job as failed.
+
+        Args:
+            worker_id: If given, only fail the job while this worker still holds its lease.
+
+        Returns:
+            True if the job was updated.
+        """
+        return self._finish(job_id, worker_id, JobStatus.FAILED, None, error)
+
+    def mark_cancelled(self, job_id: str, results: Optional[List[Dict[str, Any]]] = None,
+                       worker_id: Optional[str] = None) -> bool:
+        """
+        Record that a running job stopped because it was cancelled.
+
+        Args:
+            results: Results of the platforms that finished before the cancellation.
+            worker_id: If given, only update the job while this worker still holds its lease.
+
+        Returns:
+            True if the job was updated.
+        """
+        return self._finish(job_id, worker_id, JobStatus.CANCELLED, json.dumps(results or []), "Cancelled by request")
+
+    def cancel(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Cancel a job.
+
+        A queued (or scheduled) job is cancelled right away. A processing job is flagged;
+        its worker stops it and marks it cancelled. Finished jobs are left unchanged.
+
+        Returns:
+            The job after the request, or None if it doesn't exist.
+        """
+        now = time.time()
+        conn = self._connect()
+        conn.execute(
+            "UPDATE jobs SET status = ?, error = ?, finished_at = ?, updated_at = ? WHERE id = ? AND status = ?",
+            (JobStatus.CANCELLED.value, "Cancelled by request", now, now, job_id, JobStatus.QUEUED.value)
+        )
+        conn.execute(
+            "UPDATE jobs SET cancel_requested_at = ?, updated_at = ? "
+            "WHERE id = ? AND status = ? AND cancel_requested_at IS NULL",
+            (now, now, job_id, JobStatus.PROCESSING.value)
+        )
+        return self.get(job_id)
+
+    def cancel_requested(self, job_ids: List[str]) -> List[str]:
+        """IDs among `job_ids` of processing jobs whose cancellation was requested."""
+        if not job_ids:
+            return []
+        placeholders = ",".join("?" for _ in job_ids)
+        rows = self._connect().execute(
+            f"SELECT id FROM jobs WHERE status = ? AND cancel_requested_at IS NOT NULL AND id IN ({placeholders})",
+            (JobStatus.PROCESSING.value, *job_ids)
+        ).fetchall()
+        return [row['id'] for row in rows]
+
+    def _finish(self, job_id: str, worker_id: Optional[str], status: JobStatus,
+                results: Optional[str], error: Optional[str]) -> bool:
+        """Record a job's final state."""
+        now = time.time()
+        query = ("UPDATE jobs SET status = ?, results = ?, error = ?, lease_expires_at = NULL, "
+                 "finished_at = ?, updated_at = ? WHERE id = ?")
+        params = [status.value, results, error, now, now, job_id]
+        if worker_id is not None:
+            query += " AND worker_id = ?"
+            params.append(worker_id)
+        return self._connect().execute(query, params).rowcount > 0
+
+    def recover_expired(self) -> int:
+        """
+        Requeue processing jobs whose lease expired (e.g. the worker crashed
+        or its host went away mid-upload). Jobs out of attempts are failed.
+
+        Returns:
+            Number of jobs requeued or failed.
+        """
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            recovered = self._expire_leases(conn, time.time())
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return recovered
+
+    def _expire_leases(self, conn: sqlite3.Connection, now: float) -> int:
+        """Requeue, cancel or fail jobs with expired leases (caller holds the write lock)."""
+        # A job cancelled while its worker was lost is not run again
+        cancelled = conn.execute(
+            "UPDATE jobs SET status = ?, error = ?, worker_id = NULL, lease_expires_at = NULL, "
+            "finished_at = ?, updated_at = ? "
+            "WHERE status = ? AND (lease_expires_at IS NULL OR lease_expires_at < ?) "
+            "AND cancel_requested_at IS NOT NULL",
+            (JobStatus.CANCELLED.value, "Cancelled by request", now, now, JobStatus.PROCESSING.value, now)
+        ).rowcount
+        failed = conn.execute(
+            "UPDATE jobs SET status = ?, error = ?, worker_id = NULL, lease_expires_at = NULL, "
+            "finished_at = ?, updated_at = ? "
+            "WHERE status = ? AND (lease_expires_at IS NULL OR lease_expires_at < ?) AND attempts >= ?",
+            (JobStatus.FAILED.value, f"Worker lost the job on {self.max_attempts} attempts", now, now,
+             JobStatus.PROCESSING.value, now, self.max_attempts)
+        ).rowcount
+        requeued = conn.execute(
+            "UPDATE jobs SET status = ?, worker_id = NULL, lease_expires_at = NULL, updated_at = ? "
+            "WHERE status = ? AND (lease_expires_at IS NULL OR lease_expires_at < ?)",
+            (JobStatus.QUEUED.value, now, JobStatus.PROCESSING.value, now)
+        ).rowcount
+        return cancelled + failed + requeued
+
+    def next_run_at(self) -> Optional[float]:
+        """Unix time at which the earliest queued job becomes due, or None if the queue is empty."""
+        row = self._connect().execute(
+            "SELECT MIN(run_at) AS run_at FROM jobs WHERE status = ?", (JobStatus.QUEUED.value,)
+        ).fetchone()
+        return row['run_at']
+
+    def counts(self) -> Dict[str, int]:
+        """
+        Get the number of jobs per status.
+        Queued jobs that are not due yet are counted separately as 'scheduled'.
+        """
+        conn = self._connect()
+        rows = conn.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status").fetchall()
+        counts = {status.value: 0 for status in JobStatus}
+        counts.update({row['status']: row['n'] for row in rows})
+        scheduled = conn.execute(
+            "SELECT COUNT(*) AS n FROM jobs WHERE status = ? AND run_at > ?", (JobStatus.QUEUED.value, time.time())
+        ).fetchone()['n']
+        counts[JobStatus.QUEUED.value] -= scheduled
+        counts['scheduled'] = scheduled
+        return counts
@@ -0,0 +1,33 @@
+"""
+Media processing: covers, renditions and other files derived from a video.
+
+Covers, reframing and fingerprints need OpenCV and NumPy, which are imported
+on first use of the names that need them.
+"""
+import importlib
+
+# Public names resolved on first access (PEP 562)
+_LAZY_ATTRIBUTES = {
+    'CoverCandidate': '.covers',
+    'select_cover': '.covers',
+    'TranscodeProfile': '.transcode',
+    'TranscodeError': '.transcode',
+    'RenditionCache': '.transcode',
+    'fingerprint': '.fingerprint',
+    'FingerprintIndex': '.fingerprint',
+    'DuplicateMatch': '.fingerprint',
+}
+
+def __getattr__(name: str):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
+__all__ = ['CoverCandidate', 'select_cover', 'TranscodeProfile', 'TranscodeError', 'RenditionCache',
+           'fingerprint', 'FingerprintIndex', 'DuplicateMatch']
@@ -0,0 +1,176 @@
+"""
+Automatic cover (thumbnail) selection.
+
+A bounded number of frames is sampled by seeking (no full decode), scored on
+small grayscale copies in one vectorized pass, and the best frame is written
+as a JPEG. Covers are cached by the video's content hash.
+"""
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+import cv2
+import numpy as np
+
+from ..core.hashing import file_content_hash
+from .sampling import downscale_gray, read_at, sample_frames, stack_gray
+
+# Relative weight of each metric in the final score
+_WEIGHTS = {
+    'sharpness': 0.35,
+    'exposure': 0.25,
+    'contrast': 0.15,
+    'faces': 0.25,
+    'motion_blur': -0.2,
+}
+
+
+@dataclass
+class CoverCandidate:
+    """A sampled frame and its score."""
+
+    time: float               # Seconds into the video
+    score: float = 0.0
+    sharpness: float = 0.0    # Variance of the Laplacian
+    exposure: float = 0.0     # 1 for well exposed, 0 for black/blown-out frames
+    contrast: float = 0.0     # Standard deviation of the luminance
+    motion_blur: float = 0.0  # Imbalance between horizontal and vertical detail
+    faces: int = 0
+
+
+def select_cover(video_path: str, output_path: Optional[str] = None, samples: int = 12,
+                 content_hash: Optional[str] = None,
+                 cache_dir: Optional[str] = None) -> Optional[str]:
+    """
+    Pick the best frame of a video and save it as a JPEG cover.
+
+    Args:
+        output_path: Where to write the cover. Defaults to `<cache_dir>/<content hash>.jpg`,
+                     which is returned as is when it already exists.
+        samples: Number of frames sampled across the video.
+        content_hash: The video's content hash if already computed.
+        cache_dir: Cover cache directory. Defaults to COVER_CACHE_DIR or data/cache/covers.
+
+    Returns:
+        Path of the cover, or None if no frame could be read.
+    """
+    if output_path is None:
+        cache_dir = cache_dir or os.environ.get('COVER_CACHE_DIR', 'data/cache/covers')
+        output_path = str(Path(cache_dir) / f"{content_hash or file_content_hash(video_path)}.jpg")
+        if os.path.exists(output_path):
+            return output_path
+
+    capture = cv2.VideoCapture(video_path)
+    try:
+        if not capture.isOpened():
+            return None
+        candidates = sample_candidates(capture, samples)
+        if not candidates:
+            return None
+        best = max(candidates, key=lambda c: c.score)
+        frame = read_at(capture, best.time)
+    finally:
+        capture.release()
+    if frame is None:
+        return None
+
+    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+    # Write next to the target and rename, so a concurrent reader never sees half a file
+    temp_path = f"{output_path}.{os.getpid()}.tmp.jpg"
+    if not cv2.imwrite(temp_path, frame, [cv2.IMWRITE_JPEG_QUALITY, 92]):
+        return None
+    os.replace(temp_path, output_path)
+    return output_path
+
+
+def sample_candidates(capture: 'cv2.VideoCapture', samples: int) -> List[CoverCandidate]:
+    """Seek to `samples` evenly spaced times, read one frame at each and score them."""
+    candidates, frames = [], []
+    for time, frame in sample_frames(capture, samples):
+        candidates.append(CoverCandidate(time=time))
+        frames.append(downscale_gray(frame))
+    if not frames:
+        return []
+
+    stack = stack_gray(frames)
+    metrics = frame_metrics(stack)
+    metrics['faces'] = np.array([_count_faces(f) for f in frames], dtype=np.float32)
+    scores = score(metrics)
+
+    for index, candidate in enumerate(candidates):
+        candidate.score = float(scores[index])
+        candidate.sharpness = float(metrics['sharpness'][index])
+        candidate.exposure = float(metrics['exposure'][index])
+        candidate.contrast = float(metrics['contrast'][index])
+        candidate.motion_blur = float(metrics['motion_blur'][index])
+        candidate.faces = int(metrics['faces'][index])
+    return candidates
+
+
+def frame_metrics(frames: np.ndarray) -> dict:
+    """
+    Quality metrics of a stack of grayscale frames.
+
+    Args:
+        frames: Array of shape (N, H, W), values in [0, 1].
+
+    Returns:
+        Dict of metric name to an array of N values.
+    """
+    center = frames[:, 1:-1, 1:-1]
+    laplacian = (frames[:, :-2, 1:-1] + frames[:, 2:, 1:-1] + frames[:, 1:-1, :-2] + frames[:, 1:-1, 2:]
+                 - 4 * center)
+    sharpness = laplacian.var(axis=(1, 2))
+
+    # Motion blur smears detail along one direction only
+    gx = np.abs(np.diff(frames, axis=2)).mean(axis=(1, 2))
+    gy = np.abs(np.diff(frames, axis=1)).mean(axis=(1, 2))
+    motion_blur = np.abs(np.log((gx + 1e-4) / (gy + 1e-4)))
+
+    mean = frames.mean(axis=(1, 2))
+    clipped = ((frames < 0.02) | (frames > 0.98)).mean(axis=(1, 2))
+    exposure = np.clip(1.0 - np.abs(mean - 0.5) * 2, 0, 1) * (1.0 - clipped)
+
+    return {
+        'sharpness': sharpness,
+        'exposure': exposure,
+        'contrast': frames.std(axis=(1, 2)),
+        'motion_blur': motion_blur,
+    }
+
+
+def score(metrics: dict) -> np.ndarray:
+    """Weighted sum of the metrics, each rescaled to [0, 1] across the candidates."""
+    total = None
+    for name, weight in _WEIGHTS.items():
+        values = np.asarray(metrics[name], dtype=np.float32)
+        if name == 'faces':
+            normalized = np.minimum(values, 1.0)  # Having a face matters, not how many
+        else:
+            spread = values.max() - values.min()
+            normalized = (values - values.min()) / spread if spread > 1e-9 else np.zeros_like(values)
+        total = weight * normalized if total is None else total + weight * normalized
+    # Near-black frames (fades, transitions) are never a good cover
+    if 'exposure' in metrics:
+        total = np.where(np.asarray(metrics['exposure']) < 0.1, total - 1.0, total)
+    return total
+
+
+_face_detector = None
+
+
+def _count_faces(gray: np.ndarray) -> int:
+    """Frontal faces in a frame; 0 when the OpenCV build has no Haar cascades."""
+    global _face_detector
+    if _face_detector is None:
+        cascade = getattr(cv2, 'CascadeClassifier', None)
+        cascades_dir = getattr(getattr(cv2, 'data', None), 'haarcascades', None)
+        if cascade is None or cascades_dir is None:
+            _face_detector = False
+        else:
+            _face_detector = cascade(os.path.join(cascades_dir, 'haarcascade_frontalface_default.xml'))
+    if not _face_detector or _face_detector.empty():
+        return 0
+    min_size = max(24, min(gray.shape) // 10)
+    return len(_face_detector.detectMultiScale(gray, scaleFactor=1.2, minNeighbors=5, minSize=(min_size, min_size)))
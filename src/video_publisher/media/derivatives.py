@@ -0,0 +1,106 @@
+"""
+Reframing for multi-aspect derivatives.
+
+A 16:9 master becomes a 9:16 derivative (and the reverse) by cropping. Where
+to crop is decided once per video: frames sampled across it are reduced to a
+saliency map (detail plus what changes between samples) in one vectorized
+pass, and the window holding the most of it wins, with a pull towards the
+center so flat or evenly busy footage is cropped centrally. The crop itself
+is done by ffmpeg, as part of the rendition (see transcode).
+"""
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+from .sampling import downscale_gray, sample_frames, stack_gray
+from .transcode import crop_size
+
+# Weight of change between samples (where the action is) relative to static detail
+_MOTION_WEIGHT = 0.5
+
+
+def reframe_window(video_path: str, aspect_ratio: float, samples: int = 12,
+                   center_weight: float = 0.25) -> Optional[Tuple[int, int, int, int]]:
+    """
+    Crop window of `aspect_ratio` following the salient part of a video.
+
+    One window is used for the whole video: a steady frame rather than one
+    panning after the subject.
+
+    Args:
+        samples: Number of frames sampled across the video.
+        center_weight: Preference for a centered window, relative to the share of saliency it holds.
+
+    Returns:
+        (x, y, width, height) in display pixels, or None if no frame could be read.
+    """
+    capture = cv2.VideoCapture(video_path)
+    try:
+        if not capture.isOpened():
+            return None
+        frames, full_size = [], None
+        for _, frame in sample_frames(capture, samples):
+            full_size = full_size or (frame.shape[1], frame.shape[0])
+            frames.append(downscale_gray(frame))
+    finally:
+        capture.release()
+    if not frames:
+        return None
+
+    stack = stack_gray(frames)
+    _, height, width = stack.shape
+    x, y, _, _ = crop_window(stack, aspect_ratio, center_weight)
+
+    # Back to the source's resolution
+    full_width, full_height = full_size
+    crop_width, crop_height = crop_size(full_width, full_height, aspect_ratio)
+    x = min(round(x * full_width / width), full_width - crop_width)
+    y = min(round(y * full_height / height), full_height - crop_height)
+    return x, y, crop_width, crop_height
+
+
+def crop_window(frames: np.ndarray, aspect_ratio: float,
+                center_weight: float = 0.25) -> Tuple[int, int, int, int]:
+    """
+    Window of `aspect_ratio` holding the most saliency across a stack of frames.
+
+    Args:
+        frames: Array of shape (N, H, W), values in [0, 1].
+
+    Returns:
+        (x, y, width, height) in pixels of the frames.
+    """
+    height, width = frames.shape[1:]
+    crop_width, crop_height = crop_size(width, height, aspect_ratio)
+    weights = saliency_map(frames)
+    if crop_width < width:
+        return best_offset(weights.sum(axis=0), crop_width, center_weight), 0, crop_width, crop_height
+    return 0, best_offset(weights.sum(axis=1), crop_height, center_weight), crop_width, crop_height
+
+
+def saliency_map(frames: np.ndarray) -> np.ndarray:
+    """Per-pixel saliency (H, W) of a stack of frames: mean gradient magnitude plus change between frames."""
+    detail = np.zeros(frames.shape[1:], dtype=np.float32)
+    detail[:, :-1] += np.abs(np.diff(frames, axis=2)).mean(axis=0)
+    detail[:-1, :] += np.abs(np.diff(frames, axis=1)).mean(axis=0)
+    detail /= max(float(detail.mean()), 1e-6)
+    if len(frames) < 2:
+        return detail
+    motion = np.abs(np.diff(frames, axis=0)).mean(axis=0)
+    motion_mean = float(motion.mean())
+    if motion_mean < 1e-6:
+        return detail
+    return detail + _MOTION_WEIGHT * motion / motion_mean
+
+
+def best_offset(weights: np.ndarray, window: int, center_weight: float = 0.25) -> int:
+    """Start of the `window`-long span of `weights` with the best share of the total, favouring the center."""
+    if window >= len(weights):
+        return 0
+    cumulative = np.concatenate(([0.0], np.cumsum(weights, dtype=np.float64)))
+    share = (cumulative[window:] - cumulative[:-window]) / max(cumulative[-1], 1e-9)
+    offsets = np.arange(len(share))
+    center = (len(weights) - window) / 2
+    prior = 1.0 - np.abs(offsets - center) / max(center, 1.0)
+    return int(np.argmax(share + center_weight * prior))
@@ -0,0 +1,289 @@
+"""
+Perceptual fingerprints for near-duplicate detection.
+
+Reposting a clip, even re-encoded, resized or trimmed, gets accounts flagged
+as spam. A video's fingerprint is one 64-bit perceptual hash (DCT pHash) per
+frame sampled across the whole video, so a re-encode hashes to nearby values
+and a trimmed copy still shares most of its frames. Samples are taken every
+interval from the start, the interval doubling until a bounded number of them
+covers the video: a trimmed copy samples the same moments, shifted by the trim,
+and a copy short enough to get a finer interval still holds every other sample.
+
+FingerprintIndex keeps the fingerprints of everything published and finds
+videos sharing frames within a Hamming radius with multi-index hashing: each
+hash is split into 16-bit chunks and, by the pigeonhole principle, a hash
+within the radius matches at least one chunk within radius / chunks bits.
+Chunks live in sorted NumPy arrays, so a lookup is a batch of binary searches.
+"""
+import time
+import sqlite3
+import threading
+from dataclasses import dataclass
+from itertools import combinations
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from .sampling import duration_of, read_at
+
+# Frames are hashed from a HASH_SIZE x HASH_SIZE grayscale thumbnail
+_HASH_SIZE = 32
+_LOW_FREQUENCIES = 8  # 8 x 8 DCT coefficients make the 64 bits
+
+# Fades and blank frames hash alike in every video and are left out
+_MIN_FRAME_CONTRAST = 0.02
+
+_CHUNKS = 4
+_CHUNK_BITS = 64 // _CHUNKS
+
+# Hashes added since the chunk tables were built are compared one by one up to this many
+_REBUILD_THRESHOLD = 4096
+
+
+def _dct_matrix(size: int) -> np.ndarray:
+    """Orthonormal DCT-II matrix."""
+    k = np.arange(size)[:, None]
+    n = np.arange(size)[None, :]
+    matrix = np.cos(np.pi * (2 * n + 1) * k / (2 * size)) * np.sqrt(2.0 / size)
+    matrix[0] /= np.sqrt(2.0)
+    return matrix.astype(np.float32)
+
+
+_DCT = _dct_matrix(_HASH_SIZE)[:_LOW_FREQUENCIES]
+
+_POPCOUNT8 = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+def popcount(values: np.ndarray) -> np.ndarray:
+    """Set bits of each uint64."""
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(values)
+    values = np.ascontiguousarray(values, dtype=np.uint64)
+    return _POPCOUNT8[values.view(np.uint8)].reshape(-1, 8).sum(axis=1).reshape(values.shape)
+
+
+def frame_hashes(frames: np.ndarray) -> np.ndarray:
+    """
+    pHash of a stack of frames.
+
+    Args:
+        frames: Array of shape (N, 32, 32), grayscale values in [0, 1].
+
+    Returns:
+        Array of N uint64 hashes.
+    """
+    coefficients = (_DCT @ frames @ _DCT.T).reshape(len(frames), -1)
+    # The DC term only says how bright the frame is
+    median = np.median(coefficients[:, 1:], axis=1, keepdims=True)
+    bits = np.packbits(coefficients > median, axis=1)
+    return bits.view('>u8').ravel().astype(np.uint64)
+
+
+def sample_interval(duration: float, interval: float = 1.0, max_frames: int = 64) -> float:
+    """Smallest of interval, 2 * interval, 4 * interval... taking at most max_frames samples of the video."""
+    step = interval
+    while duration / step > max(1, max_frames):
+        step *= 2
+    return step
+
+
+def fingerprint(video_path: str, interval: float = 1.0, max_frames: int = 64) -> np.ndarray:
+    """
+    Perceptual fingerprint of a video: hashes of at most max_frames frames spread over
+    the whole video, every `interval` seconds from the start (or a power of two times that).
+
+    Returns:
+        Array of uint64 frame hashes, empty if no usable frame could be read.
+    """
+    capture = cv2.VideoCapture(video_path)
+    try:
+        if not capture.isOpened():
+            return np.empty(0, dtype=np.uint64)
+        duration = duration_of(capture)
+        times = np.arange(0.0, duration, sample_interval(duration, interval, max_frames)) if duration > 0 else [0.0]
+        thumbnails = []
+        for time_ in times:
+            frame = read_at(capture, float(time_))
+            if frame is None:
+                continue
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            thumbnails.append(cv2.resize(gray, (_HASH_SIZE, _HASH_SIZE), interpolation=cv2.INTER_AREA))
+    finally:
+        capture.release()
+    if not thumbnails:
+        return np.empty(0, dtype=np.uint64)
+    stack = np.stack(thumbnails).astype(np.float32) / 255.0
+    stack = stack[stack.std(axis=(1, 2)) >= _MIN_FRAME_CONTRAST]
+    return frame_hashes(stack) if len(stack) else np.empty(0, dtype=np.uint64)
+
+
+@dataclass
+class DuplicateMatch:
+    """A published video sharing frames with the one checked."""
+
+    content_hash: str
+    label: Optional[str]      # What it was published as (file name)
+    published_at: float
+    similarity: float         # Share of the shorter video's frames found in the other
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS fingerprints (
+    id INTEGER PRIMARY KEY,
+    content_hash TEXT NOT NULL UNIQUE,
+    label TEXT,
+    hashes BLOB NOT NULL,
+    published_at REAL NOT NULL
+);
+"""
+
+
+class FingerprintIndex:
+    """
+    Fingerprints of published videos, stored in SQLite and searched in memory.
+
+    The index is loaded on the first query; rows written since by other processes
+    are picked up on every query.
+    """
+
+    def __init__(self, db_path: str = "data/fingerprints/index.db", radius: int = 8, threshold: float = 0.5):
+        """
+        Args:
+            radius: Largest Hamming distance between two hashes of the same frame.
+            threshold: Share of frames in common from which two videos are near-duplicates.
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.radius = radius
+        self.threshold = threshold
+        self._local = threading.local()
+        self._connect().executescript(_SCHEMA)
+
+        self._lock = threading.Lock()
+        self._last_id = 0
+        self._videos: List[Tuple[str, Optional[str], float, int]] = []  # (content_hash, label, published_at, frames)
+        self._known: Dict[str, int] = {}
+        self._hashes = np.empty(0, dtype=np.uint64)
+        self._owners = np.empty(0, dtype=np.int64)     # Video of each hash
+        self._tables: List[Tuple[np.ndarray, np.ndarray]] = []  # Per chunk: (sorted chunk values, hash indices)
+        self._indexed = 0  # Hashes covered by the tables
+        sub_radius = radius // _CHUNKS
+        self._masks = np.array([sum(1 << bit for bit in bits)
+                                for r in range(sub_radius + 1)
+                                for bits in combinations(range(_CHUNK_BITS), r)], dtype=np.uint64)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Get the calling thread's connection, opening it if needed."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def add(self, content_hash: str, hashes: np.ndarray, label: Optional[str] = None):
+        """Record the fingerprint of a published video (once per content hash)."""
+        if len(hashes) == 0:
+            return
+        self._connect().execute(
+            "INSERT OR IGNORE INTO fingerprints (content_hash, label, hashes, published_at) VALUES (?, ?, ?, ?)",
+            (content_hash, label, np.asarray(hashes, dtype='<u8').tobytes(), time.time())
+        )
+
+    def query(self, hashes: np.ndarray, exclude: Optional[str] = None) -> List[DuplicateMatch]:
+        """
+        Published videos that are near-duplicates of a fingerprint, most similar first.
+
+        Args:
+            exclude: Content hash to leave out (the video itself, republished elsewhere).
+        """
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        if len(hashes) == 0:
+            return []
+        with self._lock:
+            self._refresh()
+            query_index, hash_index = self._candidates(hashes)
+            # Frames of the query found in each video, each counted once per video
+            pairs = np.unique(self._owners[hash_index] * len(hashes) + query_index)
+            owners, matched = np.unique(pairs // len(hashes), return_counts=True)
+            videos = [self._videos[owner] for owner in owners]
+
+        matches = []
+        for (content_hash, label, published_at, frames), count in zip(videos, matched):
+            similarity = count / min(len(hashes), frames)
+            if content_hash != exclude and similarity >= self.threshold:
+                matches.append(DuplicateMatch(content_hash, label, published_at, float(min(similarity, 1.0))))
+        return sorted(matches, key=lambda match: match.similarity, reverse=True)
+
+    def _candidates(self, hashes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """(query hash index, indexed hash index) of every pair within the radius."""
+        query_parts, hash_parts = [], []
+        chunks = [(hashes >> np.uint64(c * _CHUNK_BITS)) & np.uint64(0xFFFF) for c in range(_CHUNKS)]
+        for chunk, (values, order) in zip(chunks, self._tables):
+            keys = (chunk[:, None] ^ self._masks[None, :]).ravel()
+            low = np.searchsorted(values, keys, side='left')
+            counts = np.searchsorted(values, keys, side='right') - low
+            total = int(counts.sum())
+            if not total:
+                continue
+            # Expand each [low, low + count) range into its positions
+            starts = np.repeat(low - np.cumsum(counts) + counts, counts)
+            query_parts.append(np.repeat(np.arange(len(keys)) // len(self._masks), counts))
+            hash_parts.append(order[starts + np.arange(total)])
+        if self._indexed < len(self._hashes):
+            # Recent additions, not in the tables yet
+            recent = self._hashes[self._indexed:]
+            close = popcount(hashes[:, None] ^ recent[None, :]) <= self.radius
+            query_index, recent_index = np.nonzero(close)
+            query_parts.append(query_index)
+            hash_parts.append(recent_index + self._indexed)
+        if not query_parts:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+        query_index = np.concatenate(query_parts)
+        hash_index = np.concatenate(hash_parts)
+        # A chunk match only makes a candidate: check the whole hash
+        close = popcount(hashes[query_index] ^ self._hashes[hash_index]) <= self.radius
+        return query_index[close], hash_index[close]
+
+    def _refresh(self):
+        """Load fingerprints written since the last query, rebuilding the tables when enough piled up."""
+        rows = self._connect().execute(
+            "SELECT id, content_hash, label, hashes, published_at FROM fingerprints WHERE id > ? ORDER BY id",
+            (self._last_id,)
+        ).fetchall()
+        if rows:
+            new_hashes, new_owners = [], []
+            for row_id, content_hash, label, blob, published_at in rows:
+                self._last_id = row_id
+                if content_hash in self._known:
+                    continue
+                hashes = np.frombuffer(blob, dtype='<u8').astype(np.uint64)
+                self._known[content_hash] = len(self._videos)
+                new_owners.append(np.full(len(hashes), len(self._videos), dtype=np.int64))
+                new_hashes.append(hashes)
+                self._videos.append((content_hash, label, published_at, len(hashes)))
+            if new_hashes:
+                self._hashes = np.concatenate([self._hashes, *new_hashes])
+                self._owners = np.concatenate([self._owners, *new_owners])
+        if len(self._hashes) - self._indexed > _REBUILD_THRESHOLD or not self._tables:
+            self._rebuild()
+
+    def _rebuild(self):
+        self._tables = []
+        for c in range(_CHUNKS):
+            values = (self._hashes >> np.uint64(c * _CHUNK_BITS)) & np.uint64(0xFFFF)
+            order = np.argsort(values, kind='stable')
+            self._tables.append((values[order], order))
+        self._indexed = len(self._hashes)
+
+    def __contains__(self, content_hash: str) -> bool:
+        row = self._connect().execute("SELECT 1 FROM fingerprints WHERE content_hash = ?", (content_hash,)).fetchone()
+        return row is not None
+
+    def __len__(self) -> int:
+        """Number of fingerprinted videos."""
+        return self._connect().execute("SELECT COUNT(*) FROM fingerprints").fetchone()[0]
@@ -0,0 +1,71 @@
+"""
+Frame sampling shared by cover selection and reframing.
+
+Frames are read by seeking (no full decode) at evenly spaced times, leaving
+out the edges of the video, and analyzed as small grayscale copies.
+"""
+from typing import Iterator, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+# Frames are analyzed at this width; sharpness, exposure and saliency survive the downscale
+ANALYSIS_WIDTH = 320
+
+# Fades, intros and end cards live at the edges
+SAMPLE_START = 0.05
+SAMPLE_END = 0.95
+
+
+def duration_of(capture: 'cv2.VideoCapture') -> float:
+    """Duration in seconds from the container's frame count and rate, 0 if unknown."""
+    fps = capture.get(cv2.CAP_PROP_FPS) or 0.0
+    frame_count = capture.get(cv2.CAP_PROP_FRAME_COUNT) or 0.0
+    return frame_count / fps if fps > 0 else 0.0
+
+
+def sample_frames(capture: 'cv2.VideoCapture', samples: int) -> Iterator[Tuple[float, np.ndarray]]:
+    """
+    Frames read at `samples` evenly spaced times between SAMPLE_START and SAMPLE_END of the video.
+
+    Yields:
+        (time, BGR frame) for each frame that could be read, one full-size frame at a time.
+    """
+    duration = duration_of(capture)
+    if duration <= 0:
+        times = [0.0]
+    else:
+        times = np.linspace(duration * SAMPLE_START, duration * SAMPLE_END, max(1, samples))
+    for time in times:
+        frame = read_at(capture, float(time))
+        if frame is not None:
+            yield float(time), frame
+
+
+def read_at(capture: 'cv2.VideoCapture', time: float) -> Optional[np.ndarray]:
+    """Frame at `time` seconds, None if it cannot be read."""
+    capture.set(cv2.CAP_PROP_POS_MSEC, time * 1000.0)
+    ok, frame = capture.read()
+    return frame if ok else None
+
+
+def downscale_gray(frame: np.ndarray) -> np.ndarray:
+    """Grayscale copy of a BGR frame, at most ANALYSIS_WIDTH wide."""
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    height, width = gray.shape
+    if width > ANALYSIS_WIDTH:
+        gray = cv2.resize(gray, (ANALYSIS_WIDTH, max(1, round(height * ANALYSIS_WIDTH / width))),
+                          interpolation=cv2.INTER_AREA)
+    return gray
+
+
+def stack_gray(frames: List[np.ndarray]) -> np.ndarray:
+    """
+    Stack downscaled grayscale frames into an (N, H, W) array of values in [0, 1].
+
+    Portrait and landscape frames of one video share a size; frames are cropped
+    to the smallest in case a stream changes size.
+    """
+    height = min(f.shape[0] for f in frames)
+    width = min(f.shape[1] for f in frames)
+    return np.stack([f[:height, :width] for f in frames]).astype(np.float32) / 255.0
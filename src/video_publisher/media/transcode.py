@@ -0,0 +1,276 @@
+"""
+Platform-targeted transcoding.
+
+Platforms re-encode whatever they receive, so pushing a 4 GB ProRes master
+byte for byte only makes the upload slower. A TranscodeProfile describes the
+H.264/AAC rendition a platform gets; RenditionCache produces renditions with
+ffmpeg, a bounded number at a time, and keeps them on disk (keyed by content
+hash and profile) under a size quota.
+
+A profile with an aspect ratio also reframes: the rendition is cropped to that
+shape around the salient part of the frame (see derivatives), so a 16:9 master
+can feed vertical platforms and the reverse.
+"""
+import os
+import json
+import shutil
+import hashlib
+import threading
+import subprocess
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from ..core.cancellation import CancellationToken
+    from ..core.models import VideoMetadata
+
+GB = 1024 ** 3
+
+# Source bitrates up to this factor over the profile's are uploaded as they are
+_BITRATE_TOLERANCE = 1.5
+
+_POLL_INTERVAL = 0.5
+
+# Shape of the derivative made for a platform taking the other orientation
+ORIENTATION_ASPECT_RATIOS = {'vertical': 9 / 16, 'horizontal': 16 / 9}
+
+
+class TranscodeError(Exception):
+    """ffmpeg could not produce a rendition."""
+
+
+@dataclass(frozen=True)
+class TranscodeProfile:
+    """An H.264/AAC MP4 rendition: sizes are upper bounds, a smaller source is never upscaled."""
+
+    name: str
+    max_long_side: int = 1920           # Pixels; 1920 fits 1080p in either orientation
+    max_fps: float = 60
+    video_bitrate: int = 8_000_000      # Bits per second
+    audio_bitrate: int = 128_000
+    preset: str = "medium"              # x264 speed/size trade-off
+    aspect_ratio: Optional[float] = None  # Crop to this display aspect ratio, None to keep the source's
+
+    @property
+    def key(self) -> str:
+        """Identifies the profile's settings, so changing them never serves an old rendition."""
+        digest = hashlib.sha256(json.dumps(asdict(self), sort_keys=True).encode()).hexdigest()
+        return f"{self.name}-{digest[:12]}"
+
+    def reframed(self, aspect_ratio: float) -> 'TranscodeProfile':
+        """This profile, cropping to `aspect_ratio`."""
+        return replace(self, aspect_ratio=aspect_ratio)
+
+    def needs_transcode(self, video: 'VideoMetadata') -> bool:
+        """Whether uploading the source as is would send more (or other) than the platform needs."""
+        if self.aspect_ratio and abs(video.aspect_ratio - self.aspect_ratio) > 0.01:
+            return True
+        if video.codec is not None and video.codec != "h264":
+            return True
+        if max(video.width, video.height) > self.max_long_side:
+            return True
+        if video.fps and video.fps > self.max_fps + 0.5:
+            return True
+        limit = (self.video_bitrate + self.audio_bitrate) * _BITRATE_TOLERANCE
+        return bool(video.bitrate and video.bitrate > limit)
+
+    def project(self, video: 'VideoMetadata') -> 'VideoMetadata':
+        """Expected properties of the rendition of `video`, for pre-flight checks."""
+        width, height = video.width, video.height
+        if self.aspect_ratio:
+            width, height = crop_size(width, height, self.aspect_ratio)
+        scale = min(1.0, self.max_long_side / max(width, height))
+        width, height = int(width * scale) // 2 * 2, int(height * scale) // 2 * 2
+        bitrate = self.video_bitrate + self.audio_bitrate
+        if video.bitrate:
+            bitrate = min(bitrate, video.bitrate)
+        return video.model_copy(update={
+            'width': width,
+            'height': height,
+            'aspect_ratio': width / height,
+            'codec': "h264",
+            'fps': min(video.fps, self.max_fps) if video.fps else None,
+            'bitrate': bitrate,
+            'size': int(bitrate * video.duration / 8),
+            'rotation': 0,
+            'container': "mp4",
+        })
+
+    def ffmpeg_args(self, crop: Optional[Tuple[int, int, int, int]] = None) -> List[str]:
+        """
+        Encoding arguments, between the input and output file of the ffmpeg command.
+
+        Args:
+            crop: (x, y, width, height) window to reframe to, in display pixels of the
+                  source. Defaults to a centered window when the profile has an aspect ratio.
+        """
+        box = self.max_long_side
+        filters = []
+        if crop is not None:
+            x, y, width, height = crop
+            filters.append(f"crop={width}:{height}:{x}:{y}")
+        elif self.aspect_ratio:
+            ratio = f"{self.aspect_ratio:.6f}"
+            filters.append(f"crop='min(iw,ih*{ratio})':'min(ih,iw/{ratio})'")
+        # Fit within a box of max_long_side in both directions (orientation is kept), even sizes for yuv420p
+        filters.append(f"scale='min(iw,{box})':'min(ih,{box})':force_original_aspect_ratio=decrease")
+        filters.append("scale='trunc(iw/2)*2':'trunc(ih/2)*2'")
+        return [
+            '-map', '0:v:0', '-map', '0:a:0?',
+            '-vf', ','.join(filters),
+            '-fpsmax', f"{self.max_fps:g}",
+            '-c:v', 'libx264', '-preset', self.preset, '-profile:v', 'high', '-pix_fmt', 'yuv420p',
+            '-b:v', str(self.video_bitrate), '-maxrate', str(int(self.video_bitrate * 1.5)),
+            '-bufsize', str(self.video_bitrate * 2),
+            '-c:a', 'aac', '-b:a', str(self.audio_bitrate), '-ac', '2',
+            '-movflags', '+faststart',
+        ]
+
+
+def crop_size(width: int, height: int, aspect_ratio: float) -> Tuple[int, int]:
+    """Largest window of `aspect_ratio` fitting in width x height."""
+    if width / height > aspect_ratio:
+        return max(1, round(height * aspect_ratio)), height
+    return width, max(1, round(width / aspect_ratio))
+
+
+def find_ffmpeg() -> str:
+    """ffmpeg on the PATH, or the binary bundled with imageio-ffmpeg (installed with moviepy)."""
+    binary = shutil.which('ffmpeg')
+    if binary:
+        return binary
+    try:
+        import imageio_ffmpeg
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except Exception as e:
+        raise TranscodeError(f"ffmpeg not found: {e}") from e
+
+
+class RenditionCache:
+    """
+    Renditions on disk, keyed by (content hash, profile).
+
+    At most `workers` ffmpeg processes run at once across every publish of the
+    process; requests for a rendition that is being produced wait for it instead
+    of transcoding it twice. Beyond `quota` bytes the least recently used
+    renditions are deleted (uploads already reading one keep their open file).
+    """
+
+    def __init__(self, cache_dir: str = "data/cache/renditions", quota: int = 20 * GB, workers: int = 2,
+                 ffmpeg: Optional[str] = None):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.quota = quota
+        self.ffmpeg = ffmpeg
+        self._slots = threading.BoundedSemaphore(max(1, workers))
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+        # Reframing windows by (content hash, aspect ratio), shared by the profiles of one shape
+        self._windows: Dict[Tuple[str, float], Optional[Tuple[int, int, int, int]]] = {}
+
+    def path_for(self, content_hash: str, profile: TranscodeProfile) -> Path:
+        return self.cache_dir / f"{content_hash}-{profile.key}.mp4"
+
+    def get(self, video_path: str, profile: TranscodeProfile, content_hash: Optional[str] = None,
+            token: Optional['CancellationToken'] = None) -> str:
+        """
+        Path of the video's rendition for `profile`, transcoding it if it isn't cached.
+
+        Raises:
+            TranscodeError: ffmpeg failed.
+            UploadCancelled: `token` was cancelled while transcoding.
+        """
+        if content_hash is None:
+            from ..core.hashing import file_content_hash
+            content_hash = file_content_hash(video_path)
+        target = self.path_for(content_hash, profile)
+        with self._lock:
+            key_lock = self._key_locks.setdefault(str(target), threading.Lock())
+
+        with key_lock:
+            if target.exists():
+                os.utime(target)  # Most recently used
+                return str(target)
+            with self._slots:
+                if token is not None:
+                    token.raise_if_cancelled()
+                crop = self._window(video_path, profile, content_hash)
+                print(f"🎞️  Transcoding {Path(video_path).name} for {profile.name}...")
+                self._transcode(video_path, profile, target, token, crop)
+        self._evict(keep=target)
+        return str(target)
+
+    def _window(self, video_path: str, profile: TranscodeProfile,
+                content_hash: str) -> Optional[Tuple[int, int, int, int]]:
+        """Crop window of a reframing profile; None for a centered crop, or no crop at all."""
+        if not profile.aspect_ratio:
+            return None
+        key = (content_hash, round(profile.aspect_ratio, 4))
+        with self._lock:
+            if key in self._windows:
+                return self._windows[key]
+        try:
+            from .derivatives import reframe_window
+            window = reframe_window(video_path, profile.aspect_ratio)
+        except Exception as e:
+            print(f"⚠️  Could not find where to crop {Path(video_path).name}, cropping the center: {e}")
+            window = None
+        with self._lock:
+            self._windows[key] = window
+        return window
+
+    def _transcode(self, video_path: str, profile: TranscodeProfile, target: Path,
+                   token: Optional['CancellationToken'], crop: Optional[Tuple[int, int, int, int]] = None):
+        temp_path = target.with_name(f"{target.stem}.{os.getpid()}.{threading.get_ident()}.tmp.mp4")
+        command = [self.ffmpeg or find_ffmpeg(), '-nostdin', '-v', 'error', '-y', '-i', video_path,
+                   *profile.ffmpeg_args(crop), str(temp_path)]
+        process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        try:
+            while True:
+                try:
+                    _, stderr = process.communicate(timeout=_POLL_INTERVAL)
+                    break
+                except subprocess.TimeoutExpired:
+                    if token is not None and token.cancelled:
+                        process.kill()
+                        process.communicate()
+                        token.raise_if_cancelled()
+            if process.returncode != 0:
+                message = stderr.decode('utf-8', 'replace').strip().splitlines()
+                raise TranscodeError(f"ffmpeg exited with {process.returncode}: {message[-1] if message else ''}")
+            os.replace(temp_path, target)
+        finally:
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+            if temp_path.exists():
+                temp_path.unlink()
+
+    def _evict(self, keep: Path):
+        """Delete the least recently used renditions until the cache fits its quota."""
+        with self._lock:
+            entries = []
+            for path in self.cache_dir.glob("*.mp4"):
+                if '.tmp' in path.suffixes:
+                    continue
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+                if total <= self.quota:
+                    break
+                if path == keep:
+                    continue
+                try:
+                    path.unlink()
+                    total -= size
+                except OSError:
+                    pass
+
+    def size(self) -> int:
+        """Bytes used by cached renditions."""
+        return sum(path.stat().st_size for path in self.cache_dir.glob("*.mp4") if '.tmp' not in path.suffixes)
@@ -5,7 +5,6 @@ import json
 from pathlib import Path
 from datetime import datetime, timezone
 from typing import Dict, Any, Optional
-from jsonschema import validate, ValidationError
 
 from .schema import METADATA_SCHEMA, PLATFORM_FIELDS, DEFAULT_VALUES
 
@@ -43,6 +42,8 @@ def validate_metadata(metadata: Dict[str, Any]) -> tuple[bool, Optional[str]]:
     Returns:
         Tuple of (is_valid, error_message)
     """
+    # jsonschema is only imported when something is actually validated
+    from jsonschema import validate, ValidationError
     try:
         validate(instance=metadata, schema=METADATA_SCHEMA)
         return True, None
@@ -169,7 +170,6 @@ import json
 from pathlib import Path
 from datetime import datetime, timezone
 from typing import Dict, Any, Optional
-from jsonschema import validate, ValidationError
 
 from .schema import METADATA_SCHEMA, PLATFORM_FIELDS, DEFAULT_VALUES
 
@@ -207,6 +207,8 @@ def validate_metadata(metadata: Dict[str, Any]) -> tuple[bool, Optional[str]]:
     Returns:
         Tuple of (is_valid, error_message)
     """
+    # jsonschema is only imported when something is actually validated
+    from jsonschema import validate, ValidationError
     try:
         validate(instance=metadata, schema=METADATA_SCHEMA)
         return True, None
@@ -39,6 +39,11 @@ METADATA_SCHEMA = {
             "enum": ["public", "private", "unlisted"],
             "description": "Privacy setting"
         },
+        "account": {
+            "type": ["string", "object"],
+            "additionalProperties": {"type": "string"},
+            "description": "Account to publish with: one name for all platforms, or a platform -> account mapping"
+        },
         "metadata_generated_at": {
             "type": "string",
             "description": "Timestamp when metadata was generated"
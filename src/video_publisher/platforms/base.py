@@ -1,11 +1,16 @@
 from abc import ABC, abstractmethod
 from typing import Optional
 from ..core.models import UploadResult
+from ..core.cancellation import CancellationToken, current_token
 
 class BasePlatform(ABC):
     """
     Abstract base class for all platform uploaders.
     Each platform must implement authentication and upload logic.
+
+    Uploads can be cancelled while they run. The engine makes the upload's
+    CancellationToken current around upload(); implementations should wait with
+    self.sleep() instead of time.sleep() and call self.check_cancelled() between steps.
     """
     
     def __init__(self, config: Optional[dict] = None):
@@ -48,3 +53,16 @@ class BasePlatform(ABC):
             UploadResult object with upload status and URL.
         """
         pass
+
+    @property
+    def cancel_token(self) -> CancellationToken:
+        """Cancellation token of the upload running on the calling thread."""
+        return current_token() or CancellationToken()
+
+    def sleep(self, seconds: float) -> None:
+        """Sleep, raising UploadCancelled as soon as the current upload is cancelled."""
+        self.cancel_token.sleep(seconds)
+
+    def check_cancelled(self) -> None:
+        """Raise UploadCancelled if the current upload was cancelled."""
+        self.cancel_token.raise_if_cancelled()
@@ -1,7 +1,7 @@
 import os
-import time
 import random
 import pickle
+import threading
 from pathlib import Path
 from typing import Optional
 from selenium.webdriver.common.by import By
@@ -12,6 +12,7 @@ from selenium.common.exceptions import TimeoutException, NoSuchElementException
 import undetected_chromedriver as uc
 
 from ..base import BasePlatform
+from ..session_pool import BrowserSessionPool
 from ...core.models import UploadResult, Platform
 
 class InstagramUploader(BasePlatform):
@@ -31,10 +32,34 @@ class InstagramUploader(BasePlatform):
         if not cookie_path.parent.exists():
             cookie_path.parent.mkdir(parents=True, exist_ok=True)
         
+        # Each thread works on its own driver: either one checked out from the pool
+        # during upload(), or one created directly by authenticate()
+        self._local = threading.local()
         self.driver = None
         
+        # Warm, logged-in browsers shared by concurrent uploads
+        self.session_pool = BrowserSessionPool(
+            create_driver=self._create_driver,
+            login=self._login_session,
+            max_size=self.config.get('pool_size', 2),
+            idle_timeout=self.config.get('pool_idle_timeout', 600)
+        )
+    
+    @property
+    def driver(self):
+        """The driver used by the calling thread."""
+        return getattr(self._local, 'driver', None)
+    
+    @driver.setter
+    def driver(self, value):
+        self._local.driver = value
+        
     def _init_driver(self):
         """Initialize undetected Chrome driver."""
+        self.driver = self._create_driver()
+    
+    def _create_driver(self):
+        """Launch a new undetected Chrome driver."""
         options = uc.ChromeOptions()
         if self.headless:
             options.add_argument('--headless')
@@ -52,11 +77,19 @@ class InstagramUploader(BasePlatform):
         }
         options.add_experimental_option("prefs", prefs)
         
-        self.driver = uc.Chrome(options=options, version_main=142)
+        return uc.Chrome(options=options, version_main=142)
+    
+    def _login_session(self, driver):
+        """Authenticate a freshly launched pool driver."""
+        self.driver = driver
+        try:
+            self.authenticate()
+        finally:
+            self.driver = None
         
     def _human_delay(self, min_seconds=1, max_seconds=3):
         """Simulate human-like delay."""
-        time.sleep(random.uniform(min_seconds, max_seconds))
+        self.sleep(random.uniform(min_seconds, max_seconds))
     
     def _save_cookies(self):
         """Save cookies for session persistence."""
@@ -109,13 +142,13 @@ class InstagramUploader(BasePlatform):
                 # Enter credentials with human-like typing
                 for char in self.username:
                     username_input.send_keys(char)
-                    time.sleep(random.uniform(0.1, 0.3))
+                    self.sleep(random.uniform(0.1, 0.3))
                 
                 self._human_delay()
                 
                 for char in self.password:
                     password_input.send_keys(char)
-                    time.sleep(random.uniform(0.1, 0.3))
+                    self.sleep(random.uniform(0.1, 0.3))
                 
                 self._human_delay()
                 
@@ -124,7 +157,7 @@ class InstagramUploader(BasePlatform):
                 login_button.click()
                 
                 # Wait for login to complete
-                time.sleep(5)
+                self.sleep(5)
                 
                 if self._is_logged_in():
                     print("Login successful!")
@@ -178,6 +211,19 @@ class InstagramUploader(BasePlatform):
         Returns:
             UploadResult object.
         """
+        if self.driver:
+            return self._upload(video_path, metadata)
+        
+        # Check out an isolated, already logged-in browser for this upload
+        with self.session_pool.session(cancel_token=self.cancel_token) as driver:
+            self.driver = driver
+            try:
+                return self._upload(video_path, metadata)
+            finally:
+                self.driver = None
+    
+    def _upload(self, video_path: str, metadata: dict) -> UploadResult:
+        """Run the upload flow on the current thread's driver."""
         if not self.is_authenticated():
             self.authenticate()
         
@@ -314,7 +360,7 @@ class InstagramUploader(BasePlatform):
             
             # Wait for video to process
             print("Waiting for video to process...")
-            time.sleep(5)
+            self.sleep(5)
             
             # Wait for "Crop" dialog to appear
             print("Waiting for crop dialog...")
@@ -696,7 +742,7 @@ class InstagramUploader(BasePlatform):
                     except:
                         pass
                         
-                    time_module.sleep(2)
+                    self.sleep(2)
                 
                 if confirmed:
                     print("✅ Upload verified successfully!")
@@ -738,7 +784,7 @@ class InstagramUploader(BasePlatform):
             )
         finally:
             # DO NOT close driver here to allow browser reuse for batch uploads
-            # engine.py or get_publisher handles the singleton/persistent instance
+            # upload() checks it back into the session pool
             pass
 
     def __del__(self):
@@ -746,8 +792,10 @@ class InstagramUploader(BasePlatform):
         self.close()
 
     def close(self):
-        """Close the browser."""
-        if self.driver:
+        """Close this thread's browser and every pooled browser."""
+        if getattr(self, 'session_pool', None):
+            self.session_pool.close()
+        if getattr(self, '_local', None) and self.driver:
             try:
                 self.driver.quit()
             except:
@@ -0,0 +1,193 @@
+"""
+Platform plugins, discovered through package entry points.
+
+A plugin describes an upload backend: its name, capabilities, concurrency and
+rate limits, and where its uploader class lives. The uploader module is only
+imported when the platform is actually used, so a process never pays for the
+dependencies (selenium, API clients) of backends it does not touch.
+
+Third-party packages register plugins in the `video_publisher.platforms` group:
+
+    [project.entry-points."video_publisher.platforms"]
+    vimeo = "my_package.vimeo_plugin:PLUGIN"
+
+The entry point must resolve to a PlatformPlugin (or a callable returning one)
+and should live in a lightweight module that does not import the uploader.
+"""
+import importlib
+import threading
+from dataclasses import dataclass, field
+from importlib.metadata import entry_points
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+from ..core.compliance import GB, PlatformSpec
+from ..media.transcode import TranscodeProfile
+
+ENTRY_POINT_GROUP = "video_publisher.platforms"
+
+
+@dataclass(frozen=True)
+class PlatformPlugin:
+    """Declaration of an upload backend."""
+
+    name: str                                   # Platform identifier, e.g. "youtube"
+    uploader: str                               # "module:Class" of the BasePlatform subclass
+    display_name: str = ""
+    auth_method: str = ""
+    supported_formats: Tuple[str, ...] = ()     # Human readable, for listings
+    orientations: Tuple[str, ...] = ()          # "horizontal" / "vertical" videos it is routed
+    capabilities: FrozenSet[str] = frozenset()  # Metadata features it honours ("schedule", "privacy", ...)
+    uses_browser: bool = False                  # Browser automation: gets the session pool config
+    max_concurrency: Optional[int] = None       # Simultaneous uploads per account, None for no limit
+    daily_limit: int = 5                        # Default uploads per day and account
+    auto_route: bool = False                    # Picked automatically when no platforms are given
+    alias_of: Optional[str] = None              # Shares the uploader of another platform
+    spec: Optional[PlatformSpec] = None         # What the platform accepts, checked before uploading
+    transcode: Optional[TranscodeProfile] = None  # Rendition uploaded instead of the source (TRANSCODE setting)
+    config: Dict[str, Any] = field(default_factory=dict, compare=False)  # Extra uploader config
+
+    def load(self) -> type:
+        """Import and return the uploader class."""
+        module_name, class_name = self.uploader.split(':')
+        return getattr(importlib.import_module(module_name), class_name)
+
+
+class PluginRegistry:
+    """
+    Platform plugins by name. Built-in plugins are always available (also in source
+    checkouts without installed metadata); entry points add new platforms or replace
+    built-in ones of the same name. Discovery runs once, on first access.
+    """
+
+    def __init__(self, builtin: Optional[List[PlatformPlugin]] = None, group: str = ENTRY_POINT_GROUP):
+        self.group = group
+        self._builtin = list(builtin or [])
+        self._plugins: Optional[Dict[str, PlatformPlugin]] = None
+        self._lock = threading.Lock()
+
+    def _discover(self) -> Dict[str, PlatformPlugin]:
+        plugins = {plugin.name: plugin for plugin in self._builtin}
+        for entry_point in entry_points(group=self.group):
+            try:
+                plugin = entry_point.load()
+                if callable(plugin) and not isinstance(plugin, PlatformPlugin):
+                    plugin = plugin()
+                if not isinstance(plugin, PlatformPlugin):
+                    raise TypeError(f"expected a PlatformPlugin, got {type(plugin).__name__}")
+            except Exception as e:
+                print(f"⚠️  Could not load platform plugin '{entry_point.name}': {e}")
+                continue
+            plugins[plugin.name] = plugin
+        return plugins
+
+    def _all(self) -> Dict[str, PlatformPlugin]:
+        if self._plugins is None:
+            with self._lock:
+                if self._plugins is None:
+                    self._plugins = self._discover()
+        return self._plugins
+
+    def register(self, plugin: PlatformPlugin):
+        """Register (or replace) a plugin at runtime."""
+        plugins = self._all()
+        with self._lock:
+            self._plugins = {**plugins, plugin.name: plugin}
+
+    def get(self, name: Any) -> Optional[PlatformPlugin]:
+        """Plugin for a platform name or Platform member."""
+        return self._all().get(getattr(name, 'value', name))
+
+    def names(self) -> List[str]:
+        """Names of every registered platform."""
+        return list(self._all())
+
+    def plugins(self) -> List[PlatformPlugin]:
+        return list(self._all().values())
+
+    def primary(self) -> List[PlatformPlugin]:
+        """Plugins with their own uploader, i.e. not aliases of another platform."""
+        return [plugin for plugin in self.plugins() if plugin.alias_of is None]
+
+    def __contains__(self, name: object) -> bool:
+        return getattr(name, 'value', name) in self._all()
+
+
+# Built-in backends, also declared as entry points in pyproject.toml
+YOUTUBE = PlatformPlugin(
+    name="youtube",
+    uploader="video_publisher.platforms.youtube.uploader:YouTubeUploader",
+    display_name="YouTube",
+    auth_method="OAuth2",
+    supported_formats=("horizontal", "vertical (shorts)"),
+    orientations=("horizontal",),
+    capabilities=frozenset({"privacy", "schedule", "tags", "category"}),
+    max_concurrency=3,
+    daily_limit=6,  # Conservative limit for free tier
+    auto_route=True,
+    # Unverified channels are limited to 15 minutes; verified ones to 12 hours
+    spec=PlatformSpec(max_duration=12 * 3600, max_size=256 * GB),
+    # Recommended upload settings for 1080p
+    transcode=TranscodeProfile("youtube", video_bitrate=12_000_000, audio_bitrate=192_000)
+)
+
+YOUTUBE_SHORTS = PlatformPlugin(
+    name="youtube_shorts",
+    uploader=YOUTUBE.uploader,
+    display_name="YouTube Shorts",
+    auth_method=YOUTUBE.auth_method,
+    supported_formats=("vertical",),
+    orientations=("vertical",),
+    capabilities=YOUTUBE.capabilities,
+    max_concurrency=YOUTUBE.max_concurrency,
+    daily_limit=6,
+    auto_route=True,
+    alias_of="youtube",
+    # Longer or horizontal videos are published as regular videos
+    spec=PlatformSpec(max_duration=180, max_size=256 * GB, max_aspect_ratio=1.0),
+    transcode=YOUTUBE.transcode
+)
+
+TIKTOK = PlatformPlugin(
+    name="tiktok",
+    uploader="video_publisher.platforms.tiktok.uploader:TikTokUploader",
+    display_name="TikTok",
+    auth_method="Browser Session",
+    supported_formats=("vertical",),
+    orientations=("vertical",),
+    capabilities=frozenset({"schedule", "tags", "thumbnail"}),
+    uses_browser=True,
+    max_concurrency=2,
+    daily_limit=4,  # To avoid spam detection
+    auto_route=True,
+    spec=PlatformSpec(min_duration=3, max_duration=60 * 60, max_size=10 * GB, min_resolution=360,
+                      codecs=frozenset({"h264", "hevc", "vp8", "vp9"}), max_fps=60),
+    transcode=TranscodeProfile("tiktok", video_bitrate=6_000_000)
+)
+
+INSTAGRAM = PlatformPlugin(
+    name="instagram",
+    uploader="video_publisher.platforms.instagram.uploader:InstagramUploader",
+    display_name="Instagram",
+    auth_method="Browser Session",
+    supported_formats=("vertical (reels)",),
+    orientations=("vertical",),
+    capabilities=frozenset({"tags", "thumbnail"}),
+    uses_browser=True,
+    max_concurrency=2,
+    daily_limit=4,  # To avoid action blocks
+    auto_route=True,
+    # Reels: 9:16 up to square
+    spec=PlatformSpec(min_duration=3, max_duration=15 * 60, max_size=4 * GB, min_resolution=320,
+                      min_aspect_ratio=0.5, max_aspect_ratio=1.0, codecs=frozenset({"h264", "hevc"}), max_fps=60),
+    transcode=TranscodeProfile("instagram", max_fps=30, video_bitrate=5_000_000)
+)
+
+# Registration order is the order platforms are routed and listed in
+BUILTIN_PLUGINS = [YOUTUBE, TIKTOK, INSTAGRAM, YOUTUBE_SHORTS]
+
+plugins = PluginRegistry(BUILTIN_PLUGINS)
+
+
+def get_plugin(platform: Any) -> Optional[PlatformPlugin]:
+    """Plugin for a platform name or Platform member, None if no backend provides it."""
+    return plugins.get(platform)
@@ -0,0 +1,85 @@
+"""
+Registry of platform uploaders, created on first use.
+"""
+import threading
+from typing import Callable, Dict, Iterator, MutableMapping
+from ..core.models import Platform
+from .base import BasePlatform
+
+
+class UploaderRegistry(MutableMapping):
+    """
+    Maps platforms to uploaders, constructing each uploader the first time it is requested.
+
+    Building an uploader can be expensive (loading tokens, refreshing credentials,
+    building API clients), so nothing is built for platforms a run never touches.
+    `platform in registry` only checks registration and never builds anything.
+    """
+
+    def __init__(self, factories: Dict[Platform, Callable[[], BasePlatform]] = None):
+        """
+        Args:
+            factories: Callables returning the uploader for each platform.
+        """
+        self._factories: Dict[Platform, Callable[[], BasePlatform]] = dict(factories or {})
+        self._instances: Dict[Platform, BasePlatform] = {}
+        self._locks: Dict[Platform, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def register(self, platform: Platform, factory: Callable[[], BasePlatform]):
+        """Register (or replace) the factory for a platform. An already built uploader is discarded."""
+        with self._lock:
+            self._factories[platform] = factory
+            self._instances.pop(platform, None)
+
+    def alias(self, platform: Platform, target: Platform):
+        """Make a platform share the uploader of another one (e.g. YouTube Shorts and YouTube)."""
+        self.register(platform, lambda: self[target])
+
+    def is_loaded(self, platform: Platform) -> bool:
+        """Check whether a platform's uploader has been built."""
+        return platform in self._instances
+
+    def loaded(self) -> Dict[Platform, BasePlatform]:
+        """Uploaders built so far."""
+        with self._lock:
+            return dict(self._instances)
+
+    def __getitem__(self, platform: Platform) -> BasePlatform:
+        uploader = self._instances.get(platform)
+        if uploader is not None:
+            return uploader
+
+        with self._lock:
+            if platform not in self._factories and platform not in self._instances:
+                raise KeyError(platform)
+            # One lock per platform: building YouTube doesn't hold up TikTok
+            platform_lock = self._locks.setdefault(platform, threading.Lock())
+
+        with platform_lock:
+            uploader = self._instances.get(platform)
+            if uploader is None:
+                uploader = self._factories[platform]()
+                with self._lock:
+                    self._instances[platform] = uploader
+            return uploader
+
+    def __setitem__(self, platform: Platform, uploader: BasePlatform):
+        with self._lock:
+            self._instances[platform] = uploader
+
+    def __delitem__(self, platform: Platform):
+        with self._lock:
+            if platform not in self._factories and platform not in self._instances:
+                raise KeyError(platform)
+            self._factories.pop(platform, None)
+            self._instances.pop(platform, None)
+
+    def __contains__(self, platform: object) -> bool:
+        return platform in self._factories or platform in self._instances
+
+    def __iter__(self) -> Iterator[Platform]:
+        return iter(list(dict.fromkeys([*self._factories, *self._instances])))
+
+    def __len__(self) -> int:
+        return len(set(self._factories) | set(self._instances))
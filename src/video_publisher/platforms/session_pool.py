@@ -0,0 +1,261 @@
+"""
+Pool of warm, logged-in browser sessions for the browser-automated platforms.
+"""
+import time
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Iterator, Optional, Set, Tuple
+
+from ..core.cancellation import CancellationToken
+
+
+class BrowserSessionPool:
+    """
+    Keeps pre-launched, authenticated Chrome drivers for one platform account.
+
+    Drivers are checked out for the duration of an upload and checked back in
+    afterwards, so concurrent uploads each get an isolated browser without paying
+    the launch and login cost every time.
+    """
+
+    def __init__(
+        self,
+        create_driver: Callable[[], Any],
+        login: Callable[[Any], None],
+        is_healthy: Optional[Callable[[Any], bool]] = None,
+        max_size: int = 2,
+        idle_timeout: float = 600.0
+    ):
+        """
+        Args:
+            create_driver: Launches a new driver.
+            login: Authenticates a freshly launched driver. Raises on failure.
+            is_healthy: Returns False if a driver is dead and must be replaced.
+            max_size: Maximum number of drivers alive at once (idle + checked out).
+            idle_timeout: Seconds an idle driver is kept before being quit.
+        """
+        self.create_driver = create_driver
+        self.login = login
+        self.is_healthy = is_healthy or self._default_health_check
+        self.max_size = max(1, max_size)
+        self.idle_timeout = idle_timeout
+
+        self._idle: Deque[Tuple[Any, float]] = deque()  # (driver, last_used)
+        self._in_use: Set[int] = set()
+        self._pending = 0  # drivers being launched
+        self._cond = threading.Condition()
+        self._closed = False
+        self._reaper: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _default_health_check(driver: Any) -> bool:
+        """A driver is healthy if the browser still answers basic commands."""
+        try:
+            driver.current_url
+            return bool(driver.window_handles)
+        except Exception:
+            return False
+
+    @staticmethod
+    def _quit(driver: Any):
+        """Quit a driver, ignoring errors from already-dead browsers."""
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    @property
+    def size(self) -> int:
+        """Number of drivers alive or being launched."""
+        with self._cond:
+            return len(self._idle) + len(self._in_use) + self._pending
+
+    def stats(self) -> dict:
+        """Get pool occupancy."""
+        with self._cond:
+            return {
+                'max_size': self.max_size,
+                'idle': len(self._idle),
+                'in_use': len(self._in_use),
+                'launching': self._pending
+            }
+
+    def acquire(self, timeout: Optional[float] = None, cancel_token: Optional[CancellationToken] = None) -> Any:
+        """
+        Check out a healthy, logged-in driver.
+
+        Args:
+            timeout: Seconds to wait for a free slot when the pool is full (None waits forever).
+            cancel_token: Stops waiting for a slot when cancelled.
+
+        Raises:
+            TimeoutError: If no driver became available in time.
+            UploadCancelled: If the token was cancelled while waiting.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        unregister = cancel_token.on_cancel(self._wake_waiters) if cancel_token else None
+        try:
+            return self._acquire(deadline, cancel_token)
+        finally:
+            if unregister:
+                unregister()
+
+    def _wake_waiters(self):
+        with self._cond:
+            self._cond.notify_all()
+
+    def _acquire(self, deadline: Optional[float], cancel_token: Optional[CancellationToken]) -> Any:
+        while True:
+            with self._cond:
+                if cancel_token:
+                    cancel_token.raise_if_cancelled()
+                if self._closed:
+                    raise RuntimeError("Browser session pool is closed")
+                expired = self._pop_expired_locked()
+                if not expired:
+                    if self._idle:
+                        # Most recently used first: it is the least likely to have been logged out
+                        driver, _ = self._idle.pop()
+                        self._in_use.add(id(driver))
+                        launch = False
+                    elif len(self._idle) + len(self._in_use) + self._pending < self.max_size:
+                        self._pending += 1
+                        launch = True
+                    else:
+                        remaining = None if deadline is None else deadline - time.monotonic()
+                        if remaining is not None and remaining <= 0:
+                            raise TimeoutError("No browser session available")
+                        self._cond.wait(remaining)
+                        continue
+
+            if expired:
+                # Quit outside the lock (it can take seconds), then look again
+                for stale in expired:
+                    self._quit(stale)
+                continue
+
+            if launch:
+                return self._launch()
+
+            if self.is_healthy(driver):
+                return driver
+
+            # Dead browser: drop it and try again
+            print("⚠️  Discarding unhealthy browser session")
+            self._quit(driver)
+            with self._cond:
+                self._in_use.discard(id(driver))
+                self._cond.notify()
+
+    def _launch(self) -> Any:
+        """Launch and log in a new driver for a slot already reserved in _pending."""
+        driver = None
+        try:
+            driver = self.create_driver()
+            self.login(driver)
+        except Exception:
+            if driver is not None:
+                self._quit(driver)
+            with self._cond:
+                self._pending -= 1
+                self._cond.notify()
+            raise
+
+        with self._cond:
+            self._pending -= 1
+            self._in_use.add(id(driver))
+        self._ensure_reaper()
+        return driver
+
+    def release(self, driver: Any, discard: bool = False):
+        """
+        Check a driver back in.
+
+        Args:
+            driver: Driver obtained from acquire().
+            discard: Quit the driver instead of keeping it (e.g. after a crash).
+        """
+        keep = not discard and not self._closed and self.is_healthy(driver)
+        with self._cond:
+            self._in_use.discard(id(driver))
+            if keep:
+                self._idle.append((driver, time.monotonic()))
+            self._cond.notify()
+        if not keep:
+            self._quit(driver)
+
+    @contextmanager
+    def session(self, timeout: Optional[float] = None,
+                cancel_token: Optional[CancellationToken] = None) -> Iterator[Any]:
+        """
+        Context manager that checks a driver out and back in.
+
+        If `cancel_token` is cancelled while the driver is checked out, the browser is
+        quit right away, so whatever is blocked on it fails fast, and it is not reused.
+        """
+        driver = self.acquire(timeout, cancel_token)
+        unregister = cancel_token.on_cancel(lambda: self._quit(driver)) if cancel_token else None
+        try:
+            yield driver
+        finally:
+            if unregister:
+                unregister()
+            # release() health-checks the driver, so a browser that crashed mid-upload is dropped
+            self.release(driver, discard=bool(cancel_token and cancel_token.cancelled))
+
+    def warm(self, count: int = 1):
+        """Pre-launch and log in up to `count` idle drivers."""
+        drivers = []
+        try:
+            for _ in range(min(count, self.max_size)):
+                with self._cond:
+                    if len(self._idle) + len(self._in_use) + self._pending >= self.max_size:
+                        break
+                    self._pending += 1
+                drivers.append(self._launch())
+        finally:
+            for driver in drivers:
+                self.release(driver)
+
+    def evict_idle(self) -> int:
+        """Quit drivers that have been idle longer than idle_timeout. Returns how many were quit."""
+        with self._cond:
+            expired = self._pop_expired_locked()
+        for driver in expired:
+            self._quit(driver)
+        return len(expired)
+
+    def _pop_expired_locked(self) -> list:
+        """Remove expired idle drivers from the pool (caller holds the lock and quits them)."""
+        cutoff = time.monotonic() - self.idle_timeout
+        expired = [driver for driver, last_used in self._idle if last_used < cutoff]
+        if expired:
+            self._idle = deque((d, t) for d, t in self._idle if t >= cutoff)
+            self._cond.notify_all()
+        return expired
+
+    def _ensure_reaper(self):
+        """Start the background idle-eviction thread once the first driver exists."""
+        with self._cond:
+            if self._reaper is not None:
+                return
+            self._reaper = threading.Thread(target=self._reap, name="browser-pool-reaper", daemon=True)
+            self._reaper.start()
+
+    def _reap(self):
+        """Evict idle drivers periodically so unused browsers don't linger."""
+        interval = max(1.0, self.idle_timeout / 2)
+        while not self._closed:
+            time.sleep(interval)
+            self.evict_idle()
+
+    def close(self):
+        """Quit all idle drivers and refuse further checkouts. Checked-out drivers are quit on release."""
+        with self._cond:
+            self._closed = True
+            idle = [driver for driver, _ in self._idle]
+            self._idle.clear()
+            self._cond.notify_all()
+        for driver in idle:
+            self._quit(driver)
@@ -1,7 +1,7 @@
 import os
-import time
 import random
 import pickle
+import threading
 from pathlib import Path
 from typing import Optional
 from selenium.webdriver.common.by import By
@@ -13,6 +13,7 @@ from selenium.common.exceptions import TimeoutException, NoSuchElementException
 import undetected_chromedriver as uc
 
 from ..base import BasePlatform
+from ..session_pool import BrowserSessionPool
 from ...core.models import UploadResult, Platform
 
 class TikTokUploader(BasePlatform):
@@ -30,10 +31,34 @@ class TikTokUploader(BasePlatform):
         if not cookie_path.parent.exists():
             cookie_path.parent.mkdir(parents=True, exist_ok=True)
         
+        # Each thread works on its own driver: either one checked out from the pool
+        # during upload(), or one created directly by authenticate()
+        self._local = threading.local()
         self.driver = None
         
+        # Warm, logged-in browsers shared by concurrent uploads
+        self.session_pool = BrowserSessionPool(
+            create_driver=self._create_driver,
+            login=self._login_session,
+            max_size=self.config.get('pool_size', 2),
+            idle_timeout=self.config.get('pool_idle_timeout', 600)
+        )
+    
+    @property
+    def driver(self):
+        """The driver used by the calling thread."""
+        return getattr(self._local, 'driver', None)
+    
+    @driver.setter
+    def driver(self, value):
+        self._local.driver = value
+        
     def _init_driver(self):
         """Initialize undetected Chrome driver."""
+        self.driver = self._create_driver()
+    
+    def _create_driver(self):
+        """Launch a new undetected Chrome driver."""
         options = uc.ChromeOptions()
         if self.headless:
             options.add_argument('--headless')
@@ -51,11 +76,19 @@ class TikTokUploader(BasePlatform):
         }
         options.add_experimental_option("prefs", prefs)
         
-        self.driver = uc.Chrome(options=options, version_main=142)
+        return uc.Chrome(options=options, version_main=142)
+    
+    def _login_session(self, driver):
+        """Authenticate a freshly launched pool driver."""
+        self.driver = driver
+        try:
+            self.authenticate()
+        finally:
+            self.driver = None
         
     def _human_delay(self, min_seconds=1, max_seconds=3):
         """Simulate human-like delay."""
-        time.sleep(random.uniform(min_seconds, max_seconds))
+        self.sleep(random.uniform(min_seconds, max_seconds))
     
     def _save_cookies(self):
         """Save cookies for session persistence."""
@@ -117,7 +150,7 @@ class TikTokUploader(BasePlatform):
             WebDriverWait(self.driver, 120).until(is_logged_in)
             print("Login successful!")
             # Wait a bit more for cookies to settle
-            time.sleep(3)
+            self.sleep(3)
             self._save_cookies()
         except TimeoutException:
             raise Exception("Login timeout. Please try again.")
@@ -142,7 +175,20 @@ class TikTokUploader(BasePlatform):
     def upload(self, video_path: str, metadata: dict) -> UploadResult:
         """
         Upload a video to TikTok.
+        Uses this thread's driver if it has one, otherwise checks one out of the session pool.
         """
+        if self.driver:
+            return self._upload(video_path, metadata)
+        
+        with self.session_pool.session(cancel_token=self.cancel_token) as driver:
+            self.driver = driver
+            try:
+                return self._upload(video_path, metadata)
+            finally:
+                self.driver = None
+    
+    def _upload(self, video_path: str, metadata: dict) -> UploadResult:
+        """Run the upload flow on the current thread's driver."""
         if not self.is_authenticated():
             self.authenticate()
         
@@ -185,7 +231,7 @@ class TikTokUploader(BasePlatform):
             
             # Wait for video to process
             print("Waiting for video to process...")
-            time.sleep(10)
+            self.sleep(10)
             
             # Add caption (TikTok uses 'description' as caption)
             caption = metadata.get('title') or metadata.get('description')
@@ -255,7 +301,7 @@ class TikTokUploader(BasePlatform):
                                     )
                                 else:
                                     caption_input.send_keys(char)
-                                time.sleep(random.uniform(0.02, 0.08))
+                                self.sleep(random.uniform(0.02, 0.08))
                             # Trigger input event
                             self.driver.execute_script("""
                                 arguments[0].dispatchEvent(new Event('input', {bubbles: true}));
@@ -586,7 +632,7 @@ class TikTokUploader(BasePlatform):
                     except Exception as e:
                         print(f"Error handling 'Continue to post?' modal: {e}")
                     
-                    time.sleep(5)
+                    self.sleep(5)
                     
                     return UploadResult(
                         platform=Platform.TIKTOK,
@@ -621,5 +667,15 @@ class TikTokUploader(BasePlatform):
     
     def __del__(self):
         """Clean up driver on deletion."""
-        if self.driver:
-            self.driver.quit()
+        self.close()
+    
+    def close(self):
+        """Close this thread's browser and every pooled browser."""
+        if getattr(self, 'session_pool', None):
+            self.session_pool.close()
+        if getattr(self, '_local', None) and self.driver:
+            try:
+                self.driver.quit()
+            except:
+                pass
+            self.driver = None
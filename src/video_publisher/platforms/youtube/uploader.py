@@ -1,8 +1,11 @@
 import os
 import pickle
+import threading
 from pathlib import Path
 from typing import Optional
+import httplib2
 from google.auth.transport.requests import Request
+from google_auth_httplib2 import AuthorizedHttp
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
@@ -11,6 +14,7 @@ from googleapiclient.http import MediaFileUpload
 
 from ..base import BasePlatform
 from ...core.models import UploadResult, Platform
+from ...core.cancellation import UploadCancelled
 
 # If modifying these scopes, delete the token.pickle file.
 SCOPES = ['https://www.googleapis.com/auth/youtube.upload']
@@ -31,30 +35,52 @@ class YouTubeUploader(BasePlatform):
             token_path.parent.mkdir(parents=True, exist_ok=True)
         
         self.creds: Optional[Credentials] = None
-        self.youtube = None
+        self._youtube = None
+        self._client_lock = threading.Lock()
+        self._local = threading.local()
         
-        # Load existing credentials if available
+        # Load existing credentials if available. Refreshing them and building the
+        # API client are deferred until the client is first needed.
         if os.path.exists(self.token_file):
             try:
                 with open(self.token_file, 'rb') as token:
                     self.creds = pickle.load(token)
-                # Build YouTube service if credentials are valid
-                if self.creds and self.creds.valid:
-                    self.youtube = build('youtube', 'v3', credentials=self.creds)
-                    print("✅ Loaded existing YouTube credentials")
-                # Refresh if expired
-                elif self.creds and self.creds.expired and self.creds.refresh_token:
+            except Exception as e:
+                print(f"⚠️  Warning: Could not load token file: {e}")
+                self.creds = None
+
+    @property
+    def youtube(self):
+        """YouTube API client, built on first access (refreshing expired credentials first)."""
+        with self._client_lock:
+            if self._youtube is None and self.creds:
+                if not self.creds.valid and self.creds.expired and self.creds.refresh_token:
                     print("Refreshing expired YouTube credentials...")
                     self.creds.refresh(Request())
-                    self.youtube = build('youtube', 'v3', credentials=self.creds)
                     # Save refreshed token
                     with open(self.token_file, 'wb') as token:
                         pickle.dump(self.creds, token)
                     print("✅ Refreshed YouTube credentials")
-            except Exception as e:
-                print(f"⚠️  Warning: Could not load token file: {e}")
-                self.creds = None
-                self.youtube = None
+                if self.creds.valid:
+                    self._youtube = build('youtube', 'v3', credentials=self.creds)
+                    print("✅ Loaded existing YouTube credentials")
+            return self._youtube
+
+    @youtube.setter
+    def youtube(self, client):
+        with self._client_lock:
+            self._youtube = client
+
+    def _thread_http(self) -> AuthorizedHttp:
+        """
+        HTTP transport for the calling thread.
+        httplib2 is not thread-safe, so concurrent uploads sharing this client each use their own.
+        """
+        http = getattr(self._local, 'http', None)
+        if http is None or http.credentials is not self.creds:
+            http = AuthorizedHttp(self.creds, http=httplib2.Http())
+            self._local.http = http
+        return http
         
     def authenticate(self) -> None:
         """
@@ -119,8 +145,11 @@ class YouTubeUploader(BasePlatform):
     def is_authenticated(self) -> bool:
         """
         Check if authenticated with YouTube.
+        Expired credentials that can be refreshed count as authenticated.
         """
-        return self.creds is not None and self.creds.valid
+        if self.creds is None:
+            return False
+        return self.creds.valid or bool(self.creds.expired and self.creds.refresh_token)
     
     def upload(self, video_path: str, metadata: dict) -> UploadResult:
         """
@@ -199,9 +228,11 @@ class YouTubeUploader(BasePlatform):
                 media_body=media
             )
             
+            # The resumable upload goes 1MB at a time; a cancelled upload stops at the next chunk
             response = None
             while response is None:
-                status, response = request.next_chunk()
+                self.check_cancelled()
+                status, response = request.next_chunk(http=self._thread_http())
                 if status:
                     progress = int(status.progress() * 100)
                     print(f"   Upload progress: {progress}%")
@@ -226,6 +257,9 @@ class YouTubeUploader(BasePlatform):
                 success=False,
                 error=error_msg
             )
+        except UploadCancelled:
+            print("⏹️  YouTube upload cancelled")
+            raise
         except Exception as e:
             error_msg = f"{type(e).__name__}: {str(e)}"
             print(f"❌ YouTube upload failed: {error_msg}")
@@ -1,9 +1,10 @@
 """
 Safety systems for Video Publisher.
-Includes rate limiting, risk detection, and emergency stop mechanisms.
+Includes rate limiting, risk detection, circuit breakers and emergency stop mechanisms.
 """
 from .rate_limiter import RateLimiter
 from .risk_detector import RiskDetector
 from .emergency_stop import EmergencyStop
+from .circuit_breaker import CircuitBreaker, CircuitBreakerRegistry, CircuitState
 
-__all__ = ['RateLimiter', 'RiskDetector', 'EmergencyStop']
+__all__ = ['RateLimiter', 'RiskDetector', 'EmergencyStop', 'CircuitBreaker', 'CircuitBreakerRegistry', 'CircuitState']
@@ -0,0 +1,169 @@
+import time
+import threading
+from collections import deque
+from enum import Enum
+from typing import Callable, Deque, Dict, Optional, Tuple
+from ..core.models import Platform
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"          # Uploads flow normally
+    OPEN = "open"              # Platform looks broken - fail fast until the cooldown ends
+    HALF_OPEN = "half_open"    # Cooldown over - a single probe upload decides
+
+class CircuitBreaker:
+    """
+    Circuit breaker for one platform account.
+
+    Tracks the failure rate of recent upload attempts. Once it crosses the threshold
+    the circuit opens and attempts fail immediately instead of launching a browser and
+    waiting out timeouts. After the cooldown one probe attempt is let through: success
+    closes the circuit, failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: float = 0.5, min_calls: int = 3, window: float = 600.0,
+                 cooldown: float = 300.0, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            failure_threshold: Failure rate (0-1) over the window that opens the circuit.
+            min_calls: Minimum attempts in the window before the rate is considered.
+            window: Seconds of history used to compute the failure rate.
+            cooldown: Seconds the circuit stays open before a probe is allowed.
+            clock: Time source (monotonic seconds).
+        """
+        self.failure_threshold = failure_threshold
+        self.min_calls = max(1, min_calls)
+        self.window = window
+        self.cooldown = cooldown
+        self.clock = clock
+
+        self.state = CircuitState.CLOSED
+        self.opened_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self._calls: Deque[Tuple[float, bool]] = deque()  # (timestamp, succeeded)
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def _trim(self, now: float):
+        """Forget attempts older than the window."""
+        while self._calls and self._calls[0][0] < now - self.window:
+            self._calls.popleft()
+
+    def _failure_rate(self) -> float:
+        if not self._calls:
+            return 0.0
+        return sum(1 for _, ok in self._calls if not ok) / len(self._calls)
+
+    def _cooldown_over(self, now: float) -> bool:
+        return self.opened_at is not None and now - self.opened_at >= self.cooldown
+
+    def available(self) -> bool:
+        """Check whether an attempt would be allowed, without claiming the half-open probe."""
+        with self._lock:
+            if self.state == CircuitState.CLOSED:
+                return True
+            if self.state == CircuitState.OPEN:
+                return self._cooldown_over(self.clock())
+            return not self._probing
+
+    def allow(self) -> bool:
+        """
+        Ask permission for an attempt.
+
+        Returns:
+            True if the attempt may run. In half-open state only one caller gets True
+            until its outcome is recorded.
+        """
+        with self._lock:
+            if self.state == CircuitState.CLOSED:
+                return True
+            if self.state == CircuitState.OPEN:
+                if not self._cooldown_over(self.clock()):
+                    return False
+                self.state = CircuitState.HALF_OPEN
+                self._probing = False
+            if self._probing:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self):
+        """Record a successful attempt."""
+        with self._lock:
+            now = self.clock()
+            if self.state == CircuitState.HALF_OPEN:
+                print("✅ Circuit closed: probe upload succeeded")
+                self.state = CircuitState.CLOSED
+                self.opened_at = None
+                self._calls.clear()
+            self._probing = False
+            self._calls.append((now, True))
+            self._trim(now)
+
+    def record_failure(self, error: Optional[str] = None):
+        """Record an attempt that failed because of the platform."""
+        with self._lock:
+            now = self.clock()
+            self.last_error = error
+            self._calls.append((now, False))
+            self._trim(now)
+            if self.state == CircuitState.HALF_OPEN:
+                self._open(now)
+            elif (self.state == CircuitState.CLOSED and len(self._calls) >= self.min_calls
+                  and self._failure_rate() >= self.failure_threshold):
+                self._open(now)
+
+    def record_ignored(self):
+        """Record an attempt whose outcome says nothing about the platform (e.g. invalid input)."""
+        with self._lock:
+            self._probing = False
+
+    def _open(self, now: float):
+        self.state = CircuitState.OPEN
+        self.opened_at = now
+        self._probing = False
+
+    def retry_in(self) -> float:
+        """Seconds until an open circuit allows a probe (0 if not open)."""
+        with self._lock:
+            if self.state != CircuitState.OPEN:
+                return 0.0
+            return max(0.0, self.cooldown - (self.clock() - self.opened_at))
+
+    def snapshot(self) -> dict:
+        """Current state for monitoring."""
+        retry_in = self.retry_in()
+        with self._lock:
+            self._trim(self.clock())
+            return {
+                'state': self.state.value,
+                'failure_rate': round(self._failure_rate(), 3),
+                'recent_attempts': len(self._calls),
+                'retry_in': round(retry_in, 1),
+                'last_error': self.last_error
+            }
+
+class CircuitBreakerRegistry:
+    """
+    One circuit breaker per (platform, account), created on first use.
+    """
+
+    def __init__(self, **breaker_options):
+        """
+        Args:
+            **breaker_options: Keyword arguments passed to every CircuitBreaker.
+        """
+        self.breaker_options = breaker_options
+        self._breakers: Dict[Tuple[Platform, str], CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, platform: Platform, account: str) -> CircuitBreaker:
+        """Get the breaker for a platform account."""
+        with self._lock:
+            key = (platform, account)
+            if key not in self._breakers:
+                self._breakers[key] = CircuitBreaker(**self.breaker_options)
+            return self._breakers[key]
+
+    def snapshot(self, platform: Platform, account: str) -> dict:
+        """State of a platform account's breaker for monitoring."""
+        return self.get(platform, account).snapshot()
@@ -1,103 +1,212 @@
 import json
-import time
+import sqlite3
+import threading
 from pathlib import Path
-from typing import Dict, Optional
-from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime
 from ..core.models import Platform
+from ..core.accounts import DEFAULT_ACCOUNT
+from ..platforms.plugins import plugins
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS usage (
+    day TEXT NOT NULL,
+    key TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (day, key)
+);
+"""
 
 class RateLimiter:
     """
     Enforces rate limits for uploads to prevent platform bans or quota errors.
-    Persists usage data to disk to maintain limits across CLI runs.
+    Usage is kept in SQLite, shared by every process publishing from the same
+    data directory (CLI runs, the API and standalone workers), and counters are
+    checked and incremented in one transaction so no process can overshoot.
+
+    Usage and limits are tracked per platform account. The default account keeps
+    the plain platform key ("tiktok"); other accounts use "tiktok:<account>".
     """
-    
-    # Default limits (uploads per day)
-    DEFAULT_LIMITS = {
-        Platform.YOUTUBE: 6,      # Conservative limit for free tier
-        Platform.YOUTUBE_SHORTS: 6,
-        Platform.TIKTOK: 4,       # To avoid spam detection
-        Platform.INSTAGRAM: 4     # To avoid action blocks
-    }
-    
-    def __init__(self, storage_path: str = "data/safety/rate_limits.json"):
+
+    # Default limits (uploads per day), as declared by each platform plugin
+    DEFAULT_LIMITS = {Platform(plugin.name): plugin.daily_limit for plugin in plugins.plugins()}
+
+    def __init__(self, storage_path: str = "data/safety/rate_limits.db"):
+        """
+        Args:
+            storage_path: SQLite database holding the daily usage. Counts from an older
+                          JSON usage file next to it (same name, .json) are imported once.
+        """
         self.storage_path = Path(storage_path)
         self.limits = self.DEFAULT_LIMITS.copy()
+        # Per-account overrides of the platform limit
+        self.account_limits: Dict[Tuple[Platform, str], int] = {}
+        self._local = threading.local()
         self._ensure_storage()
-        self._load_usage()
+        self._connect().executescript(_SCHEMA)
+        self._import_json_usage()
 
     def _ensure_storage(self):
         """Ensure storage directory exists."""
         if not self.storage_path.parent.exists():
             self.storage_path.parent.mkdir(parents=True, exist_ok=True)
 
-    def _load_usage(self):
-        """Load usage data from disk."""
-        if self.storage_path.exists():
-            try:
-                with open(self.storage_path, 'r') as f:
-                    data = json.load(f)
-                    # Convert string keys back to Platform enums if needed, 
-                    # but JSON keys are always strings. We'll handle conversion on access.
-                    self.usage = data
-            except Exception:
-                self.usage = {}
-        else:
-            self.usage = {}
-
-    def _save_usage(self):
-        """Save usage data to disk."""
-        with open(self.storage_path, 'w') as f:
-            json.dump(self.usage, f, indent=2)
-
-    def _get_today_key(self) -> str:
-        """Get date string for today."""
+    def _connect(self) -> sqlite3.Connection:
+        """Get the calling thread's connection, opening it if needed."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.storage_path), timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _import_json_usage(self):
+        """Carry over the counts of the JSON usage file used by earlier versions."""
+        legacy_path = self.storage_path.with_suffix('.json')
+        if legacy_path == self.storage_path or not legacy_path.exists():
+            return
+        try:
+            with open(legacy_path, 'r') as f:
+                data = json.load(f)
+        except Exception:
+            return
+        rows = [(day, key, int(count)) for day, counts in data.items() for key, count in counts.items()]
+        # Existing rows win: the file is imported by the first process only
+        self._connect().executemany("INSERT OR IGNORE INTO usage (day, key, count) VALUES (?, ?, ?)", rows)
+
+    def today(self) -> str:
+        """Key of the current day, as passed to reserve() and release()."""
         return datetime.now().strftime("%Y-%m-%d")
 
-    def can_upload(self, platform: Platform) -> bool:
+    @staticmethod
+    def _usage_key(platform: Platform, account: str) -> str:
+        """Key used in the usage table for a platform account."""
+        if account == DEFAULT_ACCOUNT:
+            return platform.value
+        return f"{platform.value}:{account}"
+
+    def set_limit(self, platform: Platform, limit: int, account: str = DEFAULT_ACCOUNT):
+        """Set the daily limit for one platform account."""
+        self.account_limits[(platform, account)] = limit
+
+    def get_limit(self, platform: Platform, account: str = DEFAULT_ACCOUNT) -> int:
+        """Get the daily limit for one platform account."""
+        if (platform, account) in self.account_limits:
+            return self.account_limits[(platform, account)]
+        if platform in self.limits:
+            return self.limits[platform]
+        plugin = plugins.get(platform)
+        return plugin.daily_limit if plugin else 5 # Default fallback
+
+    def _get_used(self, platform: Platform, account: str, day: Optional[str] = None,
+                  conn: Optional[sqlite3.Connection] = None) -> int:
+        """Uploads recorded on `day` (today by default) for a platform account."""
+        row = (conn or self._connect()).execute(
+            "SELECT count FROM usage WHERE day = ? AND key = ?",
+            (day or self.today(), self._usage_key(platform, account))
+        ).fetchone()
+        return row[0] if row else 0
+
+    def _add(self, conn: sqlite3.Connection, platform: Platform, account: str, day: str, delta: int):
+        conn.execute(
+            "INSERT INTO usage (day, key, count) VALUES (?, ?, MAX(?, 0)) "
+            "ON CONFLICT (day, key) DO UPDATE SET count = MAX(count + ?, 0)",
+            (day, self._usage_key(platform, account), delta, delta)
+        )
+
+    def can_upload(self, platform: Platform, account: str = DEFAULT_ACCOUNT) -> bool:
         """
         Check if upload is allowed for the platform.
-        
+
         Args:
             platform: The target platform.
-            
+            account: The platform account.
+
         Returns:
             True if within limits, False otherwise.
         """
-        today = self._get_today_key()
-        platform_key = platform.value
-        
-        # Initialize if not present
-        if today not in self.usage:
-            self.usage[today] = {}
-        
-        current_count = self.usage[today].get(platform_key, 0)
-        limit = self.limits.get(platform, 5) # Default fallback
-        
-        return current_count < limit
-
-    def record_upload(self, platform: Platform):
+        return self._get_used(platform, account) < self.get_limit(platform, account)
+
+    def record_upload(self, platform: Platform, account: str = DEFAULT_ACCOUNT):
         """
         Record a successful upload.
-        
+
+        Args:
+            platform: The target platform.
+            account: The platform account.
+        """
+        self._add(self._connect(), platform, account, self.today(), 1)
+
+    def reserve(self, platform: Platform, account: str = DEFAULT_ACCOUNT, day: Optional[str] = None) -> bool:
+        """
+        Atomically check the limit and record an upload.
+        Use release() to give the slot back if the upload does not succeed.
+
+        Args:
+            platform: The target platform.
+            account: The platform account.
+            day: Day to count the upload on (today by default); pass the same day to release().
+
+        Returns:
+            True if a slot was reserved, False if the limit is reached.
+        """
+        return self.reserve_best(platform, [account], day) is not None
+
+    def reserve_best(self, platform: Platform, accounts: List[str], day: Optional[str] = None) -> Optional[str]:
+        """
+        Reserve a slot on the account with the most remaining budget.
+
+        Args:
+            platform: The target platform.
+            accounts: Candidate account names.
+            day: Day to count the upload on (today by default); pass the same day to release().
+
+        Returns:
+            The account that was reserved, or None if every account is exhausted.
+        """
+        day = day or self.today()
+        conn = self._connect()
+        # Taken before reading, so no other process reserves between the check and the increment
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            best = self._best_account(platform, accounts, day, conn)
+            if best is not None:
+                self._add(conn, platform, best, day, 1)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return best
+
+    def best_account(self, platform: Platform, accounts: List[str]) -> Optional[str]:
+        """Get the account with the most remaining budget, or None if all are exhausted."""
+        return self._best_account(platform, accounts, self.today(), self._connect())
+
+    def _best_account(self, platform: Platform, accounts: List[str], day: str,
+                      conn: sqlite3.Connection) -> Optional[str]:
+        remaining = {account: self.get_limit(platform, account) - self._get_used(platform, account, day, conn)
+                     for account in accounts}
+        ranked = sorted(accounts, key=lambda a: remaining[a], reverse=True)
+        if not ranked or remaining[ranked[0]] <= 0:
+            return None
+        return ranked[0]
+
+    def release(self, platform: Platform, account: str = DEFAULT_ACCOUNT, day: Optional[str] = None):
+        """
+        Release a slot previously taken with reserve().
+
         Args:
             platform: The target platform.
+            account: The platform account.
+            day: Day the slot was reserved on (today by default), so a slot
+                 released after midnight is given back to the right day.
         """
-        today = self._get_today_key()
-        platform_key = platform.value
-        
-        if today not in self.usage:
-            self.usage[today] = {}
-            
-        current_count = self.usage[today].get(platform_key, 0)
-        self.usage[today][platform_key] = current_count + 1
-        self._save_usage()
-
-    def get_remaining(self, platform: Platform) -> int:
+        self._add(self._connect(), platform, account, day or self.today(), -1)
+
+    def get_remaining(self, platform: Platform, account: str = DEFAULT_ACCOUNT) -> int:
         """Get remaining uploads for today."""
-        today = self._get_today_key()
-        platform_key = platform.value
-        
-        current_count = self.usage.get(today, {}).get(platform_key, 0)
-        limit = self.limits.get(platform, 5)
-        
+        current_count = self._get_used(platform, account)
+        limit = self.get_limit(platform, account)
+
         return max(0, limit - current_count)
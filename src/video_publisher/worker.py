@@ -0,0 +1,71 @@
+"""
+Standalone upload worker.
+
+Consumes the same job queue as the web API, so publishing can run outside the
+process that accepted the request:
+
+    python -m video_publisher.worker --concurrency 2
+
+Start as many workers as needed; each claims jobs under a time-bounded lease,
+renews it while the upload runs and releases unfinished jobs when it shuts down.
+If a worker dies, its jobs are picked up by another one once their lease expires.
+
+The default SQLite store relies on WAL shared memory, so every worker using it
+must run on the same host as the database file.
+"""
+import os
+import sys
+import signal
+import argparse
+import threading
+from typing import List, Optional
+
+from .jobs import JobStore, WorkerPool, run_upload_job
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run a worker until SIGINT/SIGTERM."""
+    parser = argparse.ArgumentParser(prog="python -m video_publisher.worker",
+                                     description="Process queued upload jobs.")
+    parser.add_argument("--db", default=os.environ.get('JOBS_DB_PATH', 'data/jobs/jobs.db'),
+                        help="Job database shared with the API and other workers")
+    parser.add_argument("--concurrency", type=int, default=int(os.environ.get('UPLOAD_WORKERS', '2')),
+                        help="Jobs processed in parallel by this worker")
+    parser.add_argument("--lease", type=float, default=float(os.environ.get('JOB_LEASE_SECONDS', '60')),
+                        help="Seconds a job stays reserved without renewal")
+    parser.add_argument("--poll-interval", type=float, default=float(os.environ.get('JOB_POLL_SECONDS', '2')),
+                        help="Seconds between queue polls when idle")
+    parser.add_argument("--drain-timeout", type=float, default=300.0,
+                        help="Seconds to let running jobs finish on shutdown before releasing them")
+    args = parser.parse_args(argv)
+
+    store = JobStore(args.db)
+    pool = WorkerPool(
+        store,
+        run_upload_job,
+        concurrency=max(1, args.concurrency),
+        poll_interval=args.poll_interval,
+        lease_duration=args.lease
+    )
+
+    stop = threading.Event()
+
+    def request_stop(signum, frame):
+        print("\n🛑 Shutting down, waiting for running jobs...")
+        stop.set()
+
+    signal.signal(signal.SIGINT, request_stop)
+    signal.signal(signal.SIGTERM, request_stop)
+
+    pool.start()
+    print(f"👷 Worker {pool.worker_id} processing {args.db} ({pool.concurrency} concurrent jobs)")
+    while not stop.wait(1.0):
+        pass
+
+    pool.stop(timeout=args.drain_timeout)
+    print("👋 Worker stopped")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,76 @@
+import os
+import shutil
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from video_publisher.core import video_analyzer
+from video_publisher.core.analysis_cache import AnalysisCache
+from video_publisher.core.models import VideoMetadata
+from video_publisher.core.video_analyzer import VideoAnalyzer
+from tests.test_probe import make_mp4
+
+# --- AnalysisCache Tests ---
+def test_analysis_cache_skips_repeat_probes(tmp_path, monkeypatch):
+    path = tmp_path / "clip.mp4"
+    path.write_bytes(make_mp4())
+    cache = AnalysisCache(str(tmp_path / "analysis.db"))
+    spy = MagicMock(side_effect=video_analyzer.probe)
+    monkeypatch.setattr(video_analyzer, 'probe', spy)
+
+    first = VideoAnalyzer(cache=cache).analyze(str(path), content_hash="abc")
+    # A new analyzer (another request or CLI run) reuses the stored analysis
+    assert VideoAnalyzer(cache=AnalysisCache(str(tmp_path / "analysis.db"))).analyze(str(path)) == first
+    assert spy.call_count == 1
+
+    # A copy has a new identity but the same content hash
+    copy = tmp_path / "copy.mp4"
+    shutil.copy(path, copy)
+    assert VideoAnalyzer(cache=cache).analyze(str(copy), content_hash="abc").path == str(copy)
+    assert spy.call_count == 1
+
+    # Modifying the file invalidates its entry
+    path.write_bytes(make_mp4(rotation=90))
+    os.utime(path, ns=(0, path.stat().st_mtime_ns + 1_000_000))
+    assert VideoAnalyzer(cache=cache).analyze(str(path)).is_vertical is True
+    assert spy.call_count == 2
+
+def test_analysis_cache_evicts_least_recently_used(tmp_path):
+    cache = AnalysisCache(str(tmp_path / "analysis.db"), max_entries=2)
+    paths = []
+    for name in "abc":
+        path = tmp_path / f"{name}.mp4"
+        path.write_bytes(name.encode())
+        paths.append(str(path))
+        cache.put(str(path), VideoMetadata(path=str(path), duration=1, width=2, height=1, aspect_ratio=2))
+
+    assert len(cache) == 2
+    assert cache.get(paths[0]) is None
+    assert cache.get(paths[2]).path == paths[2]
+
+# --- Batch Analysis Tests ---
+def test_analyze_many_reports_hung_file_without_blocking(tmp_path):
+    if not hasattr(os, 'mkfifo'):
+        pytest.skip("needs a FIFO to simulate a hanging read")
+    good = [tmp_path / f"clip{n}.mp4" for n in range(3)]
+    for n, path in enumerate(good):
+        path.write_bytes(make_mp4(seconds=n + 1))
+    hung = tmp_path / "hung.mp4"
+    os.mkfifo(hung)  # Opening it blocks forever, like a decoder stuck on a corrupt file
+    corrupt = tmp_path / "corrupt.mp4"
+    corrupt.write_bytes(b'\0\0\0\x08moov')  # moov without a video track
+
+    analyzer = VideoAnalyzer(cache=AnalysisCache(str(tmp_path / "analysis.db")))
+    paths = [str(good[0]), str(hung), str(good[1]), str(corrupt), str(good[2])]
+
+    began = time.monotonic()
+    results = {r.path: r for r in analyzer.analyze_many(paths, workers=2, timeout=3)}
+    assert time.monotonic() - began < 15
+    assert [results[str(p)].metadata.duration for p in good] == [1.0, 2.0, 3.0]
+    assert 'timed out' in results[str(hung)].error
+    assert results[str(corrupt)].success is False
+
+    # Good files are cached: a second batch needs no worker
+    again = list(analyzer.analyze_many([str(p) for p in good]))
+    assert all(r.success for r in again)
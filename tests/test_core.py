@@ -1,6 +1,6 @@
 import pytest
 from unittest.mock import MagicMock, patch
-from video_publisher.core.models import VideoMetadata, Platform
+from video_publisher.core.models import VideoMetadata, Platform, UploadResult
 from video_publisher.core.video_analyzer import VideoAnalyzer
 from video_publisher.core.platform_router import PlatformRouter
 from video_publisher.core.engine import VideoPublisher
@@ -60,15 +60,511 @@ def test_video_publisher_upload_auto():
         mock_analyzer.analyze.assert_called_once_with("test.mp4")
         mock_router.route.assert_called_once_with(metadata)
 
+def _without_delays(policy):
+    """Same attempts as `policy`, retried immediately."""
+    from video_publisher.core.retry import Backoff, RetryPolicy
+
+    return RetryPolicy({error_class: Backoff(max_attempts=backoff.max_attempts, base_delay=0, max_delay=0, jitter=0)
+                        for error_class, backoff in policy.backoffs.items()})
+
 def test_video_publisher_upload_manual():
+    from video_publisher.core.retry import DEFAULT_RETRY_POLICIES
+
     with patch("video_publisher.core.engine.VideoAnalyzer") as mock_analyzer_cls:
         mock_analyzer = mock_analyzer_cls.return_value
         metadata = VideoMetadata(path="test.mp4", duration=10, width=1920, height=1080, aspect_ratio=1.77)
         mock_analyzer.analyze.return_value = metadata
         
-        publisher = VideoPublisher()
+        publisher = VideoPublisher(retry_policies={
+            Platform.TIKTOK: _without_delays(DEFAULT_RETRY_POLICIES[Platform.TIKTOK])})
         results = publisher.upload("test.mp4", platforms=[Platform.TIKTOK])
         
         assert len(results) == 1
         assert results[0].platform == Platform.TIKTOK
         assert results[0].success is True
+
+def test_video_publisher_parallel_results_keep_order(tmp_path):
+    from video_publisher.safety import RateLimiter
+    import threading
+    import time
+
+    with patch("video_publisher.core.engine.VideoAnalyzer") as mock_analyzer_cls:
+        mock_analyzer_cls.return_value.analyze.return_value = VideoMetadata(
+            path="test.mp4", duration=10, width=1080, height=1920, aspect_ratio=0.56)
+
+        publisher = VideoPublisher(max_workers=3)
+        publisher.rate_limiter = RateLimiter(storage_path=str(tmp_path / "limits.db"))
+
+        running = []
+        peak = []
+        lock = threading.Lock()
+
+        def make_uploader(platform, delay):
+            def fake_upload(video_path, metadata):
+                with lock:
+                    running.append(platform)
+                    peak.append(len(running))
+                time.sleep(delay)
+                with lock:
+                    running.remove(platform)
+                return UploadResult(platform=platform, success=True, url=f"https://{platform.value}")
+            uploader = MagicMock()
+            uploader.upload.side_effect = fake_upload
+            return uploader
+
+        targets = [Platform.TIKTOK, Platform.INSTAGRAM, Platform.YOUTUBE_SHORTS]
+        # Slowest platform first so completion order differs from submission order
+        publisher.uploaders = {p: make_uploader(p, d) for p, d in zip(targets, [0.3, 0.1, 0.2])}
+
+        results = publisher.upload("test.mp4", platforms=targets)
+
+        assert [r.platform for r in results] == targets
+        assert all(r.success for r in results)
+        assert max(peak) > 1
+        for platform in targets:
+            assert publisher.rate_limiter.get_remaining(platform) == RateLimiter.DEFAULT_LIMITS[platform] - 1
+
+def test_rate_limiter_reserve_is_bounded(tmp_path):
+    from video_publisher.safety import RateLimiter
+    from concurrent.futures import ThreadPoolExecutor
+
+    limiter = RateLimiter(storage_path=str(tmp_path / "limits.db"))
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        granted = list(executor.map(lambda _: limiter.reserve(Platform.TIKTOK), range(20)))
+
+    assert sum(granted) == RateLimiter.DEFAULT_LIMITS[Platform.TIKTOK]
+    limiter.release(Platform.TIKTOK)
+    assert limiter.get_remaining(Platform.TIKTOK) == 1
+
+def test_rate_limiter_is_shared_between_processes(tmp_path):
+    import json
+    from video_publisher.safety import RateLimiter
+
+    (tmp_path / "limits.json").write_text(json.dumps({"2020-01-01": {"tiktok": 1}}))
+    api = RateLimiter(storage_path=str(tmp_path / "limits.db"))
+    worker = RateLimiter(storage_path=str(tmp_path / "limits.db"))  # e.g. video_publisher.worker
+    limit = RateLimiter.DEFAULT_LIMITS[Platform.TIKTOK]
+
+    granted = [limiter.reserve(Platform.TIKTOK) for limiter in (api, worker) * limit]
+    assert sum(granted) == limit
+    assert api.get_remaining(Platform.TIKTOK) == worker.get_remaining(Platform.TIKTOK) == 0
+
+    # Counts of the older JSON usage file were carried over
+    assert api._get_used(Platform.TIKTOK, "default", "2020-01-01") == 1
+    # A slot released after midnight goes back to the day it was taken from
+    api.release(Platform.TIKTOK, day="2020-01-01")
+    assert api._get_used(Platform.TIKTOK, "default", "2020-01-01") == 0
+    assert worker.get_remaining(Platform.TIKTOK) == 0
+
+def _publisher_with_fake_uploaders(tmp_path, delays, max_workers=None):
+    from video_publisher.safety import RateLimiter
+    import time
+
+    publisher = VideoPublisher(max_workers=max_workers)
+    publisher.analyzer = MagicMock()
+    publisher.analyzer.analyze.return_value = VideoMetadata(
+        path="test.mp4", duration=10, width=1080, height=1920, aspect_ratio=0.56)
+    publisher.rate_limiter = RateLimiter(storage_path=str(tmp_path / "limits.db"))
+
+    def make_uploader(platform, delay):
+        def fake_upload(video_path, metadata):
+            time.sleep(delay)
+            return UploadResult(platform=platform, success=True)
+        uploader = MagicMock()
+        uploader.upload.side_effect = fake_upload
+        return uploader
+
+    publisher.uploaders = {p: make_uploader(p, d) for p, d in delays.items()}
+    return publisher
+
+def test_video_publisher_iter_upload_async_yields_as_completed(tmp_path):
+    import asyncio
+    delays = {Platform.TIKTOK: 0.3, Platform.INSTAGRAM: 0.05, Platform.YOUTUBE_SHORTS: 0.15}
+    publisher = _publisher_with_fake_uploaders(tmp_path, delays)
+
+    async def collect():
+        return [r.platform async for r in publisher.iter_upload_async("test.mp4", platforms=list(delays))]
+
+    try:
+        assert asyncio.run(collect()) == [Platform.INSTAGRAM, Platform.YOUTUBE_SHORTS, Platform.TIKTOK]
+        ordered = asyncio.run(publisher.upload_async("test.mp4", platforms=list(delays)))
+        assert [r.platform for r in ordered] == list(delays)
+    finally:
+        publisher.close()
+
+def test_video_publisher_upload_async_cancel_skips_pending(tmp_path):
+    import asyncio
+    delays = {Platform.TIKTOK: 0.2, Platform.INSTAGRAM: 0.2}
+    publisher = _publisher_with_fake_uploaders(tmp_path, delays, max_workers=1)
+
+    async def cancel_early():
+        task = asyncio.ensure_future(publisher.upload_async("test.mp4", platforms=list(delays)))
+        await asyncio.sleep(0.1)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        await asyncio.sleep(0.3)
+
+    try:
+        asyncio.run(cancel_early())
+        # Only the first platform had started before cancellation
+        assert publisher.uploaders[Platform.TIKTOK].upload.call_count == 1
+        assert publisher.uploaders[Platform.INSTAGRAM].upload.call_count == 0
+    finally:
+        publisher.close()
+
+def test_video_publisher_cancel_token_stops_running_upload(tmp_path):
+    import threading
+    import time
+    from video_publisher.core.cancellation import CancellationToken, current_token
+
+    publisher = _publisher_with_fake_uploaders(tmp_path, {Platform.TIKTOK: 0})
+    started = threading.Event()
+
+    def slow_upload(video_path, metadata):
+        started.set()
+        current_token().sleep(10)  # what BasePlatform.sleep() does
+        return UploadResult(platform=Platform.TIKTOK, success=True)
+
+    publisher.uploaders[Platform.TIKTOK].upload.side_effect = slow_upload
+    token = CancellationToken()
+    threading.Thread(target=lambda: started.wait(5) and token.cancel("Stopped by user")).start()
+    remaining = publisher.rate_limiter.get_remaining(Platform.TIKTOK)
+
+    try:
+        began = time.time()
+        results = publisher.upload("test.mp4", platforms=[Platform.TIKTOK], cancel_token=token)
+        assert time.time() - began < 2
+        assert results[0].success is False
+        assert results[0].error == "Stopped by user"
+        # The reserved slot was given back
+        assert publisher.rate_limiter.get_remaining(Platform.TIKTOK) == remaining
+        assert publisher.upload("test.mp4", platforms=[Platform.TIKTOK], cancel_token=token)[0].error == "Stopped by user"
+        assert publisher.uploaders[Platform.TIKTOK].upload.call_count == 1
+    finally:
+        publisher.close()
+
+def test_preflight_rejects_and_reroutes():
+    from video_publisher.core.compliance import PlatformSpec, preflight
+
+    spec = PlatformSpec(max_duration=60, codecs=frozenset({"h264"}), max_aspect_ratio=1.0)
+    wide = VideoMetadata(path="a.mp4", duration=90, width=1920, height=1080, aspect_ratio=16 / 9, codec="prores")
+    assert len(spec.violations(wide)) == 3
+    # Unknown properties are not held against the video
+    assert spec.violations(VideoMetadata(path="a.mp4", duration=30, width=1080, height=1920, aspect_ratio=0.56)) == []
+
+    long_vertical = VideoMetadata(path="a.mp4", duration=300, width=1080, height=1920, aspect_ratio=0.56,
+                                  codec="h264", fps=30)
+    targets, rejections = preflight(long_vertical, [Platform.TIKTOK, Platform.YOUTUBE_SHORTS])
+    assert targets == [Platform.TIKTOK, Platform.YOUTUBE_SHORTS, Platform.YOUTUBE]
+    assert list(rejections) == [Platform.YOUTUBE_SHORTS]
+    assert "180s maximum" in rejections[Platform.YOUTUBE_SHORTS]
+
+def test_video_publisher_skips_non_compliant_platforms(tmp_path):
+    publisher = _publisher_with_fake_uploaders(tmp_path, {Platform.TIKTOK: 0, Platform.INSTAGRAM: 0})
+    publisher.analyzer.analyze.return_value = VideoMetadata(
+        path="test.mp4", duration=1200, width=1080, height=1920, aspect_ratio=0.56, codec="vp9")
+    remaining = publisher.rate_limiter.get_remaining(Platform.INSTAGRAM)
+
+    try:
+        results = publisher.upload("test.mp4", platforms=[Platform.TIKTOK, Platform.INSTAGRAM])
+    finally:
+        publisher.close()
+    assert results[0].success is True
+    assert results[1].success is False
+    assert "codec vp9" in results[1].error and "900s maximum" in results[1].error
+    # Rejected before reserving a slot or starting the uploader
+    assert publisher.uploaders[Platform.INSTAGRAM].upload.call_count == 0
+    assert publisher.rate_limiter.get_remaining(Platform.INSTAGRAM) == remaining
+
+def test_video_publisher_picks_cover_for_thumbnail_platforms(tmp_path):
+    publisher = _publisher_with_fake_uploaders(tmp_path, {Platform.TIKTOK: 0, Platform.YOUTUBE_SHORTS: 0})
+    publisher.auto_cover = True
+    publisher.cover_for = MagicMock(return_value="cover.jpg")
+
+    try:
+        publisher.upload("test.mp4", platforms=[Platform.YOUTUBE_SHORTS])
+        publisher.cover_for.assert_not_called()  # YouTube takes no thumbnail from us
+
+        publisher.upload("test.mp4", platforms=[Platform.TIKTOK], metadata={'title': 'x'})
+        assert publisher.uploaders[Platform.TIKTOK].upload.call_args.args[1]['thumbnail_path'] == "cover.jpg"
+
+        publisher.upload("test.mp4", platforms=[Platform.TIKTOK], metadata={'thumbnail_path': 'mine.jpg'})
+        assert publisher.cover_for.call_count == 1
+    finally:
+        publisher.close()
+
+def test_video_publisher_uploads_renditions_when_transcoding(tmp_path):
+    from video_publisher.media.transcode import TranscodeError
+
+    publisher = _publisher_with_fake_uploaders(tmp_path, {Platform.TIKTOK: 0, Platform.INSTAGRAM: 0})
+    # ProRes is rejected by TikTok as is, but its rendition is H.264
+    publisher.analyzer.analyze.return_value = VideoMetadata(
+        path="test.mp4", duration=10, width=2160, height=3840, aspect_ratio=0.56, codec="prores", fps=30)
+    publisher._renditions = MagicMock()
+    publisher._renditions.get.side_effect = lambda path, profile, content_hash, token: f"{profile.name}.mp4"
+
+    try:
+        publisher.transcode = "off"
+        assert publisher.upload("test.mp4", platforms=[Platform.TIKTOK])[0].success is False
+
+        publisher.transcode = "auto"
+        results = publisher.upload("test.mp4", platforms=[Platform.TIKTOK, Platform.INSTAGRAM])
+        assert [r.success for r in results] == [True, True]
+        assert publisher.uploaders[Platform.TIKTOK].upload.call_args.args[0] == "tiktok.mp4"
+        assert publisher.uploaders[Platform.INSTAGRAM].upload.call_args.args[0] == "instagram.mp4"
+
+        # A failed transcode falls back to the original file
+        publisher._renditions.get.side_effect = TranscodeError("boom")
+        publisher.analyzer.analyze.return_value = VideoMetadata(
+            path="test.mp4", duration=10, width=1080, height=1920, aspect_ratio=0.56, codec="hevc", fps=30)
+        assert publisher.upload("test.mp4", platforms=[Platform.INSTAGRAM])[0].success is True
+        assert publisher.uploaders[Platform.INSTAGRAM].upload.call_args.args[0] == "test.mp4"
+    finally:
+        publisher.close()
+
+def test_video_publisher_reframes_for_other_orientations(tmp_path):
+    publisher = _publisher_with_fake_uploaders(
+        tmp_path, {p: 0 for p in (Platform.YOUTUBE, Platform.TIKTOK, Platform.INSTAGRAM, Platform.YOUTUBE_SHORTS)})
+    publisher.analyzer.analyze.return_value = VideoMetadata(
+        path="test.mp4", duration=30, width=1920, height=1080, aspect_ratio=16 / 9, codec="h264", fps=30)
+    publisher._renditions = MagicMock()
+    publisher._renditions.get.side_effect = lambda path, profile, content_hash, token: f"{profile.aspect_ratio:.2f}.mp4"
+    publisher.auto_cover = False
+
+    try:
+        publisher.reframe = False
+        assert [r.platform for r in publisher.upload("test.mp4")] == [Platform.YOUTUBE]
+
+        publisher.reframe = True
+        results = publisher.upload("test.mp4", force=True)
+        assert [r.platform for r in results] == [Platform.YOUTUBE, Platform.TIKTOK, Platform.INSTAGRAM,
+                                                 Platform.YOUTUBE_SHORTS]
+        assert all(r.success for r in results)
+        uploaded = {p: u.upload.call_args.args[0] for p, u in publisher.uploaders.items()}
+        assert uploaded == {Platform.YOUTUBE: "test.mp4", Platform.TIKTOK: "0.56.mp4",
+                            Platform.INSTAGRAM: "0.56.mp4", Platform.YOUTUBE_SHORTS: "0.56.mp4"}
+    finally:
+        publisher.close()
+
+def test_video_publisher_routes_to_account_with_most_budget(tmp_path, monkeypatch):
+    import json
+    from video_publisher.safety import RateLimiter
+
+    accounts_file = tmp_path / "accounts.json"
+    accounts_file.write_text(json.dumps({
+        "tiktok": [{"name": "main", "daily_limit": 2}, {"name": "alt", "daily_limit": 3}]
+    }))
+    monkeypatch.setenv("ACCOUNTS_FILE", str(accounts_file))
+
+    with patch("video_publisher.core.engine.RateLimiter",
+               side_effect=lambda: RateLimiter(storage_path=str(tmp_path / "limits.db"))):
+        publisher = VideoPublisher()
+    publisher.analyzer = MagicMock()
+    publisher.analyzer.analyze.return_value = VideoMetadata(
+        path="test.mp4", duration=10, width=1080, height=1920, aspect_ratio=0.56)
+
+    def fake_get_uploader(platform, account):
+        uploader = MagicMock()
+        uploader.upload.return_value = UploadResult(platform=platform, success=True)
+        return uploader
+    publisher.get_uploader = fake_get_uploader
+
+    used = [publisher.upload("test.mp4", platforms=[Platform.TIKTOK])[0].account for _ in range(5)]
+    assert used[0] == "alt"
+    assert sorted(used) == ["alt", "alt", "alt", "main", "main"]
+
+    exhausted = publisher.upload("test.mp4", platforms=[Platform.TIKTOK])
+    assert exhausted[0].error == "Daily rate limit exceeded"
+
+    pinned = publisher.upload("test.mp4", platforms=[Platform.TIKTOK], metadata={"account": {"tiktok": "ghost"}})
+    assert pinned[0].success is False
+    assert "Unknown tiktok account" in pinned[0].error
+
+def test_classify_error():
+    from video_publisher.core.retry import ErrorClass, classify_error
+
+    assert classify_error("Timeout waiting for upload button") == ErrorClass.TRANSIENT
+    assert classify_error("Too many attempts, try again later") == ErrorClass.THROTTLED
+    assert classify_error("HTTP error 403: quotaExceeded") == ErrorClass.THROTTLED
+    assert classify_error("Login timeout - please log in manually") == ErrorClass.AUTH
+    assert classify_error('HTTP error 401: "Invalid Credentials"') == ErrorClass.AUTH
+    assert classify_error("RefreshError: ('invalid_grant: Token has been expired or revoked.')") == ErrorClass.AUTH
+    assert classify_error("Invalid metadata: title is required") == ErrorClass.PERMANENT
+    assert classify_error("Daily rate limit exceeded") == ErrorClass.PERMANENT
+    assert classify_error(FileNotFoundError("clip.mp4")) == ErrorClass.PERMANENT
+    assert classify_error(ConnectionError("reset by peer")) == ErrorClass.TRANSIENT
+
+def test_retry_policy_backoff():
+    from video_publisher.core.retry import Backoff, ErrorClass, RetryPolicy
+
+    policy = RetryPolicy({ErrorClass.TRANSIENT: Backoff(max_attempts=4, base_delay=10, max_delay=25, jitter=0)})
+    assert policy.next_delay("network glitch", 1) == 10
+    assert policy.next_delay("network glitch", 2) == 20
+    assert policy.next_delay("network glitch", 3) == 25  # capped
+    assert policy.next_delay("network glitch", 4) is None  # out of attempts
+    assert policy.next_delay("Risk check failed: spam", 1) is None  # permanent
+    assert policy.next_delay("Login timeout", 1) is None  # no backoff configured for auth
+
+def test_video_publisher_retry_does_not_block_other_platforms(tmp_path):
+    import time
+    from video_publisher.core.retry import Backoff, ErrorClass, RetryPolicy
+
+    publisher = _publisher_with_fake_uploaders(tmp_path, {Platform.YOUTUBE: 0}, max_workers=1)
+    publisher.retry_policies[Platform.TIKTOK] = RetryPolicy(
+        {ErrorClass.TRANSIENT: Backoff(max_attempts=3, base_delay=0.3, jitter=0)})
+    finished = {}
+
+    def flaky_upload(video_path, metadata):
+        if publisher.uploaders[Platform.TIKTOK].upload.call_count < 2:
+            return UploadResult(platform=Platform.TIKTOK, success=False, error="Something went wrong")
+        finished[Platform.TIKTOK] = time.monotonic()
+        return UploadResult(platform=Platform.TIKTOK, success=True)
+
+    def youtube_upload(video_path, metadata):
+        finished[Platform.YOUTUBE] = time.monotonic()
+        return UploadResult(platform=Platform.YOUTUBE, success=True)
+
+    publisher.uploaders[Platform.TIKTOK] = MagicMock()
+    publisher.uploaders[Platform.TIKTOK].upload.side_effect = flaky_upload
+    publisher.uploaders[Platform.YOUTUBE].upload.side_effect = youtube_upload
+    permanent = MagicMock()
+    permanent.upload.return_value = UploadResult(platform=Platform.INSTAGRAM, success=False,
+                                                 error="Unsupported video format")
+    publisher.uploaders[Platform.INSTAGRAM] = permanent
+
+    results = publisher.upload("test.mp4", platforms=[Platform.TIKTOK, Platform.YOUTUBE, Platform.INSTAGRAM],
+                               metadata={"title": "Test"})
+
+    assert [r.success for r in results] == [True, True, False]
+    assert publisher.uploaders[Platform.TIKTOK].upload.call_count == 2
+    assert permanent.upload.call_count == 1
+    # With a single worker, YouTube ran while TikTok was backing off
+    assert finished[Platform.YOUTUBE] < finished[Platform.TIKTOK]
+    # Failed attempts gave their rate limit slot back
+    assert publisher.rate_limiter.get_remaining(Platform.INSTAGRAM) == publisher.rate_limiter.get_limit(Platform.INSTAGRAM)
+
+def test_circuit_breaker_opens_and_probes():
+    from video_publisher.safety import CircuitBreaker, CircuitState
+
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=0.5, min_calls=3, cooldown=60, clock=lambda: now[0])
+
+    breaker.record_success()
+    breaker.record_failure("timeout")
+    assert breaker.state == CircuitState.CLOSED  # not enough attempts yet
+    breaker.record_failure("timeout")
+    assert breaker.state == CircuitState.OPEN
+    assert not breaker.allow()
+
+    now[0] = 61
+    assert breaker.allow()  # single half-open probe
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert not breaker.allow()
+    breaker.record_failure("timeout")
+    assert breaker.state == CircuitState.OPEN
+
+    now[0] = 122
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.snapshot()['state'] == 'closed'
+
+def test_video_publisher_fails_fast_while_circuit_open(tmp_path):
+    from video_publisher.core.retry import NO_RETRY
+
+    publisher = _publisher_with_fake_uploaders(tmp_path, {Platform.YOUTUBE: 0})
+    publisher.retry_policies[Platform.TIKTOK] = NO_RETRY
+    broken = MagicMock()
+    broken.upload.return_value = UploadResult(platform=Platform.TIKTOK, success=False,
+                                              error="Timeout waiting for upload page")
+    publisher.uploaders[Platform.TIKTOK] = broken
+
+    for _ in range(3):
+        publisher.upload("test.mp4", platforms=[Platform.TIKTOK], metadata={"title": "Test"})
+    assert broken.upload.call_count == 3
+
+    results = publisher.upload("test.mp4", platforms=[Platform.TIKTOK, Platform.YOUTUBE], metadata={"title": "Test"})
+
+    assert broken.upload.call_count == 3  # no browser launched while open
+    assert "Circuit open" in results[0].error
+    assert results[1].success
+
+def test_metadata_hash_normalizes():
+    from video_publisher.core.hashing import metadata_hash
+
+    base = metadata_hash({"title": "My  clip ", "tags": ["Cats", "#funny"]})
+    assert base == metadata_hash({"tags": ["funny", "cats"], "title": "My clip", "account": "alt"})
+    assert base != metadata_hash({"title": "My clip!", "tags": ["cats", "funny"]})
+
+def test_video_publisher_skips_already_published(tmp_path):
+    from video_publisher.core.ledger import PublicationLedger
+
+    video = tmp_path / "clip.mp4"
+    video.write_bytes(b"fake video bytes")
+    publisher = _publisher_with_fake_uploaders(tmp_path, {Platform.YOUTUBE: 0, Platform.TIKTOK: 0})
+    publisher.ledger = PublicationLedger(str(tmp_path / "ledger.db"))
+    metadata = {"title": "Test", "tags": ["a", "b"]}
+
+    first = publisher.upload(str(video), platforms=[Platform.YOUTUBE], metadata=metadata)
+    assert first[0].success and not first[0].already_published
+    assert publisher.ledger.count() == 1
+
+    # Same content and metadata (tags reordered): YouTube is skipped, TikTok is new
+    again = publisher.upload(str(video), platforms=[Platform.YOUTUBE, Platform.TIKTOK],
+                             metadata={"title": "Test", "tags": ["b", "a"]})
+    assert again[0].already_published and again[0].success
+    assert not again[1].already_published
+    assert publisher.uploaders[Platform.YOUTUBE].upload.call_count == 1
+    assert publisher.rate_limiter.get_remaining(Platform.YOUTUBE) == publisher.rate_limiter.get_limit(Platform.YOUTUBE) - 1
+
+    # Changed metadata or force publishes again
+    publisher.upload(str(video), platforms=[Platform.YOUTUBE], metadata={"title": "Other"})
+    publisher.upload(str(video), platforms=[Platform.YOUTUBE], metadata=metadata, force=True)
+    assert publisher.uploaders[Platform.YOUTUBE].upload.call_count == 3
+
+def test_video_publisher_checks_near_duplicates(tmp_path):
+    np = pytest.importorskip("numpy")
+    pytest.importorskip("cv2")
+    from video_publisher.core.ledger import PublicationLedger
+    from video_publisher.media import FingerprintIndex
+
+    original, repost = tmp_path / "clip.mp4", tmp_path / "clip_reencoded.mp4"
+    original.write_bytes(b"original bytes")
+    repost.write_bytes(b"re-encoded bytes")
+    frames = np.arange(1, 11, dtype=np.uint64) * np.uint64(0x9E3779B97F4A7C15)
+    publisher = _publisher_with_fake_uploaders(tmp_path, {Platform.TIKTOK: 0})
+    publisher.ledger = PublicationLedger(str(tmp_path / "ledger.db"))
+    publisher._fingerprints = FingerprintIndex(str(tmp_path / "fingerprints.db"))
+    # The re-encode differs by a couple of bits per frame
+    publisher.fingerprint_for = lambda path: frames if path == str(original) else frames ^ np.uint64(0b101)
+    publisher.duplicate_check = "block"
+
+    assert publisher.upload(str(original), platforms=[Platform.TIKTOK])[0].success
+    assert len(publisher.fingerprints) == 1
+    # The same file again is the ledger's business
+    assert publisher.upload(str(original), platforms=[Platform.TIKTOK], metadata={"title": "x"})[0].success
+
+    blocked = publisher.upload(str(repost), platforms=[Platform.TIKTOK])
+    assert blocked[0].success is False
+    assert "Near-duplicate of clip.mp4" in blocked[0].error and "100% of frames" in blocked[0].error
+    assert publisher.uploaders[Platform.TIKTOK].upload.call_count == 2
+
+    assert publisher.upload(str(repost), platforms=[Platform.TIKTOK], force=True)[0].success
+    publisher.duplicate_check = "warn"
+    assert publisher.upload(str(repost), platforms=[Platform.TIKTOK], metadata={"title": "y"})[0].success
+
+def test_video_publisher_builds_uploaders_lazily():
+    youtube_cls, tiktok_cls, instagram_cls = MagicMock(), MagicMock(), MagicMock()
+    classes = {Platform.YOUTUBE: youtube_cls, Platform.TIKTOK: tiktok_cls, Platform.INSTAGRAM: instagram_cls}
+    with patch('video_publisher.core.engine._uploader_class', side_effect=classes.get):
+        publisher = VideoPublisher()
+        assert Platform.TIKTOK in publisher.uploaders
+        assert not (youtube_cls.called or tiktok_cls.called or instagram_cls.called)
+
+        assert publisher.get_uploader(Platform.TIKTOK) is tiktok_cls.return_value
+        assert not youtube_cls.called and not instagram_cls.called
+
+        # YouTube Shorts shares the YouTube client
+        assert publisher.uploaders[Platform.YOUTUBE_SHORTS] is publisher.uploaders[Platform.YOUTUBE]
+        assert youtube_cls.call_count == 1
@@ -0,0 +1,58 @@
+import os
+import sys
+import json
+import subprocess
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Modules that must only be imported when an upload or analysis actually needs them
+HEAVY_MODULES = [
+    'selenium',
+    'undetected_chromedriver',
+    'googleapiclient',
+    'google_auth_oauthlib',
+    'moviepy',
+    'numpy',
+    'jsonschema',
+    'pydantic',
+]
+
+# Generous default so slow CI machines pass; a heavy import sneaking back in costs > 1s
+IMPORT_BUDGET_MS = float(os.getenv('IMPORT_BUDGET_MS', '600'))
+
+def run_import(module: str) -> dict:
+    """Import a module in a fresh interpreter and report its import time and loaded heavy modules."""
+    script = (
+        "import sys, time, json\n"
+        "start = time.perf_counter()\n"
+        f"import {module}\n"
+        "elapsed = (time.perf_counter() - start) * 1000\n"
+        f"heavy = [m for m in {HEAVY_MODULES!r} if m in sys.modules]\n"
+        "print(json.dumps({'ms': elapsed, 'heavy': heavy}))\n"
+    )
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join([str(ROOT), str(ROOT / 'src'), env.get('PYTHONPATH', '')])
+    output = subprocess.run([sys.executable, "-c", script], cwd=ROOT, env=env,
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+@pytest.mark.parametrize("module", ["video_publisher", "cli.main"])
+def test_import_does_not_load_heavy_dependencies(module):
+    assert run_import(module)['heavy'] == []
+
+@pytest.mark.parametrize("module", ["video_publisher", "cli.main"])
+def test_import_time_budget(module):
+    # Best of a few runs to smooth out a cold disk cache
+    elapsed = min(run_import(module)['ms'] for _ in range(3))
+    assert elapsed < IMPORT_BUDGET_MS, f"import {module} took {elapsed:.0f}ms (budget {IMPORT_BUDGET_MS:.0f}ms)"
+
+def test_lazy_public_names_still_resolve():
+    import video_publisher
+
+    assert video_publisher.Platform.YOUTUBE.value == 'youtube'
+    assert 'VideoPublisher' in dir(video_publisher)
+    with pytest.raises(AttributeError):
+        video_publisher.NotARealName
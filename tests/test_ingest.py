@@ -0,0 +1,34 @@
+import io
+import hashlib
+
+import pytest
+
+from video_publisher.core import ingest as ingest_module
+from video_publisher.core.hashing import file_content_hash
+from video_publisher.core.ingest import ingest
+from tests.test_probe import box, make_mp4
+
+# --- Ingest Tests ---
+def test_ingest_hashes_and_probes_while_writing(tmp_path, monkeypatch):
+    data = make_mp4(width=1080, height=1920, mdat_size=3 * 1024 * 1024)  # moov in the last MB
+    monkeypatch.setattr(ingest_module, "probe", lambda path: pytest.fail("probed from disk"))
+    result = ingest(io.BytesIO(data), str(tmp_path / "clip.mp4"), chunk_size=64 * 1024)
+
+    assert result.content_hash == hashlib.sha256(data).hexdigest()
+    assert result.size == len(data) and (tmp_path / "clip.mp4").read_bytes() == data
+    assert (result.video_metadata.width, result.video_metadata.height) == (1080, 1920)
+    assert result.video_metadata.path == str(tmp_path / "clip.mp4")
+    assert list(tmp_path.iterdir()) == [tmp_path / "clip.mp4"]
+
+    # Known without reading the file again
+    monkeypatch.setattr("builtins.open", lambda *args, **kwargs: pytest.fail("file read again"))
+    assert file_content_hash(str(tmp_path / "clip.mp4")) == result.content_hash
+
+def test_ingest_probes_from_disk_when_headers_are_not_buffered(tmp_path):
+    # The moov box sits between two large boxes, outside the buffered ends
+    data = make_mp4(seconds=42.0, mdat_size=1536 * 1024) + box(b'free', b'\0' * 1536 * 1024)
+    result = ingest(io.BytesIO(data), str(tmp_path / "clip.mp4"))
+    assert result.video_metadata.duration == pytest.approx(42.0)
+
+    result = ingest(io.BytesIO(b"not a video"), str(tmp_path / "broken.mp4"))
+    assert result.video_metadata is None and result.size == 11
@@ -37,6 +37,26 @@ def test_library_upload_video_auto_detect(mock_get_publisher):
     # Just verify upload was called
     mock_publisher.upload.assert_called_once()
 
+@patch('video_publisher.get_publisher')
+def test_library_upload_video_async_forwards_cancel_token(mock_get_publisher):
+    """Async callers can pass a cancellation token and an earlier analysis."""
+    import asyncio
+    from unittest.mock import AsyncMock
+    from video_publisher import upload_video_async
+    from video_publisher.core.cancellation import CancellationToken
+
+    mock_publisher = MagicMock()
+    mock_publisher.upload_async = AsyncMock(return_value=[])
+    mock_get_publisher.return_value = mock_publisher
+    token = CancellationToken()
+    video_metadata = MagicMock()
+
+    asyncio.run(upload_video_async('test.mp4', video_metadata=video_metadata, cancel_token=token))
+
+    kwargs = mock_publisher.upload_async.call_args.kwargs
+    assert kwargs['cancel_token'] is token
+    assert kwargs['video_metadata'] is video_metadata
+
 def test_library_get_publisher():
     """Test get_publisher returns singleton instance."""
     publisher1 = get_publisher()
@@ -63,6 +83,48 @@ def test_cli_upload_command(mock_upload):
         assert result.exit_code == 0
         mock_upload.assert_called_once()
 
+def test_cli_upload_prepares_next_video_during_upload(tmp_path):
+    """Batch uploads analyze the next video while the current one uploads."""
+    import time
+    from video_publisher.core.models import VideoMetadata
+
+    videos = []
+    for name in ("a", "b", "c"):
+        video = tmp_path / f"{name}.mp4"
+        video.write_bytes(b"fake video content")
+        videos.append(video)
+    (tmp_path / "b.json").write_text('{"title": "From sidecar"}')
+
+    events = []
+    def analyze(path, content_hash=None):
+        events.append(("analyze", Path(path).name))
+        time.sleep(0.1)
+        return VideoMetadata(path=path, duration=10, width=1920, height=1080, aspect_ratio=16 / 9)
+
+    def upload(path, **kwargs):
+        events.append(("upload", Path(path).name))
+        assert kwargs['video_metadata'].path == path
+        time.sleep(0.3)
+        events.append(("uploaded", Path(path).name))
+        return [UploadResult(platform=Platform.YOUTUBE, success=True, url=f"https://youtube.com/{Path(path).stem}")]
+
+    publisher = MagicMock()
+    publisher.analyzer.analyze.side_effect = analyze
+    publisher.ledger = None
+    with patch('cli.main.get_publisher', return_value=publisher), \
+            patch('cli.main.upload_video', side_effect=upload) as mock_upload:
+        result = runner.invoke(cli_app, ['upload', *map(str, videos), '--platforms', 'youtube', '--prefetch', '1'])
+
+    assert result.exit_code == 0, result.output
+    assert mock_upload.call_count == 3
+    assert mock_upload.call_args_list[1].kwargs['metadata']['title'] == "From sidecar"
+    # b.mp4 is analyzed while a.mp4 uploads, c.mp4 while b.mp4 uploads
+    assert events.index(("analyze", "b.mp4")) < events.index(("uploaded", "a.mp4"))
+    assert events.index(("analyze", "c.mp4")) < events.index(("uploaded", "b.mp4"))
+    # Only one video is prepared ahead with --prefetch 1
+    assert events.index(("analyze", "c.mp4")) > events.index(("uploaded", "a.mp4"))
+    assert result.output.index("a.mp4") < result.output.index("b.mp4") < result.output.index("c.mp4")
+
 def test_cli_version_command():
     """Test CLI version command."""
     result = runner.invoke(cli_app, ['version'])
@@ -126,3 +188,267 @@ def test_api_status_not_found(api_client):
     """Test API status with invalid upload ID."""
     response = api_client.get('/status/invalid-id')
     assert response.status_code == 404
+
+def test_ingest_request_streams_uploads_into_place(tmp_path):
+    """Uploaded videos are written, hashed and probed while the request is parsed."""
+    import hashlib
+    import io
+    from flask import Flask, jsonify, request
+    from api.ingest import IngestRequest
+    from video_publisher.core.ingest import IngestFile, save_upload
+    from tests.test_probe import make_mp4
+
+    app = Flask(__name__)
+    app.request_class = IngestRequest
+    app.config['UPLOAD_FOLDER'] = tmp_path
+
+    @app.route('/upload', methods=['POST'])
+    def upload():
+        file = request.files['video']
+        assert isinstance(file.stream, IngestFile)
+        if request.form.get('keep') != 'true':
+            return jsonify({})
+        result = save_upload(file, str(tmp_path / "saved.mp4"))
+        return jsonify({'hash': result.content_hash, 'width': result.video_metadata.width})
+
+    data = make_mp4(width=1280, height=720, mdat_size=2 * 1024 * 1024)
+    with app.test_client() as client:
+        response = client.post('/upload', data={'keep': 'true', 'video': (io.BytesIO(data), 'clip.mp4')},
+                               content_type='multipart/form-data')
+        assert response.get_json() == {'hash': hashlib.sha256(data).hexdigest(), 'width': 1280}
+        assert (tmp_path / "saved.mp4").read_bytes() == data
+
+        # Uploads the route doesn't keep are deleted with the request
+        client.post('/upload', data={'video': (io.BytesIO(data), 'other.mp4')}, content_type='multipart/form-data')
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["saved.mp4"]
+
+@pytest.fixture
+def web_client(tmp_path, monkeypatch):
+    """Create a Flask test client for the web UI and /api blueprints, storing everything in tmp_path."""
+    from api import api_routes, web_routes
+    from upload_manager import UploadManager
+    from video_publisher.jobs import JobStore
+    from video_publisher.core.resumable import ResumableUploads
+
+    monkeypatch.setattr(api_routes, 'worker_pool', None)
+    monkeypatch.setattr(api_routes, 'job_store', JobStore(str(tmp_path / "jobs.db")))
+    monkeypatch.setattr(api_routes, 'resumable_uploads',
+                        ResumableUploads(str(tmp_path / "partial"), max_size=1024 * 1024))
+    monkeypatch.setattr(web_routes, 'upload_mgr', UploadManager(str(tmp_path / "uploads")))
+    from app import create_app
+    app = create_app()
+    app.config['TESTING'] = True
+    app.config['UPLOAD_FOLDER'] = tmp_path
+    with app.test_client() as client:
+        yield client
+
+def test_web_upload_with_analysis_cache_disabled(web_client, monkeypatch):
+    """ANALYSIS_CACHE_SIZE=0 disables the cache without breaking web uploads."""
+    import io
+    from tests.test_probe import make_mp4
+
+    monkeypatch.setenv('ANALYSIS_CACHE_SIZE', '0')
+    response = web_client.post('/upload', data={'video': (io.BytesIO(make_mp4()), 'clip.mp4')},
+                               content_type='multipart/form-data')
+    assert response.status_code == 302
+    assert '/config/' in response.headers['Location']
+
+def test_resumable_upload_assembles_out_of_order_chunks(tmp_path):
+    import base64
+    import hashlib
+    import io
+    from tests.test_probe import make_mp4
+    from video_publisher.core.resumable import (ChecksumMismatch, OffsetConflict, ResumableUploads,
+                                                UploadNotFound, parse_checksum, parse_metadata)
+
+    data = make_mp4(width=1080, height=1920, mdat_size=300 * 1024)
+    uploads = ResumableUploads(str(tmp_path / "partial"))
+    metadata = parse_metadata("filename " + base64.b64encode(b"clip.mp4").decode() + ",force")
+    assert metadata == {'filename': 'clip.mp4', 'force': ''}
+    upload_id = uploads.create(len(data), metadata)
+
+    chunk = 64 * 1024
+    pieces = [(offset, data[offset:offset + chunk]) for offset in range(0, len(data), chunk)]
+    # A corrupted chunk is refused and can be sent again
+    digest = base64.b64encode(hashlib.sha256(pieces[1][1]).digest()).decode()
+    with pytest.raises(ChecksumMismatch):
+        uploads.write(upload_id, pieces[1][0], io.BytesIO(b"x" * chunk), chunk, parse_checksum("sha256 " + digest))
+    assert uploads.get(upload_id)['ranges'] == []
+
+    for offset, piece in (pieces[1], pieces[-1]):
+        assert not uploads.write(upload_id, offset, io.BytesIO(piece), len(piece),
+                                 parse_checksum("sha256 " + digest) if offset == pieces[1][0] else None)
+    with pytest.raises(OffsetConflict):
+        uploads.write(upload_id, pieces[1][0] + 10, io.BytesIO(b"x" * 10), 10)
+    state = uploads.get(upload_id)
+    assert state['offset'] == 0 and len(state['ranges']) == 2
+
+    # A client resuming sends what the ranges say is missing
+    completed = [uploads.write(upload_id, offset, io.BytesIO(piece), len(piece))
+                 for offset, piece in pieces
+                 if not any(start <= offset < end for start, end in state['ranges'])]
+    assert completed[-1] and not any(completed[:-1])
+    assert uploads.get(upload_id)['offset'] == len(data)
+
+    result = uploads.finish(upload_id, str(tmp_path / "clip.mp4"))
+    assert (tmp_path / "clip.mp4").read_bytes() == data
+    assert result.content_hash == hashlib.sha256(data).hexdigest()
+    assert (result.video_metadata.width, result.video_metadata.height) == (1080, 1920)
+    # Finishing again (a retried request) gives the same result
+    assert uploads.finish(upload_id, str(tmp_path / "clip.mp4")).content_hash == result.content_hash
+    # Still reported complete to a client that lost the last response
+    assert uploads.get(upload_id)['offset'] == len(data)
+    with pytest.raises(OffsetConflict):
+        uploads.write(upload_id, pieces[-1][0], io.BytesIO(pieces[-1][1]), len(pieces[-1][1]))
+    uploads.delete(upload_id)
+    with pytest.raises(UploadNotFound):
+        uploads.get(upload_id)
+
+def test_resumable_uploads_expire(tmp_path):
+    import io
+    from video_publisher.core.resumable import ResumableUploads, UploadNotFound, UploadTooLarge
+
+    uploads = ResumableUploads(str(tmp_path), max_size=1024, expire_after=-1)
+    with pytest.raises(UploadTooLarge):
+        uploads.create(2048)
+    stale = uploads.create(100)
+    uploads.write(stale, 0, io.BytesIO(b"a" * 10), 10)
+    uploads.create(100)
+    assert not (tmp_path / f"{stale}.part").exists()
+    with pytest.raises(UploadNotFound):
+        uploads.get(stale)
+    with pytest.raises(UploadTooLarge):
+        uploads.write(uploads.create(100), 90, io.BytesIO(b"a" * 20), 20)
+
+def test_resumable_upload_claims_chunks_before_writing(tmp_path):
+    """A chunk racing or failing its checksum never alters bytes another request wrote."""
+    import base64
+    import hashlib
+    import io
+    from video_publisher.core.resumable import (ChecksumMismatch, OffsetConflict, ResumableUploads,
+                                                parse_checksum)
+
+    # No memory budget: the chunk sent ahead is read back from disk on finish
+    uploads = ResumableUploads(str(tmp_path / "partial"), hash_buffer=0)
+    data = bytes(range(256)) * 256
+    half = len(data) // 2
+    upload_id = uploads.create(len(data))
+
+    digest = base64.b64encode(hashlib.sha256(data[half:]).digest()).decode()
+    with pytest.raises(ChecksumMismatch):
+        uploads.write(upload_id, half, io.BytesIO(b"x" * half), half, parse_checksum("sha256 " + digest))
+    assert not uploads.write(upload_id, half, io.BytesIO(data[half:]), half, parse_checksum("sha256 " + digest))
+
+    class RacingStream(io.BytesIO):
+        def read(self, size=-1):
+            # Another request sends overlapping bytes while this chunk is being received
+            with pytest.raises(OffsetConflict):
+                uploads.write(upload_id, 10, io.BytesIO(b"x" * 10), 10)
+            return super().read(size)
+
+    assert uploads.write(upload_id, 0, RacingStream(data[:half]), half)
+    with pytest.raises(OffsetConflict):
+        uploads.write(upload_id, half - 5, io.BytesIO(b"x" * 10), 10)
+
+    result = uploads.finish(upload_id, str(tmp_path / "clip.bin"))
+    assert (tmp_path / "clip.bin").read_bytes() == data
+    assert result.content_hash == hashlib.sha256(data).hexdigest()
+
+def _tus_metadata(**values):
+    import base64
+    return ','.join(f"{key} {base64.b64encode(value.encode()).decode()}" for key, value in values.items())
+
+def test_api_resumable_upload_endpoints(web_client):
+    """Chunks can be sent out of order and resent; the video is queued once complete."""
+    import base64
+    import hashlib
+    from api import api_routes
+    from tests.test_probe import make_mp4
+
+    tus = {'Tus-Resumable': '1.0.0'}
+    data = make_mp4(width=1080, height=1920, mdat_size=200 * 1024)
+
+    too_large = web_client.post('/api/uploads', headers={
+        **tus, 'Upload-Length': str(2 * 1024 * 1024), 'Upload-Metadata': _tus_metadata(filename='clip.mp4')})
+    assert too_large.status_code == 413
+    bad_type = web_client.post('/api/uploads', headers={
+        **tus, 'Upload-Length': str(len(data)), 'Upload-Metadata': _tus_metadata(filename='clip.exe')})
+    assert bad_type.status_code == 400
+
+    response = web_client.post('/api/uploads', headers={
+        **tus, 'Upload-Length': str(len(data)), 'Upload-Metadata': _tus_metadata(filename='clip.mp4', title='Resumed')})
+    assert response.status_code == 201
+    assert response.headers['Upload-Offset'] == '0'
+    url = response.headers['Location']
+    upload_id = url.rsplit('/', 1)[1]
+
+    def patch(offset, body, **headers):
+        return web_client.patch(url, data=body, content_type='application/offset+octet-stream',
+                                headers={**tus, 'Upload-Offset': str(offset), **headers})
+
+    chunk = 64 * 1024
+    pieces = [(offset, data[offset:offset + chunk]) for offset in range(0, len(data), chunk)]
+    digest = base64.b64encode(hashlib.sha256(pieces[1][1]).digest()).decode()
+    assert patch(pieces[1][0], b"x" * chunk, **{'Upload-Checksum': 'sha256 ' + digest}).status_code == 460
+    response = patch(pieces[1][0], pieces[1][1], **{'Upload-Checksum': 'sha256 ' + digest})
+    assert response.status_code == 204
+    assert response.headers['Upload-Offset'] == '0'
+    assert patch(pieces[1][0], pieces[1][1]).status_code == 409
+    assert patch(len(data) - 10, b"x" * 20).status_code == 413
+
+    response = web_client.head(url, headers=tus)
+    assert response.headers['Upload-Ranges'] == f"{chunk}-{2 * chunk}"
+    assert api_routes.job_store.get(upload_id) is None
+
+    for offset, piece in pieces[:1] + pieces[2:]:
+        response = patch(offset, piece)
+        assert response.status_code == 204
+    assert response.headers['Upload-Offset'] == str(len(data))
+
+    job = api_routes.job_store.get(upload_id)
+    assert job['status'] == 'queued'
+    assert job['payload']['metadata'] == {'title': 'Resumed'}
+    assert job['payload']['content_hash'] == hashlib.sha256(data).hexdigest()
+    with open(job['payload']['video_path'], 'rb') as f:
+        assert f.read() == data
+    assert web_client.get(f'/api/status/{upload_id}').get_json()['status'] == 'queued'
+
+    # A client that lost the last response finds the upload complete, not gone
+    response = web_client.head(url, headers=tus)
+    assert response.status_code == 200
+    assert response.headers['Upload-Offset'] == response.headers['Upload-Length'] == str(len(data))
+    assert patch(*pieces[-1]).status_code == 409
+    assert web_client.head('/api/uploads/unknown', headers=tus).status_code == 404
+
+def test_api_queues_complete_resumable_upload_on_retry(web_client):
+    """An upload completed by a request that never queued it is queued by the client's next request."""
+    import io
+    from api import api_routes
+    from tests.test_probe import make_mp4
+
+    tus = {'Tus-Resumable': '1.0.0'}
+    data = make_mp4(width=1080, height=1920)
+    for method in ('head', 'patch'):
+        response = web_client.post('/api/uploads', headers={
+            **tus, 'Upload-Length': str(len(data)), 'Upload-Metadata': _tus_metadata(filename='clip.mp4')})
+        url = response.headers['Location']
+        upload_id = url.rsplit('/', 1)[1]
+        # As if the process died between the last write and queueing the job
+        assert api_routes.resumable_uploads.write(upload_id, 0, io.BytesIO(data), len(data))
+        assert api_routes.job_store.get(upload_id) is None
+
+        if method == 'head':
+            response = web_client.head(url, headers=tus)
+            assert response.status_code == 200
+        else:
+            response = web_client.patch(url, data=data, content_type='application/offset+octet-stream',
+                                        headers={**tus, 'Upload-Offset': '0'})
+            assert response.status_code == 204
+        assert response.headers['Upload-Offset'] == str(len(data))
+        job = api_routes.job_store.get(upload_id)
+        assert job['status'] == 'queued'
+        with open(job['payload']['video_path'], 'rb') as f:
+            assert f.read() == data
+        # Already queued: asked again, nothing changes
+        assert web_client.head(url, headers=tus).status_code == 200
+        assert api_routes.job_store.get(upload_id)['created_at'] == job['created_at']
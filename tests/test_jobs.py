@@ -0,0 +1,259 @@
+import time
+import threading
+import pytest
+
+from video_publisher.jobs import JobStore, JobStatus, WorkerPool
+
+@pytest.fixture
+def store(tmp_path):
+    return JobStore(str(tmp_path / "jobs.db"))
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+# --- JobStore Tests ---
+def test_job_store_lifecycle(store):
+    job = store.enqueue({'video_path': 'a.mp4'}, job_id='job-1')
+    assert job['status'] == JobStatus.QUEUED
+    assert job['payload'] == {'video_path': 'a.mp4'}
+
+    claimed = store.claim('worker-a')
+    assert claimed['id'] == 'job-1'
+    assert claimed['status'] == JobStatus.PROCESSING
+    assert store.claim('worker-b') is None
+
+    store.complete('job-1', [{'platform': 'youtube', 'success': True}])
+    job = store.get('job-1')
+    assert job['status'] == JobStatus.COMPLETED
+    assert job['results'][0]['success'] is True
+    assert store.counts()['completed'] == 1
+
+def test_job_store_persists_across_instances(tmp_path):
+    JobStore(str(tmp_path / "jobs.db")).enqueue({'n': 1}, job_id='persisted')
+    assert JobStore(str(tmp_path / "jobs.db")).get('persisted')['payload'] == {'n': 1}
+
+def test_job_store_expired_lease_is_reclaimed(store):
+    store.enqueue({}, job_id='crashed')
+    store.claim('dead-worker', lease=0.05)
+    assert store.claim('other-worker') is None  # still leased
+
+    time.sleep(0.1)
+    claimed = store.claim('other-worker')
+    assert claimed['id'] == 'crashed'
+    assert claimed['attempts'] == 2
+    # The original worker lost the job and can no longer record an outcome
+    assert store.complete('crashed', [], worker_id='dead-worker') is False
+    assert store.extend_leases(['crashed'], 'dead-worker') == []
+    assert store.extend_leases(['crashed'], 'other-worker') == ['crashed']
+
+def test_job_store_release_and_attempt_limit(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.db"), max_attempts=2)
+    store.enqueue({}, job_id='job')
+
+    store.claim('worker-a')
+    assert store.release('job', 'worker-a')
+    assert store.get('job')['status'] == JobStatus.QUEUED
+    assert store.get('job')['attempts'] == 0
+
+    store.claim('worker-a', lease=-1)
+    store.claim('worker-b', lease=-1)
+    assert store.recover_expired() == 1
+    job = store.get('job')
+    assert job['status'] == JobStatus.FAILED
+    assert 'lost the job' in job['error']
+
+# --- WorkerPool Tests ---
+def test_worker_pool_bounded_concurrency(store):
+    running = []
+    peak = []
+    lock = threading.Lock()
+
+    def handler(payload):
+        with lock:
+            running.append(payload['n'])
+            peak.append(len(running))
+        time.sleep(0.05)
+        with lock:
+            running.remove(payload['n'])
+        if payload['n'] == 3:
+            raise RuntimeError("boom")
+        return [{'n': payload['n']}]
+
+    for n in range(6):
+        store.enqueue({'n': n})
+
+    pool = WorkerPool(store, handler, concurrency=2, poll_interval=0.05)
+    pool.start()
+    try:
+        assert wait_for(lambda: store.counts()['queued'] == 0 and store.counts()['processing'] == 0)
+    finally:
+        pool.stop(timeout=2)
+
+    counts = store.counts()
+    assert counts['completed'] == 5
+    assert counts['failed'] == 1
+    assert max(peak) <= 2
+
+def test_worker_pool_survives_store_errors(store, monkeypatch):
+    """A worker whose outcome can't be recorded keeps processing jobs."""
+    import sqlite3
+
+    def handler(payload):
+        if payload['n'] == 0:
+            raise RuntimeError("boom")
+        return []
+
+    real_fail = store.fail
+    failures = []
+    def locked_fail(*args, **kwargs):
+        if not failures:
+            failures.append(args[0])
+            raise sqlite3.OperationalError("database is locked")
+        return real_fail(*args, **kwargs)
+    monkeypatch.setattr(store, 'fail', locked_fail)
+
+    store.enqueue({'n': 0}, job_id='first')
+    store.enqueue({'n': 1}, job_id='second')
+    pool = WorkerPool(store, handler, concurrency=1, poll_interval=0.05)
+    pool.start()
+    try:
+        assert wait_for(lambda: store.get('second')['status'] == JobStatus.COMPLETED, timeout=2)
+    finally:
+        pool.stop(timeout=2)
+    assert failures == ['first']
+    # Still leased: retried once the lease expires
+    assert store.get('first')['status'] == JobStatus.PROCESSING
+
+def test_worker_processes_share_queue(tmp_path):
+    import subprocess
+    import sys
+
+    db_path = tmp_path / "jobs.db"
+    store = JobStore(str(db_path))
+    for n in range(6):
+        store.enqueue({'n': n})
+
+    script = (
+        "import sys, time\n"
+        "from video_publisher.jobs import JobStore, WorkerPool\n"
+        "def handler(payload):\n"
+        "    time.sleep(0.5)\n"
+        "    return [{'n': payload['n']}]\n"
+        "store = JobStore(sys.argv[1])\n"
+        "pool = WorkerPool(store, handler, concurrency=1, poll_interval=0.05)\n"
+        "pool.start()\n"
+        "deadline = time.time() + 20\n"
+        "while time.time() < deadline and store.counts()['completed'] < 6:\n"
+        "    time.sleep(0.05)\n"
+        "pool.stop(timeout=2)\n"
+    )
+    workers = [subprocess.Popen([sys.executable, "-c", script, str(db_path)]) for _ in range(2)]
+    for worker in workers:
+        assert worker.wait(timeout=30) == 0
+
+    assert store.counts()['completed'] == 6
+    rows = store._connect().execute("SELECT worker_id, attempts FROM jobs").fetchall()
+    assert len({row['worker_id'] for row in rows}) == 2  # both processes took jobs
+    assert all(row['attempts'] == 1 for row in rows)  # and no job ran twice
+
+def test_scheduled_jobs_wait_until_due(store):
+    now = time.time()
+    store.enqueue({'n': 'later'}, job_id='later', run_at=now + 3600)
+    store.enqueue({'n': 'soon'}, job_id='soon', run_at=now + 0.1)
+    store.enqueue({'n': 'now'}, job_id='now')
+
+    assert store.claim('w')['id'] == 'now'
+    assert store.claim('w') is None
+    assert store.counts()['scheduled'] == 2
+    assert store.next_run_at() == pytest.approx(now + 0.1)
+
+    time.sleep(0.15)
+    assert store.claim('w')['id'] == 'soon'
+    assert store.claim('w') is None
+
+def test_worker_pool_sleeps_until_next_deadline(store):
+    done = []
+    pool = WorkerPool(store, lambda payload: done.append(time.time()) or [], concurrency=1, poll_interval=None)
+    pool.start()
+    try:
+        run_at = time.time() + 0.3
+        store.enqueue({}, run_at=run_at)
+        pool.notify()
+        assert wait_for(lambda: done)
+        assert done[0] >= run_at
+    finally:
+        pool.stop(timeout=2)
+
+def test_job_store_cancel(store):
+    store.enqueue({}, job_id='queued')
+    assert store.cancel('queued')['status'] == JobStatus.CANCELLED
+    assert store.claim('w') is None
+    assert store.cancel('missing') is None
+
+    store.enqueue({}, job_id='running')
+    store.claim('w')
+    assert store.cancel('running')['status'] == JobStatus.PROCESSING
+    assert store.cancel_requested(['running']) == ['running']
+    # A flagged job is not put back in the queue
+    assert store.release('running', 'w')
+    assert store.get('running')['status'] == JobStatus.CANCELLED
+    assert store.get('running')['finished_at'] is not None
+
+def test_worker_pool_cancels_running_job(store):
+    from video_publisher.core.cancellation import current_token
+
+    started = threading.Event()
+
+    def handler(payload):
+        started.set()
+        current_token().wait(10)
+        return [{'platform': 'tiktok', 'success': False, 'error': 'Cancelled'}]
+
+    store.enqueue({}, job_id='long')
+    pool = WorkerPool(store, handler, concurrency=1, poll_interval=0.05, cancel_check_interval=0.05)
+    pool.start()
+    try:
+        assert started.wait(2)
+        store.cancel('long')  # e.g. from the API process
+        assert wait_for(lambda: store.get('long')['status'] == JobStatus.CANCELLED, timeout=2)
+        assert store.get('long')['results'][0]['error'] == 'Cancelled'
+    finally:
+        pool.stop(timeout=2)
+
+def test_extract_run_at_moves_schedule_to_queue():
+    from video_publisher.jobs import extract_run_at
+
+    payload = {'video_path': 'a.mp4', 'metadata': {'title': 'x', 'scheduling': {
+        'publish_now': False, 'scheduled_time': '2999-01-01T10:00:00Z'}}}
+    scheduled, run_at = extract_run_at(payload)
+    assert run_at == pytest.approx(32472180000.0)
+    assert scheduled['metadata']['scheduling'] == {'publish_now': True, 'scheduled_time': None}
+    assert scheduled['scheduled_time'] == '2999-01-01T10:00:00Z'
+    assert payload['metadata']['scheduling']['publish_now'] is False  # original untouched
+
+    assert extract_run_at({'metadata': {'title': 'x'}}) == ({'metadata': {'title': 'x'}}, None)
+    with pytest.raises(ValueError):
+        extract_run_at({'metadata': {'scheduling': {'scheduled_time': 'next tuesday'}}})
+
+def test_run_upload_job_reuses_ingest_hash_and_analysis(tmp_path):
+    from unittest.mock import patch
+    from video_publisher.core.hashing import file_content_hash
+    from video_publisher.core.models import VideoMetadata
+    from video_publisher.jobs import run_upload_job
+
+    video = tmp_path / "clip.mp4"
+    video.write_bytes(b"video bytes")
+    metadata = VideoMetadata(path=str(video), duration=12, width=1080, height=1920, aspect_ratio=0.5625, codec="h264")
+    payload = {'video_path': str(video), 'platforms': ['tiktok'], 'metadata': {}, 'cleanup': False,
+               'content_hash': "f" * 64, 'video_metadata': metadata.model_dump()}
+
+    with patch('video_publisher.upload_video', return_value=[]) as mock_upload:
+        run_upload_job(payload)
+    assert mock_upload.call_args.kwargs['video_metadata'] == metadata
+    # The hash computed during the upload is trusted instead of reading the file again
+    assert file_content_hash(str(video)) == "f" * 64
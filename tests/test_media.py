@@ -0,0 +1,233 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+cv2 = pytest.importorskip("cv2")
+
+def write_video(path, frames, fps=10):
+    height, width = frames[0].shape[:2]
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*'mp4v'), fps, (width, height))
+    if not writer.isOpened():
+        pytest.skip("OpenCV build cannot write MP4 files")
+    for frame in frames:
+        writer.write(frame)
+    writer.release()
+
+def checkerboard(width=160, height=120, cell=8):
+    y, x = np.mgrid[0:height, 0:width]
+    board = (((x // cell) + (y // cell)) % 2 * 200 + 28).astype(np.uint8)
+    return cv2.cvtColor(board, cv2.COLOR_GRAY2BGR)
+
+# --- Cover Tests ---
+def test_frame_metrics_rank_sharp_exposed_frames_first():
+    from video_publisher.media.covers import frame_metrics, score
+
+    sharp = cv2.cvtColor(checkerboard(), cv2.COLOR_BGR2GRAY)
+    blurred = cv2.GaussianBlur(sharp, (15, 15), 5)
+    smeared = cv2.blur(sharp, (25, 1))  # horizontal motion blur
+    black = np.zeros_like(sharp)
+    stack = np.stack([blurred, sharp, smeared, black]).astype(np.float32) / 255.0
+
+    metrics = frame_metrics(stack)
+    assert metrics['sharpness'].argmax() == 1
+    assert metrics['motion_blur'].argmax() == 2
+    assert metrics['exposure'][3] == 0
+
+    metrics['faces'] = np.zeros(4)
+    scores = score(metrics)
+    assert scores.argmax() == 1
+    assert scores.argmin() == 3
+
+def test_select_cover_picks_sharp_frame_and_caches(tmp_path):
+    from video_publisher.media import select_cover
+
+    sharp = checkerboard()
+    blurred = cv2.GaussianBlur(sharp, (21, 21), 8)
+    black = np.zeros_like(sharp)
+    # 2s fade from black, 2s blurry, 2s sharp, 2s blurry
+    frames = [black] * 20 + [blurred] * 20 + [sharp] * 20 + [blurred] * 20
+    video = tmp_path / "clip.mp4"
+    write_video(video, frames)
+
+    cover = select_cover(str(video), content_hash="abc", cache_dir=str(tmp_path / "covers"))
+    assert cover == str(tmp_path / "covers" / "abc.jpg")
+    image = cv2.imread(cover, cv2.IMREAD_GRAYSCALE)
+    assert image.shape == (120, 160)
+    assert cv2.Laplacian(image, cv2.CV_64F).var() > 1000  # the sharp frame, not a blurry one
+
+    # Cached by content hash: not read from the video again
+    video.unlink()
+    assert select_cover(str(video), content_hash="abc", cache_dir=str(tmp_path / "covers")) == cover
+
+def test_select_cover_unreadable_video(tmp_path):
+    from video_publisher.media import select_cover
+
+    video = tmp_path / "broken.mp4"
+    video.write_bytes(b"not a video")
+    assert select_cover(str(video), output_path=str(tmp_path / "cover.jpg")) is None
+
+# --- Transcoding Tests ---
+def test_transcode_profile_needs_transcode_and_project():
+    from video_publisher.core.models import VideoMetadata
+    from video_publisher.media import TranscodeProfile
+
+    profile = TranscodeProfile("test", max_long_side=1920, max_fps=30, video_bitrate=4_000_000)
+    master = VideoMetadata(path="a.mov", duration=8, width=3840, height=2160, aspect_ratio=16 / 9,
+                           codec="prores", fps=60, bitrate=700_000_000, rotation=90)
+    assert profile.needs_transcode(master)
+    rendition = profile.project(master)
+    assert (rendition.width, rendition.height, rendition.fps) == (1920, 1080, 30)
+    assert rendition.codec == "h264" and rendition.rotation == 0
+    assert rendition.size == 4_128_000  # 8s at the profile's bitrate
+
+    light = VideoMetadata(path="a.mp4", duration=8, width=1080, height=1920, aspect_ratio=0.56,
+                          codec="h264", fps=30, bitrate=3_000_000)
+    assert not profile.needs_transcode(light)
+    assert profile.key != TranscodeProfile("test", max_fps=60).key
+
+def test_rendition_cache_transcodes_once_and_evicts(tmp_path):
+    import os
+    from video_publisher.core.probe import probe
+    from video_publisher.media import RenditionCache, TranscodeProfile
+    from video_publisher.media.transcode import TranscodeError, find_ffmpeg
+
+    try:
+        find_ffmpeg()
+    except TranscodeError:
+        pytest.skip("ffmpeg is not available")
+
+    video = tmp_path / "clip.mp4"
+    write_video(video, [checkerboard(width=320, height=240)] * 20)
+    cache = RenditionCache(str(tmp_path / "renditions"), workers=1)
+    small = TranscodeProfile("small", max_long_side=160, max_fps=10, video_bitrate=200_000, preset="ultrafast")
+
+    path = cache.get(str(video), small, content_hash="abc")
+    result = probe(path)
+    assert (result.codec, result.width, result.height) == ("h264", 160, 120)
+
+    # Served from the cache, marked as recently used
+    os.utime(path, (0, 0))
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(cache, "_transcode", lambda *args: pytest.fail("transcoded twice"))
+        assert cache.get(str(video), small, content_hash="abc") == path
+    assert os.path.getmtime(path) > 0
+
+    # Over quota, the least recently used rendition goes
+    cache.quota = cache.size()
+    other = cache.get(str(video), small, content_hash="def")
+    assert not os.path.exists(path) and os.path.exists(other)
+
+    broken = tmp_path / "broken.mp4"
+    broken.write_bytes(b"not a video")
+    with pytest.raises(TranscodeError):
+        cache.get(str(broken), small, content_hash="bad")
+    assert os.listdir(tmp_path / "renditions") == [os.path.basename(other)]
+
+# --- Derivative Tests ---
+def test_crop_window_follows_saliency():
+    from video_publisher.media.derivatives import best_offset, crop_window
+
+    # Flat footage is cropped in the middle
+    assert best_offset(np.ones(100), 40) == 30
+
+    frame = np.full((90, 160), 0.5, dtype=np.float32)
+    frame[:, 110:150] = cv2.cvtColor(checkerboard(width=40, height=90), cv2.COLOR_BGR2GRAY) / 255.0
+    x, y, width, height = crop_window(np.stack([frame, frame]), 9 / 16)
+    assert (y, width, height) == (0, 51, 90)
+    assert x <= 110 and x + width >= 150
+
+    # Vertical to horizontal crops along the other axis
+    x, y, width, height = crop_window(np.stack([frame.T, frame.T]), 16 / 9)
+    assert x == 0 and y <= 110 and y + height >= 150
+
+def test_rendition_cache_reframes_to_vertical(tmp_path):
+    from video_publisher.core.probe import probe
+    from video_publisher.media import RenditionCache, TranscodeProfile
+    from video_publisher.media.transcode import TranscodeError, find_ffmpeg
+
+    try:
+        find_ffmpeg()
+    except TranscodeError:
+        pytest.skip("ffmpeg is not available")
+
+    # 16:9, detail on the left side only
+    frame = np.full((180, 320, 3), 128, dtype=np.uint8)
+    frame[:, 10:90] = checkerboard(width=80, height=180)
+    video = tmp_path / "wide.mp4"
+    write_video(video, [frame] * 20)
+
+    cache = RenditionCache(str(tmp_path / "renditions"), workers=1)
+    vertical = TranscodeProfile("vertical", video_bitrate=500_000, preset="ultrafast").reframed(9 / 16)
+    path = cache.get(str(video), vertical, content_hash="abc")
+    result = probe(path)
+    assert (result.width, result.height) == (100, 180)
+
+    capture = cv2.VideoCapture(path)
+    ok, first = capture.read()
+    capture.release()
+    assert ok
+    # The checkerboard made it into the crop
+    assert cv2.Laplacian(cv2.cvtColor(first, cv2.COLOR_BGR2GRAY), cv2.CV_64F).var() > 1000
+
+# --- Fingerprint Tests ---
+def test_fingerprint_survives_reencoding_and_trimming(tmp_path):
+    from video_publisher.media.fingerprint import fingerprint, popcount, sample_interval
+
+    assert sample_interval(30) == 1.0 and sample_interval(64) == 1.0
+    assert sample_interval(70) == 2.0 and sample_interval(600) == 16.0
+
+    rng = np.random.default_rng(7)
+    # A different, textured shot every second, for longer than 64 seconds
+    shots = [cv2.resize(rng.integers(0, 255, (12, 16), dtype=np.uint8), (160, 120), interpolation=cv2.INTER_CUBIC)
+             for _ in range(70)]
+    frames = [cv2.cvtColor(shot, cv2.COLOR_GRAY2BGR) for shot in shots for _ in range(10)]
+    write_video(tmp_path / "original.mp4", frames)
+    # Smaller, slightly brighter and missing its first two and a half seconds
+    write_video(tmp_path / "repost.mp4", [cv2.convertScaleAbs(cv2.resize(f, (120, 90)), alpha=1.1, beta=8)
+                                          for f in frames[25:]])
+    write_video(tmp_path / "other.mp4", [np.ascontiguousarray(f[::-1]) for f in frames])
+
+    original = fingerprint(str(tmp_path / "original.mp4"))
+    repost = fingerprint(str(tmp_path / "repost.mp4"))
+    other = fingerprint(str(tmp_path / "other.mp4"))
+    # Over 64 seconds: every 2 seconds, to the end of the video
+    assert len(original) == 35 and len(repost) == 34
+    # Sampled at the same moments of each shot, shifted by the trim
+    assert (popcount(original[1:] ^ repost) <= 8).all()
+    assert len(fingerprint(str(tmp_path / "original.mp4"), max_frames=20)) == 18
+    assert (popcount(original[:, None] ^ other[None, :]) > 8).all()
+
+    # Blank footage has no fingerprint
+    write_video(tmp_path / "black.mp4", [np.zeros((120, 160, 3), dtype=np.uint8)] * 20)
+    assert len(fingerprint(str(tmp_path / "black.mp4"))) == 0
+
+def test_fingerprint_index_finds_near_duplicates(tmp_path, monkeypatch):
+    from video_publisher.media import fingerprint as module
+    from video_publisher.media.fingerprint import FingerprintIndex
+
+    rng = np.random.default_rng(3)
+    videos = {f"video{i}": rng.integers(0, 2 ** 64 - 1, size=16, dtype=np.uint64, endpoint=True)
+              for i in range(300)}
+    index = FingerprintIndex(str(tmp_path / "index.db"))
+    for content_hash, hashes in videos.items():
+        index.add(content_hash, hashes, label=f"{content_hash}.mp4")
+    assert len(index) == 300 and "video7" in index
+
+    # Up to 8 flipped bits per frame, half of the frames trimmed
+    flips = np.array([sum(1 << int(b) for b in rng.choice(64, 8, replace=False)) for _ in range(8)], dtype=np.uint64)
+    near = videos["video7"][4:12] ^ flips
+    matches = index.query(near)
+    assert [m.content_hash for m in matches] == ["video7"]
+    assert matches[0].similarity == 1.0 and matches[0].label == "video7.mp4"
+    assert index.query(near, exclude="video7") == []
+    assert index.query(rng.integers(0, 2 ** 63, size=16, dtype=np.uint64)) == []
+    # Under the threshold: a quarter of the frames in common
+    assert index.query(np.concatenate([videos["video9"][:4], near ^ np.uint64(0xFFFF_0000_FFFF)])) == []
+
+    # Additions from elsewhere are picked up, before and after the tables are rebuilt
+    other = FingerprintIndex(str(tmp_path / "index.db"))
+    other.add("late", videos["video7"][:12])
+    assert {m.content_hash for m in index.query(near)} == {"video7", "late"}
+    monkeypatch.setattr(module, "_REBUILD_THRESHOLD", 0)
+    other.add("later", videos["video3"])
+    assert {m.content_hash for m in index.query(videos["video3"])} == {"video3", "later"}
+    assert index._indexed == len(index._hashes)
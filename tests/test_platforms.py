@@ -119,3 +119,142 @@ def test_all_platforms_implement_base():
     assert issubclass(YouTubeUploader, BasePlatform)
     assert issubclass(TikTokUploader, BasePlatform)
     assert issubclass(InstagramUploader, BasePlatform)
+
+# --- Browser Session Pool Tests ---
+def _fake_pool(max_size=2, idle_timeout=600.0):
+    from video_publisher.platforms.session_pool import BrowserSessionPool
+    created = []
+
+    def create_driver():
+        driver = MagicMock()
+        driver.window_handles = ['main']
+        created.append(driver)
+        return driver
+
+    login = MagicMock()
+    pool = BrowserSessionPool(create_driver, login, max_size=max_size, idle_timeout=idle_timeout)
+    return pool, created, login
+
+def test_session_pool_reuses_warm_driver():
+    pool, created, login = _fake_pool()
+    with pool.session() as first:
+        pass
+    with pool.session() as second:
+        assert second is first
+    assert len(created) == 1
+    login.assert_called_once_with(first)
+
+def test_session_pool_isolates_concurrent_checkouts_and_bounds_size():
+    pool, created, _ = _fake_pool(max_size=2)
+    a = pool.acquire()
+    b = pool.acquire()
+    assert a is not b
+    with pytest.raises(TimeoutError):
+        pool.acquire(timeout=0.05)
+    pool.release(a)
+    assert pool.acquire(timeout=0.05) is a
+    assert len(created) == 2
+
+def test_session_pool_replaces_unhealthy_and_evicts_idle():
+    pool, created, _ = _fake_pool(idle_timeout=0.0)
+    driver = pool.acquire()
+    pool.release(driver)
+    assert pool.evict_idle() == 1
+    driver.quit.assert_called_once()
+
+    pool.idle_timeout = 600.0
+    crashed = pool.acquire()
+    crashed.window_handles = []
+    pool.release(crashed)
+    crashed.quit.assert_called_once()
+    assert pool.acquire() is not crashed
+
+def test_tiktok_upload_checks_out_pool_driver():
+    uploader = TikTokUploader()
+    pool_driver = MagicMock()
+    uploader.session_pool = MagicMock()
+    uploader.session_pool.session.return_value.__enter__.return_value = pool_driver
+
+    seen = []
+    with patch.object(TikTokUploader, '_upload', lambda self, path, meta: seen.append(self.driver) or
+                      UploadResult(platform=Platform.TIKTOK, success=True)):
+        result = uploader.upload('test.mp4', {})
+
+    assert result.success is True
+    assert seen == [pool_driver]
+    assert uploader.driver is None
+
+@patch('video_publisher.platforms.youtube.uploader.os.path.exists')
+@patch('video_publisher.platforms.youtube.uploader.pickle.load')
+@patch('builtins.open', create=True)
+def test_youtube_builds_client_on_first_use(mock_open, mock_pickle_load, mock_exists):
+    """Loading the token is cheap; the API client is only built when needed."""
+    mock_exists.return_value = True
+    mock_creds = MagicMock()
+    mock_creds.valid = True
+    mock_pickle_load.return_value = mock_creds
+
+    with patch('video_publisher.platforms.youtube.uploader.build') as mock_build:
+        uploader = YouTubeUploader()
+        assert uploader.is_authenticated()
+        mock_build.assert_not_called()
+
+        assert uploader.youtube is mock_build.return_value
+        assert uploader.youtube is mock_build.return_value
+        mock_build.assert_called_once()
+
+# --- Platform Plugin Tests ---
+class FakeVimeoUploader(BasePlatform):
+    instances = []
+
+    def __init__(self, config=None):
+        self.config = config or {}
+        FakeVimeoUploader.instances.append(self)
+
+    def authenticate(self):
+        pass
+
+    def upload(self, video_path, metadata):
+        return UploadResult(platform=Platform("vimeo"), success=True, url="https://vimeo.test/1")
+
+    def is_authenticated(self):
+        return True
+
+def test_plugin_registry_discovers_entry_points(monkeypatch, tmp_path):
+    from video_publisher.platforms import plugins as plugins_module
+    from video_publisher.platforms.plugins import PlatformPlugin, PluginRegistry
+    from video_publisher.core.engine import VideoPublisher
+
+    vimeo = PlatformPlugin(name="vimeo", uploader="tests.test_platforms:FakeVimeoUploader",
+                           display_name="Vimeo", daily_limit=2, max_concurrency=1, config={'quality': 'hd'})
+    entry_point = MagicMock()
+    entry_point.name = "vimeo"
+    entry_point.load.return_value = vimeo
+    broken = MagicMock()
+    broken.name = "broken"
+    broken.load.side_effect = ImportError("missing dependency")
+    monkeypatch.setattr(plugins_module, 'entry_points', lambda group: [entry_point, broken])
+    registry = PluginRegistry(plugins_module.BUILTIN_PLUGINS)
+    monkeypatch.setattr(plugins_module, 'plugins', registry)
+    monkeypatch.setattr('video_publisher.core.engine.plugins', registry)
+    monkeypatch.setattr('video_publisher.safety.rate_limiter.plugins', registry)
+    monkeypatch.setenv('DRY_RUN', 'true')
+    FakeVimeoUploader.instances.clear()
+
+    assert registry.names() == ["youtube", "tiktok", "instagram", "youtube_shorts", "vimeo"]
+    assert [p.name for p in registry.primary()] == ["youtube", "tiktok", "instagram", "vimeo"]
+    assert Platform("vimeo").value == "vimeo"
+    with pytest.raises(ValueError):
+        Platform("not_a_platform")
+
+    publisher = VideoPublisher()
+    publisher.analyzer = MagicMock()
+    assert Platform("vimeo") in publisher.uploaders
+    assert not FakeVimeoUploader.instances  # Imported and built only when used
+
+    video = tmp_path / "clip.mp4"
+    video.write_bytes(b"video")
+    result = publisher.upload(str(video), platforms=[Platform("vimeo")])[0]
+    assert result.success and result.url == "https://vimeo.test/1"
+    assert FakeVimeoUploader.instances[0].config['quality'] == 'hd'
+    assert publisher.rate_limiter.get_limit(Platform("vimeo")) == 2
@@ -0,0 +1,123 @@
+import io
+import struct
+
+import pytest
+
+from video_publisher.core.probe import ProbeError, probe, probe_file
+from video_publisher.core.video_analyzer import VideoAnalyzer
+
+# --- Synthetic containers ---
+def box(box_type, payload=b''):
+    return struct.pack('>I4s', 8 + len(payload), box_type) + payload
+
+def full_box(box_type, payload):
+    return box(box_type, b'\0\0\0\0' + payload)
+
+ROTATIONS = {
+    0: (1, 0, 0, 1),
+    90: (0, 1, -1, 0),
+    180: (-1, 0, 0, -1),
+    270: (0, -1, 1, 0),
+}
+
+def make_mp4(width=1920, height=1080, rotation=0, seconds=10.0, frames=300, mdat_size=1024):
+    """MP4 with the moov box after the media data, like most camera recordings."""
+    a, b, c, d = ROTATIONS[rotation]
+    matrix = struct.pack('>9i', a << 16, b << 16, 0, c << 16, d << 16, 0, 0, 0, 1 << 30)
+    tkhd = full_box(b'tkhd', struct.pack('>5I', 0, 0, 1, 0, int(seconds * 600)) + b'\0' * 16 + matrix
+                    + struct.pack('>II', width << 16, height << 16))
+    mdhd = full_box(b'mdhd', struct.pack('>4I', 0, 0, 15360, int(seconds * 15360)) + b'\0' * 4)
+    hdlr = full_box(b'hdlr', b'\0' * 4 + b'vide' + b'\0' * 13)
+    sample_entry = box(b'avc1', b'\0' * 6 + b'\0\1' + b'\0' * 16 + struct.pack('>HH', width, height) + b'\0' * 50)
+    stbl = box(b'stbl', full_box(b'stsd', struct.pack('>I', 1) + sample_entry)
+               + full_box(b'stsz', struct.pack('>II', 0, frames) + b'\0\0\1\0' * frames))
+    trak = box(b'trak', tkhd + box(b'mdia', mdhd + hdlr + box(b'minf', stbl)))
+    sound = box(b'trak', box(b'mdia', full_box(b'hdlr', b'\0' * 4 + b'soun' + b'\0' * 13)))
+    moov = box(b'moov', full_box(b'mvhd', struct.pack('>4I', 0, 0, 600, int(seconds * 600)) + b'\0' * 80)
+               + sound + trak)
+    return box(b'ftyp', b'isom\0\0\0\0isom') + box(b'mdat', b'\0' * mdat_size) + moov
+
+def ebml(element_id, payload):
+    id_bytes = element_id.to_bytes((element_id.bit_length() + 7) // 8, 'big')
+    return id_bytes + b'\x01' + len(payload).to_bytes(7, 'big') + payload
+
+def make_webm(width=1080, height=1920, seconds=12.5):
+    header = ebml(0x1A45DFA3, ebml(0x4282, b'webm'))
+    info = ebml(0x1549A966, ebml(0x2AD7B1, (1_000_000).to_bytes(3, 'big'))
+                + ebml(0x4489, struct.pack('>d', seconds * 1000)))
+    video = ebml(0xE0, ebml(0xB0, width.to_bytes(2, 'big')) + ebml(0xBA, height.to_bytes(2, 'big')))
+    track = ebml(0xAE, ebml(0x83, b'\1') + ebml(0x86, b'V_VP9') + ebml(0x23E383, (33_333_333).to_bytes(4, 'big'))
+                 + video)
+    audio = ebml(0xAE, ebml(0x83, b'\2') + ebml(0x86, b'A_OPUS'))
+    cluster = ebml(0x1F43B675, b'\0' * 512)
+    return header + ebml(0x18538067, info + ebml(0x1654AE6B, audio + track) + cluster)
+
+class CountingReader(io.BytesIO):
+    def __init__(self, data):
+        super().__init__(data)
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        data = super().read(size)
+        self.bytes_read += len(data)
+        return data
+
+# --- Probe Tests ---
+def test_probe_mp4_reads_headers_only():
+    data = make_mp4(mdat_size=5_000_000)
+    f = CountingReader(data)
+    result = probe_file(f, len(data))
+
+    assert (result.width, result.height, result.rotation) == (1920, 1080, 0)
+    assert result.duration == pytest.approx(10.0)
+    assert result.fps == pytest.approx(30.0)
+    assert result.codec == 'h264'
+    assert result.container == 'mp4'
+    assert result.bitrate == int(len(data) * 8 / 10.0)
+    # The media data was skipped, not read
+    assert f.bytes_read < 4096
+
+@pytest.mark.parametrize("rotation", [0, 90, 180, 270])
+def test_probe_mp4_rotation(rotation):
+    data = make_mp4(rotation=rotation)
+    result = probe_file(io.BytesIO(data), len(data))
+    assert result.rotation == rotation
+    assert result.display_size == ((1080, 1920) if rotation in (90, 270) else (1920, 1080))
+
+def test_probe_webm():
+    data = make_webm()
+    result = probe_file(io.BytesIO(data), len(data))
+    assert (result.width, result.height, result.rotation) == (1080, 1920, 0)
+    assert result.duration == pytest.approx(12.5)
+    assert result.fps == pytest.approx(30.0)
+    assert result.codec == 'vp9'
+    assert result.container == 'webm'
+
+def test_probe_unknown_container(tmp_path):
+    path = tmp_path / "video.avi"
+    path.write_bytes(b'RIFF\0\0\0\0AVI LIST')
+    with pytest.raises(ProbeError):
+        probe(str(path))
+
+# --- VideoAnalyzer Tests ---
+def test_video_analyzer_routes_rotated_phone_video(tmp_path):
+    path = tmp_path / "portrait.mov"
+    path.write_bytes(make_mp4(rotation=90))
+
+    metadata = VideoAnalyzer().analyze(str(path))
+    assert (metadata.width, metadata.height) == (1080, 1920)
+    assert metadata.rotation == 90
+    assert metadata.is_vertical is True
+    assert metadata.size == path.stat().st_size
+
+def test_video_analyzer_falls_back_for_unknown_containers(tmp_path, monkeypatch):
+    from unittest.mock import MagicMock, patch
+    from video_publisher.core import video_analyzer
+
+    path = tmp_path / "video.avi"
+    path.write_bytes(b'RIFF\0\0\0\0AVI LIST')
+    monkeypatch.setattr(video_analyzer, 'ffprobe', MagicMock(side_effect=ProbeError("ffprobe not found")))
+    with patch("video_publisher.core.video_analyzer.VideoFileClip") as mock_clip_cls:
+        mock_clip_cls.return_value.__enter__.return_value = MagicMock(duration=5.0, size=(640, 480))
+        metadata = VideoAnalyzer().analyze(str(path))
+    assert (metadata.duration, metadata.width, metadata.height) == (5.0, 640, 480)
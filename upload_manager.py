@@ -37,12 +37,11 @@ class UploadManager:
         file_id = str(uuid.uuid4())
         filename = secure_filename(file.filename)
         
-        # Save file
+        # Save file, hashing and probing it on the way
+        from video_publisher.core.ingest import save_upload
         file_path = self.upload_folder / f"{file_id}_{filename}"
-        file.save(str(file_path))
-        
-        # Get file info
-        file_size = file_path.stat().st_size
+        ingested = save_upload(file, str(file_path))
+        file_size = ingested.size
         
         # Store metadata
         upload_info = {
@@ -52,7 +51,9 @@ class UploadManager:
             'size': file_size,
             'uploaded_at': datetime.now().isoformat(),
             'metadata': {},
-            'platforms': []
+            'platforms': [],
+            'content_hash': ingested.content_hash,
+            'video_metadata': ingested.video_metadata
         }
         
         self.uploads[file_id] = upload_info